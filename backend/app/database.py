@@ -1,52 +1,102 @@
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from functools import lru_cache
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase
+from pydantic import PrivateAttr
 from pydantic_settings import BaseSettings
+import os
 
 
 class DatabaseSettings(BaseSettings):
     # Use SUPABASE_DB_URL if available, fallback to DATABASE_URL for compatibility
     database_url: str = ""
     supabase_db_url: str = ""
+    # Connection pool tuning (Supabase closes idle connections, so recycle them)
+    db_pool_size: int = 20
+    db_max_overflow: int = 30
+    db_pool_recycle: int = 1800  # Seconds before a pooled connection is replaced
+    db_pool_timeout: int = 30  # Seconds to wait for a connection from the pool
+    # asyncpg prepared statement cache; set to 0 behind PgBouncer in transaction mode
+    db_statement_cache_size: int = 100
+    # SQLAlchemy compiled statement cache (entries per engine)
+    db_query_cache_size: int = 1200
     
     class Config:
         env_file = ".env"
         extra = "ignore"  # Ignore extra fields from .env file
     
-    @property
-    def db_url(self) -> str:
-        """Get database URL, preferring SUPABASE_DB_URL."""
+    _db_url: str = PrivateAttr(default="")
+    
+    def model_post_init(self, __context) -> None:
+        """Resolve the database URL once, preferring SUPABASE_DB_URL."""
         url = self.supabase_db_url or self.database_url
         if not url:
             raise ValueError(
                 "Either SUPABASE_DB_URL or DATABASE_URL must be set in environment variables"
             )
-        return url
+        self._db_url = url
+    
+    @property
+    def db_url(self) -> str:
+        """Get database URL, preferring SUPABASE_DB_URL."""
+        return self._db_url
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> DatabaseSettings:
+    """
+    Get the database settings, built once per process.
+    
+    The .env file is only read when ENV_FILE points at one, or when no database
+    URL is present in the real environment (local development). Production
+    deployments that set the variables directly skip the filesystem read.
+    """
+    env_file = os.getenv("ENV_FILE")
+    if env_file is None and not (os.getenv("SUPABASE_DB_URL") or os.getenv("DATABASE_URL")):
+        env_file = ".env"
+    return DatabaseSettings(_env_file=env_file)
+
+
+def to_async_url(url: str) -> str:
+    """
+    Convert a postgres:// or postgresql:// URL to the asyncpg driver.
+    libpq's sslmode query parameter is passed to asyncpg as ssl.
+    """
+    parsed = make_url(url).set(drivername="postgresql+asyncpg")
+    if "sslmode" in parsed.query:
+        query = dict(parsed.query)
+        query["ssl"] = query.pop("sslmode")
+        parsed = parsed.set(query=query)
+    return parsed.render_as_string(hide_password=False)
 
 
 # Get database URL from environment
-settings = DatabaseSettings()
+settings = get_settings()
 
 # Create engine
-engine = create_engine(
-    settings.db_url,
+engine = create_async_engine(
+    to_async_url(settings.db_url),
     pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_recycle=settings.db_pool_recycle,
+    pool_timeout=settings.db_pool_timeout,
+    query_cache_size=settings.db_query_cache_size,
+    connect_args={"statement_cache_size": settings.db_statement_cache_size}
 )
 
-# Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Create session factory (objects stay usable after commit, since there is no lazy refresh in async)
+AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
 
-# Base class for models
-Base = declarative_base()
+class Base(DeclarativeBase):
+    """Base class for models."""
+    # Return server defaults (e.g. created_at) from the INSERT itself. With
+    # expire_on_commit=False they would otherwise need an extra SELECT, which
+    # async sessions can't issue implicitly on attribute access.
+    __mapper_args__ = {"eager_defaults": True}
 
 
-def get_db():
+async def get_db():
     """Dependency for getting database session."""
-    db = SessionLocal()
-    try:
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
-
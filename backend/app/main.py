@@ -1,14 +1,16 @@
 from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from app.routers import stations, llm, rag, stripe, history, electricity, urdb, clerk
-from app.services.vector_store_service import VectorStoreService
-from app.services.llm_service import LLMService
+from fastapi.responses import ORJSONResponse
+from app.middleware.auth import get_clerk_client, close_clerk_client, jwks_refresh_loop
+from app.middleware.cors import PrecomputedCORSMiddleware
+from app.middleware.health import HealthCheckMiddleware
+from app.routers import llm, rag, history, stations, electricity, urdb, clerk, stripe
+import asyncio
 import os
 import logging
 
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="VoltQuery.ai API", version="1.0.0")
+app = FastAPI(title="VoltQuery.ai API", version="1.0.0", default_response_class=ORJSONResponse)
 
 # Configure CORS - allow frontend URL from environment variable
 frontend_url = os.getenv("FRONTEND_URL", "http://localhost:3000")
@@ -19,25 +21,45 @@ cors_origins = [
     "https://voltquery.ai",  # Production frontend
 ]
 
+# CORS headers for each allowed origin are built once at startup
 app.add_middleware(
-    CORSMiddleware,
+    PrecomputedCORSMiddleware,
     allow_origins=cors_origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
-# Include routers
-app.include_router(stations.router, prefix="/api", tags=["stations"])
-app.include_router(llm.router, prefix="/api", tags=["llm"])
-app.include_router(rag.router, prefix="/api", tags=["rag"])
-app.include_router(stripe.router, prefix="/api", tags=["stripe"])
-app.include_router(clerk.router, prefix="/api", tags=["clerk"])
-app.include_router(history.router, prefix="/api", tags=["history"])
-app.include_router(electricity.router, prefix="/api", tags=["electricity"])
-app.include_router(urdb.router, prefix="/api", tags=["urdb"])
+# Added last so it is outermost: health probes are answered before CORS and routing
+app.add_middleware(HealthCheckMiddleware)
+
+# API routers and their OpenAPI tags.
+# Starlette matches routes in registration order, so the high-traffic
+# routers (LLM/RAG queries) are registered first.
+ROUTERS = [
+    ("llm", llm.router),
+    ("rag", rag.router),
+    ("history", history.router),
+    ("stations", stations.router),
+    ("electricity", electricity.router),
+    ("urdb", urdb.router),
+    ("clerk", clerk.router),
+    ("stripe", stripe.router),
+]
+
+
+def include_routers(application: FastAPI):
+    """
+    Register the API routers.
+    """
+    for tag, router in ROUTERS:
+        application.include_router(router, prefix="/api", tags=[tag])
+
+
+include_routers(app)
 
 
+# Served by HealthCheckMiddleware; the routes remain for the OpenAPI schema
 @app.get("/")
 async def root():
     return {"message": "VoltQuery.ai API"}
@@ -48,13 +70,15 @@ async def health():
     return {"status": "healthy"}
 
 
-@app.on_event("startup")
-async def startup_event():
+def _ensure_vector_index():
     """
-    Ensure the vecs cosine distance index exists on startup.
+    Ensure the vecs cosine distance index exists.
     This is idempotent - it won't recreate if the index already exists.
     """
     try:
+        from app.services.vector_store_service import VectorStoreService
+        from app.services.llm_service import LLMService
+        
         # Auto-detect LLM mode
         llm_service = LLMService()
         llm_mode = llm_service.settings.llm_mode if hasattr(llm_service.settings, 'llm_mode') else os.getenv("LLM_MODE", "local")
@@ -67,3 +91,75 @@ async def startup_event():
         # Don't fail startup if index creation fails - it's just a performance optimization
         logger.warning(f"Could not ensure vector store index exists on startup: {e}. This is not critical.")
 
+
+def _warm_rag_service():
+    """Build the shared RAGService (imports llama_index and creates its clients)."""
+    try:
+        from app.routers.rag import get_rag_service
+        get_rag_service()
+    except Exception as e:
+        logger.warning(f"Could not build RAG service on startup: {e}. It will be built on first use.")
+
+
+def _warm_llm():
+    """Create the shared LLM client (and the /llm/info description) before the first query."""
+    try:
+        from app.routers.llm import describe_llm
+        describe_llm()
+    except Exception as e:
+        logger.warning(f"Could not create LLM on startup: {e}. It will be created on first use.")
+
+
+# Keep references so background tasks aren't garbage collected mid-run
+_startup_tasks = set()
+
+
+def _start_background_task(coro):
+    """Run a coroutine as a background task for the lifetime of the app."""
+    task = asyncio.create_task(coro)
+    _startup_tasks.add(task)
+    task.add_done_callback(_startup_tasks.discard)
+
+
+@app.on_event("startup")
+async def startup_event():
+    """
+    Warm shared clients, then start the Clerk JWKS refresh, the RAG service
+    and LLM builds and the vector index check in the background.
+    
+    The index check runs in a worker thread so the server starts accepting
+    requests immediately. Set SKIP_STARTUP_INDEX_CHECK=1 to skip it entirely.
+    """
+    # Create the shared Clerk client up front so the first auth request doesn't pay for it
+    get_clerk_client()
+    
+    # Load Clerk's signing keys so session tokens can be verified locally
+    if os.getenv("CLERK_SECRET_KEY"):
+        _start_background_task(jwks_refresh_loop())
+    
+    # Build the shared RAGService and LLM off the event loop so the first query doesn't pay for them
+    _start_background_task(asyncio.to_thread(_warm_rag_service))
+    _start_background_task(asyncio.to_thread(_warm_llm))
+    
+    if os.getenv("SKIP_STARTUP_INDEX_CHECK", "").lower() in ("1", "true", "yes"):
+        logger.info("Skipping vector store index check (SKIP_STARTUP_INDEX_CHECK is set)")
+        return
+    
+    _start_background_task(asyncio.to_thread(_ensure_vector_index))
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background tasks, flush query history and close shared HTTP clients."""
+    from app.services.bcl_client import BCLClient
+    from app.services.nrel_client import NRELClient
+    from app.services.query_writer import get_query_writer
+    
+    for task in list(_startup_tasks):
+        task.cancel()
+    
+    # Write any queued query history before the process exits
+    await get_query_writer().stop()
+    await close_clerk_client()
+    await NRELClient.aclose()
+    await BCLClient.aclose()
@@ -1,88 +1,237 @@
 from fastapi import HTTPException, Depends, Header
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
-from app.services.user_service import UserService
-from typing import Optional
+from app.services.user_service import UserService, AuthenticatedUser
+from app.services.logger_service import get_logger
+from cachetools import TTLCache
+from jose import jwt
+from typing import Any, Dict, Optional, Tuple
+import asyncio
+import hashlib
 import httpx
+import os
+import time
+
+
+logger = get_logger("auth")
+
+
+class _InFlightVerification:
+    """Lock shared by concurrent requests for the same token, with a count of its users."""
+    __slots__ = ("lock", "users")
+    
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.users = 0
+
+
+# Verified tokens keyed by token hash -> (user, token expiry as unix timestamp)
+_token_cache: TTLCache = TTLCache(maxsize=10_000, ttl=300)
+# In-flight verifications, so concurrent requests with the same token verify once
+_token_locks: Dict[bytes, _InFlightVerification] = {}
+# Shared Clerk API client (keeps TLS connections alive between requests)
+_clerk_client: Optional[httpx.AsyncClient] = None
+# Clerk's JWT signing keys (JWKS) by key ID, for verifying session tokens locally
+_jwks_keys: Dict[str, Dict[str, Any]] = {}
+_jwks_refreshed_at: Optional[float] = None  # time.monotonic() of the last refresh attempt
+JWKS_REFRESH_INTERVAL = 3600  # Seconds between background JWKS refreshes
+JWKS_MIN_REFRESH_INTERVAL = 60  # Minimum seconds between refreshes triggered by unknown key IDs
+
+
+def get_clerk_client() -> httpx.AsyncClient:
+    """Get the shared Clerk API client, creating it on first use."""
+    global _clerk_client
+    if _clerk_client is None:
+        _clerk_client = httpx.AsyncClient(
+            base_url="https://api.clerk.com",
+            http2=True,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+            timeout=10.0
+        )
+    return _clerk_client
+
+
+async def close_clerk_client():
+    """Close the shared Clerk API client (called on application shutdown)."""
+    global _clerk_client
+    if _clerk_client is not None:
+        await _clerk_client.aclose()
+        _clerk_client = None
+
+
+def _get_clerk_secret_key() -> str:
+    """Get the Clerk secret key used to call the Clerk Backend API."""
+    clerk_secret_key = os.getenv("CLERK_SECRET_KEY")
+    if not clerk_secret_key:
+        raise HTTPException(status_code=500, detail="Clerk secret key not configured")
+    return clerk_secret_key
+
+
+async def refresh_jwks():
+    """Fetch Clerk's JWKS and replace the cached signing keys."""
+    global _jwks_refreshed_at
+    _jwks_refreshed_at = time.monotonic()
+    response = await get_clerk_client().get(
+        "/v1/jwks",
+        headers={"Authorization": f"Bearer {_get_clerk_secret_key()}"}
+    )
+    response.raise_for_status()
+    keys = {key["kid"]: key for key in response.json().get("keys", []) if key.get("kid")}
+    _jwks_keys.clear()
+    _jwks_keys.update(keys)
+
+
+async def jwks_refresh_loop():
+    """Keep the JWKS cache fresh (started on application startup)."""
+    while True:
+        try:
+            await refresh_jwks()
+        except Exception as e:
+            logger.log_error("jwks_refresh_failed", f"Could not refresh Clerk JWKS: {str(e)}")
+        await asyncio.sleep(JWKS_REFRESH_INTERVAL)
+
+
+def _token_cache_key(token: str) -> bytes:
+    """Hash the token so raw credentials are never kept in memory as dict keys."""
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+def _get_cached_user(cache_key: bytes) -> Optional[AuthenticatedUser]:
+    """Return the cached user for a token hash if the token has not expired."""
+    cached = _token_cache.get(cache_key)
+    if cached is None:
+        return None
+    
+    user, exp = cached
+    if exp is not None and exp <= time.time():
+        _token_cache.pop(cache_key, None)
+        return None
+    return user
 
 
 async def verify_clerk_token(
     authorization: Optional[str] = Header(None),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Verify Clerk JWT token and return user.
+    
+    Verified tokens are cached in-process until they expire (max 5 minutes),
+    so repeat requests skip the Clerk round-trip and the user lookup.
     """
     if not authorization:
         raise HTTPException(status_code=401, detail="Authorization header missing")
     
+    # Extract token from "Bearer <token>" (the scheme is case-insensitive)
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        raise HTTPException(status_code=401, detail="Invalid authorization scheme")
+    cache_key = _token_cache_key(token)
+    
+    cached_user = _get_cached_user(cache_key)
+    if cached_user:
+        return cached_user
+    
+    in_flight = _token_locks.get(cache_key)
+    if in_flight is None:
+        in_flight = _token_locks[cache_key] = _InFlightVerification()
+    in_flight.users += 1
     try:
-        # Extract token from "Bearer <token>"
-        token = authorization.replace("Bearer ", "")
-        
-        # Verify token with Clerk (you'll need to set CLERK_SECRET_KEY)
-        import os
-        clerk_secret_key = os.getenv("CLERK_SECRET_KEY")
-        if not clerk_secret_key:
-            raise HTTPException(status_code=500, detail="Clerk secret key not configured")
-        
-        # Verify token with Clerk API
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                "https://api.clerk.com/v1/tokens/verify",
-                headers={
-                    "Authorization": f"Bearer {clerk_secret_key}",
-                    "Content-Type": "application/json"
-                },
-                params={"token": token},
-                timeout=10.0
-            )
-            
-            if response.status_code != 200:
-                raise HTTPException(status_code=401, detail="Invalid token")
-            
-            token_data = response.json()
-            clerk_id = token_data.get("sub") or token_data.get("user_id")
-            email = token_data.get("email", "")
-            
-            if not clerk_id:
-                raise HTTPException(status_code=401, detail="Invalid token format")
+        async with in_flight.lock:
+            # Another request may have verified this token while we waited
+            cached_user = _get_cached_user(cache_key)
+            if cached_user:
+                return cached_user
             
-            # Get or create user
-            user = UserService.get_or_create_user(db, clerk_id, email)
+            user, exp = await _verify_token_uncached(token, db)
+            _token_cache[cache_key] = (user, exp)
             return user
-            
-    except httpx.HTTPError:
-        # Fallback: verify token locally using JWT
-        from jose import jwt
-        import os
+    finally:
+        # Only the last request using this lock removes it; waiters still hold a reference
+        in_flight.users -= 1
+        if in_flight.users == 0 and _token_locks.get(cache_key) is in_flight:
+            del _token_locks[cache_key]
+
+
+async def _verify_token_uncached(
+    token: str,
+    db: AsyncSession
+) -> Tuple[AuthenticatedUser, Optional[float]]:
+    """
+    Verify a token and return the user and the token's expiry.
+    
+    Tokens are verified locally against Clerk's JWKS. The Clerk API is only
+    called when the token's key ID is unknown (e.g. right after a key rotation).
+    """
+    try:
+        claims = await _verify_token_locally(token)
+        if claims is None:
+            claims = await _verify_token_remotely(token)
         
-        clerk_secret_key = os.getenv("CLERK_SECRET_KEY")
-        if not clerk_secret_key:
-            raise HTTPException(status_code=500, detail="Clerk secret key not configured")
+        clerk_id = claims.get("sub") or claims.get("user_id")
+        email = claims.get("email", "")
         
-        try:
-            # Decode JWT token
-            payload = jwt.decode(token, clerk_secret_key, algorithms=["RS256"])
-            clerk_id = payload.get("sub")
-            email = payload.get("email", "")
-            
-            if not clerk_id:
-                raise HTTPException(status_code=401, detail="Invalid token")
-            
-            user = UserService.get_or_create_user(db, clerk_id, email)
-            return user
-        except jwt.JWTError:
-            raise HTTPException(status_code=401, detail="Invalid token")
+        if not clerk_id:
+            raise HTTPException(status_code=401, detail="Invalid token format")
+        
+        # Get or create user
+        user = await UserService.get_or_create_user(db, clerk_id, email)
+        return user, claims.get("exp")
+        
+    except HTTPException:
+        raise
+    except jwt.JWTError:
+        raise HTTPException(status_code=401, detail="Invalid token")
     except Exception as e:
         raise HTTPException(status_code=401, detail=f"Authentication failed: {str(e)}")
 
 
+async def _verify_token_locally(token: str) -> Optional[Dict[str, Any]]:
+    """
+    Verify the token's RS256 signature and expiry against the cached JWKS.
+    Returns None if the signing key isn't known, so the caller can verify remotely.
+    """
+    kid = jwt.get_unverified_header(token).get("kid")
+    key = _jwks_keys.get(kid)
+    if key is None and (
+        _jwks_refreshed_at is None
+        or time.monotonic() - _jwks_refreshed_at >= JWKS_MIN_REFRESH_INTERVAL
+    ):
+        # Unknown key ID - the signing key may have rotated
+        try:
+            await refresh_jwks()
+        except Exception as e:
+            logger.log_error("jwks_refresh_failed", f"Could not refresh Clerk JWKS: {str(e)}")
+        key = _jwks_keys.get(kid)
+    if key is None:
+        return None
+    
+    # Clerk session tokens carry no aud claim
+    return jwt.decode(token, key, algorithms=["RS256"], options={"verify_aud": False})
+
+
+async def _verify_token_remotely(token: str) -> Dict[str, Any]:
+    """Verify the token with the Clerk API and return its claims."""
+    response = await get_clerk_client().get(
+        "/v1/tokens/verify",
+        headers={
+            "Authorization": f"Bearer {_get_clerk_secret_key()}",
+            "Content-Type": "application/json"
+        },
+        params={"token": token}
+    )
+    
+    if response.status_code != 200:
+        raise HTTPException(status_code=401, detail="Invalid token")
+    
+    return response.json()
+
+
 # Simplified version that accepts Clerk user ID from frontend
 async def get_current_user(
     x_clerk_user_id: Optional[str] = Header(None),
     x_clerk_email: Optional[str] = Header(None),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Get current user from Clerk headers (simpler approach).
@@ -92,6 +241,6 @@ async def get_current_user(
         raise HTTPException(status_code=401, detail="User ID missing")
     
     email = x_clerk_email or f"{x_clerk_user_id}@example.com"
-    user = UserService.get_or_create_user(db, x_clerk_user_id, email)
+    user = await UserService.get_or_create_user(db, x_clerk_user_id, email)
     return user
 
@@ -0,0 +1,68 @@
+"""
+CORS with response headers precomputed per allowed origin.
+
+The allowed origins are a short fixed list known at startup, so the headers
+for each one are built once instead of on every cross-origin request.
+"""
+
+from starlette.datastructures import Headers
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import PlainTextResponse, Response
+from starlette.types import Message, Send
+
+
+class PrecomputedCORSMiddleware(CORSMiddleware):
+    """
+    CORSMiddleware that serves explicitly allowed origins from lookup tables.
+    
+    Anything the tables don't cover (unknown origins, disallowed methods,
+    responses that already set Vary) falls back to the standard behaviour.
+    """
+    
+    def __init__(self, app, **kwargs):
+        super().__init__(app, **kwargs)
+        explicit_origins = [] if self.allow_all_origins else self.allow_origins
+        
+        # Origin -> full preflight headers (Access-Control-Request-Headers is mirrored per request)
+        self._preflight_headers = {
+            origin: {**self.preflight_headers, "Access-Control-Allow-Origin": origin}
+            for origin in explicit_origins
+        }
+        # Origin -> raw headers appended to every response
+        self._simple_headers = {
+            origin: [
+                *((name.lower().encode("latin-1"), value.encode("latin-1"))
+                  for name, value in self.simple_headers.items()),
+                (b"access-control-allow-origin", origin.encode("latin-1")),
+                (b"vary", b"Origin"),
+            ]
+            for origin in explicit_origins
+        }
+        self._allowed_methods = frozenset(self.allow_methods)
+    
+    def preflight_response(self, request_headers: Headers) -> Response:
+        headers = self._preflight_headers.get(request_headers["origin"])
+        requested_headers = request_headers.get("access-control-request-headers")
+        if (
+            headers is None
+            or request_headers["access-control-request-method"] not in self._allowed_methods
+            or (requested_headers is not None and not self.allow_all_headers)
+        ):
+            return super().preflight_response(request_headers)
+        
+        if requested_headers is not None:
+            headers = {**headers, "Access-Control-Allow-Headers": requested_headers}
+        return PlainTextResponse("OK", status_code=200, headers=headers)
+    
+    async def send(self, message: Message, send: Send, request_headers: Headers) -> None:
+        if message["type"] == "http.response.start":
+            extra_headers = self._simple_headers.get(request_headers["origin"])
+            response_headers = message.get("headers", [])
+            if extra_headers is not None and not any(
+                name.lower() in (b"vary", b"access-control-allow-origin")
+                for name, _ in response_headers
+            ):
+                message["headers"] = [*response_headers, *extra_headers]
+                await send(message)
+                return
+        await super().send(message, send, request_headers)
@@ -0,0 +1,47 @@
+"""
+Fast path for liveness probes.
+
+Health checks arrive far more often than real traffic (load balancer and
+orchestrator probes), so they are answered here before CORS, routing and
+dependency resolution run.
+"""
+
+import orjson
+
+
+# Preserialized responses for the unauthenticated probe endpoints
+FAST_PATH_RESPONSES = {
+    "/": orjson.dumps({"message": "VoltQuery.ai API"}),
+    "/health": orjson.dumps({"status": "healthy"}),
+}
+
+
+class HealthCheckMiddleware:
+    """Pure ASGI middleware that answers GET / and GET /health directly."""
+    
+    def __init__(self, app):
+        self.app = app
+        self._responses = {
+            path: (
+                {
+                    "type": "http.response.start",
+                    "status": 200,
+                    "headers": [
+                        (b"content-type", b"application/json"),
+                        (b"content-length", str(len(body)).encode()),
+                    ],
+                },
+                {"type": "http.response.body", "body": body},
+            )
+            for path, body in FAST_PATH_RESPONSES.items()
+        }
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["method"] == "GET":
+            response = self._responses.get(scope["path"])
+            if response is not None:
+                start, body = response
+                await send(start)
+                await send(body)
+                return
+        await self.app(scope, receive, send)
@@ -1,6 +1,7 @@
 from app.models.user import User
 from app.models.query import Query
 from app.models.subscription import Subscription
+from app.models.stripe_event import ProcessedStripeEvent
 
-__all__ = ["User", "Query", "Subscription"]
+__all__ = ["User", "Query", "Subscription", "ProcessedStripeEvent"]
 
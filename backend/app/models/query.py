@@ -1,25 +1,36 @@
-from sqlalchemy import Column, String, Text, DateTime, Integer, ForeignKey, JSON
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import String, Text, DateTime, Integer, ForeignKey, Index, text
+from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database import Base
+from datetime import datetime
+from typing import Any, List, Optional, TYPE_CHECKING
 import uuid
 
+if TYPE_CHECKING:
+    from app.models.user import User
+
 
 class Query(Base):
     __tablename__ = "queries"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
-    question = Column(Text, nullable=False)
-    answer = Column(Text, nullable=False)
-    zip_code = Column(String(10))
-    sources_count = Column(Integer, default=0)
-    sources_data = Column(JSON)  # Store sources metadata
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    question: Mapped[str] = mapped_column(Text, nullable=False)
+    answer: Mapped[str] = mapped_column(Text, nullable=False)
+    zip_code: Mapped[Optional[str]] = mapped_column(String(10))
+    sources_count: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    sources_data: Mapped[Optional[List[Any]]] = mapped_column(JSONB, server_default=text("'[]'::jsonb"))  # Store sources metadata
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now(), index=True)
     
     # Relationship
-    user = relationship("User", backref="queries")
+    user: Mapped["User"] = relationship("User", backref="queries")
+    
+    __table_args__ = (
+        # History listing: latest queries for a user (also serves plain user_id lookups);
+        # id breaks created_at ties so pages are stable
+        Index("ix_queries_user_created_id", "user_id", created_at.desc(), id.desc()),
+    )
     
     def __repr__(self):
         return f"<Query(id={self.id}, user_id={self.user_id}, question={self.question[:50]}...)>"
@@ -0,0 +1,17 @@
+from sqlalchemy import String, DateTime
+from sqlalchemy.sql import func
+from sqlalchemy.orm import Mapped, mapped_column
+from app.database import Base
+from datetime import datetime
+from typing import Optional
+
+
+class ProcessedStripeEvent(Base):
+    """Stripe webhook events already applied, so retried deliveries are skipped."""
+    __tablename__ = "processed_stripe_events"
+    
+    event_id: Mapped[str] = mapped_column(String, primary_key=True)
+    processed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    
+    def __repr__(self):
+        return f"<ProcessedStripeEvent(event_id={self.event_id})>"
@@ -1,31 +1,39 @@
-from sqlalchemy import Column, String, DateTime, Integer, Boolean, ForeignKey
+from sqlalchemy import String, DateTime, Integer, ForeignKey, case
 from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database import Base
+from datetime import datetime
+from typing import Optional, TYPE_CHECKING
 import uuid
 
+if TYPE_CHECKING:
+    from app.models.user import User
+
 
 class Subscription(Base):
     __tablename__ = "subscriptions"
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, unique=True, index=True)
-    stripe_customer_id = Column(String, unique=True, index=True)
-    stripe_subscription_id = Column(String, unique=True, index=True)
-    plan = Column(String, default="free")  # "free", "premium"
-    query_limit = Column(Integer, default=3)  # Free tier: 3 queries
-    queries_used = Column(Integer, default=0)
-    status = Column(String, default="active")  # "active", "canceled", "past_due"
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, unique=True, index=True)
+    stripe_customer_id: Mapped[Optional[str]] = mapped_column(String, unique=True, index=True)
+    stripe_subscription_id: Mapped[Optional[str]] = mapped_column(String, unique=True, index=True)  # Webhook lookups
+    plan: Mapped[Optional[str]] = mapped_column(String, default="free")  # "free", "premium"
+    query_limit: Mapped[Optional[int]] = mapped_column(Integer, default=3)  # Free tier: 3 queries
+    queries_used: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    lifetime_queries: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")  # Never reset
+    status: Mapped[Optional[str]] = mapped_column(String, default="active")  # "active", "canceled", "past_due"
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), onupdate=func.now())
     
     # Relationship
-    user = relationship("User", backref="subscription")
+    user: Mapped["User"] = relationship("User", backref="subscription")
     
     def __repr__(self):
         return f"<Subscription(id={self.id}, user_id={self.user_id}, plan={self.plan}, queries_used={self.queries_used}/{self.query_limit})>"
     
+    @hybrid_property
     def can_make_query(self) -> bool:
         """Check if user can make a query based on their subscription."""
         # Premium users have unlimited queries
@@ -33,10 +41,20 @@ class Subscription(Base):
             return True
         return self.queries_used < self.query_limit
     
-    def get_remaining_queries(self) -> int:
+    @can_make_query.expression
+    def can_make_query(cls):
+        """SQL form, so quota checks can be filtered in the database."""
+        return case((cls.plan == "premium", True), else_=cls.queries_used < cls.query_limit)
+    
+    @hybrid_property
+    def remaining_queries(self) -> int:
         """Get remaining queries for the user."""
         # Premium users have unlimited queries
         if self.plan == "premium":
             return -1  # -1 indicates unlimited
         return max(0, self.query_limit - self.queries_used)
-
+    
+    @remaining_queries.expression
+    def remaining_queries(cls):
+        """SQL form of remaining_queries."""
+        return case((cls.plan == "premium", -1), else_=func.greatest(0, cls.query_limit - cls.queries_used))
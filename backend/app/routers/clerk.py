@@ -1,7 +1,8 @@
-from fastapi import APIRouter, HTTPException, Request, Depends, Response
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, HTTPException, Request, Depends
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 import os
-import json
+import orjson
 from app.database import get_db
 from app.services.user_service import UserService
 from app.services.logger_service import get_logger
@@ -64,14 +65,12 @@ def verify_clerk_webhook(payload: bytes, headers: dict) -> dict:
         verified_payload = wh.verify(payload, headers)
         
         # Parse the verified payload
-        if isinstance(verified_payload, bytes):
-            parsed = json.loads(verified_payload.decode("utf-8"))
-        elif isinstance(verified_payload, str):
-            parsed = json.loads(verified_payload)
+        if isinstance(verified_payload, (bytes, str)):
+            parsed = orjson.loads(verified_payload)
         elif isinstance(verified_payload, dict):
             parsed = verified_payload
         else:
-            parsed = json.loads(str(verified_payload))
+            parsed = orjson.loads(str(verified_payload))
         
         if not isinstance(parsed, dict):
             raise ValueError(f"Parsed payload is not a dict, got {type(parsed)}")
@@ -85,7 +84,7 @@ def verify_clerk_webhook(payload: bytes, headers: dict) -> dict:
             context={"error_type": type(e).__name__}
         )
         raise HTTPException(status_code=400, detail=f"Webhook verification failed: {str(e)}")
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         logger.log_error(
             "clerk_webhook_json_decode_error",
             f"Invalid JSON payload: {str(e)}",
@@ -104,7 +103,7 @@ def verify_clerk_webhook(payload: bytes, headers: dict) -> dict:
 @router.post("/clerk/webhook")
 async def clerk_webhook(
     request: Request,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Handle Clerk webhook events.
@@ -186,14 +185,13 @@ async def clerk_webhook(
                         "event_data_keys": list(event_data.keys())
                     }
                 )
-                return Response(
-                    content=json.dumps({"status": "error", "message": "Missing user ID in event"}),
-                    status_code=200,
-                    media_type="application/json"
+                return ORJSONResponse(
+                    content={"status": "error", "message": "Missing user ID in event"},
+                    status_code=200
                 )
             
             # Delete user from database
-            deleted = UserService.delete_user_by_clerk_id(db, clerk_id)
+            deleted = await UserService.delete_user_by_clerk_id(db, clerk_id)
             
             if deleted:
                 logger.log_query(
@@ -202,14 +200,13 @@ async def clerk_webhook(
                     success=True,
                     zip_code=None
                 )
-                return Response(
-                    content=json.dumps({
+                return ORJSONResponse(
+                    content={
                         "status": "success",
                         "message": f"User {clerk_id} deleted successfully",
                         "clerk_id": clerk_id
-                    }),
-                    status_code=200,
-                    media_type="application/json"
+                    },
+                    status_code=200
                 )
             else:
                 logger.log_error(
@@ -218,14 +215,13 @@ async def clerk_webhook(
                     context={"clerk_id": clerk_id}
                 )
                 # Return success to prevent Clerk from retrying
-                return Response(
-                    content=json.dumps({
+                return ORJSONResponse(
+                    content={
                         "status": "success",
                         "message": f"User {clerk_id} not found in database",
                         "clerk_id": clerk_id
-                    }),
-                    status_code=200,
-                    media_type="application/json"
+                    },
+                    status_code=200
                 )
         
         else:
@@ -236,14 +232,13 @@ async def clerk_webhook(
                 success=True,
                 zip_code=None
             )
-            return Response(
-                content=json.dumps({
+            return ORJSONResponse(
+                content={
                     "status": "success",
                     "message": f"Unhandled event type: {event_type}",
                     "event_type": event_type
-                }),
-                status_code=200,
-                media_type="application/json"
+                },
+                status_code=200
             )
     
     except Exception as e:
@@ -257,12 +252,11 @@ async def clerk_webhook(
             }
         )
         # Return 200 OK with error status to prevent Clerk from retrying
-        return Response(
-            content=json.dumps({
+        return ORJSONResponse(
+            content={
                 "status": "error",
                 "message": str(e),
                 "event_type": event_type
-            }),
-            status_code=200,
-            media_type="application/json"
+            },
+            status_code=200
         )
@@ -1,24 +1,65 @@
 from fastapi import APIRouter, HTTPException, Depends
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, field_validator
 from typing import Optional
+from datetime import timedelta
+import re
 from app.services.nrel_client import NRELClient
+from app.services.cache_service import get_cache_service
 from app.middleware.auth import get_current_user
 from app.models.user import User
 
 router = APIRouter()
 
 # Constants
-VALID_SECTORS = ["residential", "commercial", "industrial"]
+VALID_SECTORS = frozenset({"residential", "commercial", "industrial"})
+INVALID_SECTOR_DETAIL = "Invalid sector. Must be one of: residential, commercial, industrial"
+ZIP_CODE_RE = re.compile(r"\d{5}")
+
+# Utility rates change infrequently (the NREL dataset itself is rarely updated)
+UTILITY_RATES_CACHE_TTL = timedelta(hours=24)
+
+_nrel_client: Optional[NRELClient] = None
+
+
+def get_nrel_client() -> NRELClient:
+    """Get the shared NREL client instance."""
+    global _nrel_client
+    if _nrel_client is None:
+        _nrel_client = NRELClient()
+    return _nrel_client
+
+
+def normalize_sector(sector: Optional[str]) -> str:
+    """Lowercase the sector (defaulting to residential) and check it is supported."""
+    sector = (sector or "residential").lower()
+    if sector not in VALID_SECTORS:
+        raise ValueError(INVALID_SECTOR_DETAIL)
+    return sector
 
 
 class UtilityRatesRequest(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+    
     location: str  # Can be zip code, address, or lat/long
     sector: Optional[str] = "residential"  # residential, commercial, or industrial
+    
+    _normalize_sector = field_validator("sector")(normalize_sector)
 
 
 class ZipCodeUtilityRatesRequest(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+    
     zip_code: str
     sector: Optional[str] = "residential"
+    
+    _normalize_sector = field_validator("sector")(normalize_sector)
+    
+    @field_validator("zip_code")
+    @classmethod
+    def check_zip_code(cls, zip_code: str) -> str:
+        if not ZIP_CODE_RE.fullmatch(zip_code):
+            raise ValueError("Zip code must be a 5-digit number")
+        return zip_code
 
 
 @router.post("/utility-rates")
@@ -37,6 +78,8 @@ async def get_utility_rates(
         sector: Sector type - "residential", "commercial", or "industrial"
                (default: "residential")
     
+    Invalid input is rejected with a 422 by the request model.
+    
     Returns:
         Dictionary containing utility rate information including:
         - utility_name: Name of the utility company
@@ -50,22 +93,21 @@ async def get_utility_rates(
     Documentation: https://developer.nrel.gov/docs/electricity/utility-rates-v3/
     """
     try:
-        # Validate sector
-        if request.sector and request.sector.lower() not in VALID_SECTORS:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Invalid sector. Must be one of: {', '.join(VALID_SECTORS)}"
-            )
-        
-        nrel_client = NRELClient()
-        rates = await nrel_client.get_utility_rates(
+        sector = request.sector
+        nrel_client = get_nrel_client()
+        cache = get_cache_service()
+        cache_key = cache.make_key("utility_rates_response", location=request.location, sector=sector)
+        rates = await cache.get_or_fetch(
+            cache_key,
+            nrel_client.get_utility_rates,
+            UTILITY_RATES_CACHE_TTL,
             location=request.location,
-            sector=request.sector or "residential"
+            sector=sector
         )
         
         return {
             "location": request.location,
-            "sector": request.sector or "residential",
+            "sector": sector,
             "rates": rates
         }
     except ValueError as e:
@@ -89,33 +131,27 @@ async def get_utility_rates_by_zip(
         sector: Sector type - "residential", "commercial", or "industrial"
                (default: "residential")
     
+    Invalid input is rejected with a 422 by the request model.
+    
     Returns:
         Dictionary containing utility rate information
     """
     try:
-        # Validate sector
-        if request.sector and request.sector.lower() not in VALID_SECTORS:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Invalid sector. Must be one of: {', '.join(VALID_SECTORS)}"
-            )
-        
-        # Validate zip code format
-        if not request.zip_code.isdigit() or len(request.zip_code) != 5:
-            raise HTTPException(
-                status_code=400,
-                detail="Zip code must be a 5-digit number"
-            )
-        
-        nrel_client = NRELClient()
-        rates = await nrel_client.get_utility_rates_by_zip(
+        sector = request.sector
+        nrel_client = get_nrel_client()
+        cache = get_cache_service()
+        cache_key = cache.make_key("utility_rates_response", location=request.zip_code, sector=sector)
+        rates = await cache.get_or_fetch(
+            cache_key,
+            nrel_client.get_utility_rates_by_zip,
+            UTILITY_RATES_CACHE_TTL,
             zip_code=request.zip_code,
-            sector=request.sector or "residential"
+            sector=sector
         )
         
         return {
             "zip_code": request.zip_code,
-            "sector": request.sector or "residential",
+            "sector": sector,
             "rates": rates
         }
     except ValueError as e:
@@ -1,71 +1,91 @@
-from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import select, desc, func
+from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi.responses import ORJSONResponse, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, desc
 from typing import List
 from app.models.query import Query
 from app.models.user import User
 from app.middleware.auth import get_current_user
 from app.database import get_db
 from app.services.user_service import UserService
-from pydantic import BaseModel
+import hashlib
+import orjson
 
 router = APIRouter()
 
 
-class QueryHistoryItem(BaseModel):
-    id: str
-    question: str
-    answer: str
-    zip_code: str | None
-    sources_count: int
-    created_at: str
-
-
-@router.get("/history/queries")
+@router.get("/history/queries", response_class=ORJSONResponse)
 async def get_query_history(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     limit: int = 50,
     offset: int = 0
 ):
-    """Get user's query history."""
-    queries = db.scalars(
-        select(Query)
+    """
+    Get user's query history.
+    Only the listed columns are selected, so the sources_data JSON isn't transferred.
+    One extra row is fetched to tell whether another page exists, instead of
+    counting the user's queries.
+    """
+    queries = (await db.execute(
+        select(
+            Query.id,
+            Query.question,
+            Query.answer,
+            Query.zip_code,
+            Query.sources_count,
+            Query.created_at
+        )
         .where(Query.user_id == current_user.id)
-        .order_by(desc(Query.created_at))
-        .limit(limit)
+        .order_by(desc(Query.created_at), desc(Query.id))
+        .limit(limit + 1)
         .offset(offset)
-    ).all()
+    )).all()
+    has_more = len(queries) > limit
     
-    return [
-        QueryHistoryItem(
-            id=str(q.id),
-            question=q.question,
-            answer=q.answer,
-            zip_code=q.zip_code,
-            sources_count=q.sources_count,
-            created_at=q.created_at.isoformat() if q.created_at else ""
-        )
-        for q in queries
-    ]
+    # Plain dicts straight to orjson; there is no response model to validate against
+    return ORJSONResponse({
+        "items": [
+            {
+                "id": str(q.id),
+                "question": q.question,
+                "answer": q.answer,
+                "zip_code": q.zip_code,
+                "sources_count": q.sources_count,
+                "created_at": q.created_at.isoformat() if q.created_at else ""
+            }
+            for q in queries[:limit]
+        ],
+        "has_more": has_more
+    })
 
 
 @router.get("/history/stats")
 async def get_query_stats(
+    request: Request,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    """Get user's query statistics."""
-    subscription = UserService.get_user_subscription(db, current_user.id)
-    total_queries = db.scalar(
-        select(func.count(Query.id)).where(Query.user_id == current_user.id)
-    ) or 0
+    """
+    Get user's query statistics.
     
-    return {
-        "total_queries": total_queries,
+    Responses carry an ETag and must be revalidated (stats change after every
+    query), so unchanged stats are answered with an empty 304.
+    """
+    subscription = await UserService.get_user_subscription(db, current_user.id)
+    
+    stats = {
+        "total_queries": subscription.lifetime_queries if subscription else 0,
         "queries_used": subscription.queries_used if subscription else 0,
-        "queries_remaining": subscription.get_remaining_queries() if subscription else 0,
+        "queries_remaining": subscription.remaining_queries if subscription else 0,
         "query_limit": subscription.query_limit if subscription else 3,
         "plan": subscription.plan if subscription else "free"
     }
-
+    body = orjson.dumps(stats)
+    # Content hash, so every worker computes the same ETag for the same stats
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
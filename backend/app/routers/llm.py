@@ -1,12 +1,15 @@
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from app.services.llm_service import LLMService
+from pydantic import BaseModel, ConfigDict
+from app.services.llm_service import get_llm_service
+from functools import lru_cache
+from typing import Dict
 
 router = APIRouter()
-llm_service = LLMService()
 
 
 class LLMRequest(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+    
     prompt: str
 
 
@@ -21,6 +24,7 @@ async def chat_with_llm(request: LLMRequest):
     Chat with the configured LLM (Ollama or Gemini based on LLM_MODE).
     """
     try:
+        llm_service = get_llm_service()
         llm = llm_service.get_llm()
         response = await llm.acomplete(request.prompt)
         
@@ -35,18 +39,28 @@ async def chat_with_llm(request: LLMRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@lru_cache(maxsize=1)
+def describe_llm() -> Dict[str, str]:
+    """
+    Describe the configured LLM. The LLM is fixed for the life of the process,
+    so this is computed once (failures aren't cached and are retried).
+    """
+    llm_service = get_llm_service()
+    llm = llm_service.get_llm()
+    return {
+        "mode": llm_service.settings.llm_mode,
+        "model_type": type(llm).__name__,
+        "model_name": getattr(llm, "model", "N/A") if hasattr(llm, "model") else "N/A",
+    }
+
+
 @router.get("/llm/info")
 async def get_llm_info():
     """
     Get information about the currently configured LLM.
     """
     try:
-        llm = llm_service.get_llm()
-        return {
-            "mode": llm_service.settings.llm_mode,
-            "model_type": type(llm).__name__,
-            "model_name": getattr(llm, "model", "N/A") if hasattr(llm, "model") else "N/A",
-        }
+        return describe_llm()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -1,57 +1,139 @@
 from fastapi import APIRouter, HTTPException, Depends
-from fastapi.responses import StreamingResponse, Response
-from sqlalchemy.orm import Session
-from pydantic import BaseModel
-from typing import Optional, Dict, Any, AsyncGenerator
-from app.services.rag_service import RAGService
-from app.services.llm_service import LLMService
+from sse_starlette.sse import EventSourceResponse
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Optional, Dict, Any, AsyncGenerator, Coroutine, List, Set, TYPE_CHECKING
+from app.services.llm_service import get_llm_service
 from app.services.user_service import UserService
+from app.services.query_writer import get_query_writer
 from app.middleware.auth import get_current_user
 from app.models.user import User
-from app.models.query import Query
-from app.database import get_db
-import uuid
-import json
+from app.services.logger_service import get_logger
+from app.database import AsyncSessionLocal
 import asyncio
+import uuid
+import orjson
+
+if TYPE_CHECKING:
+    from app.services.rag_service import RAGService
+
+logger = get_logger("rag_router")
 
 router = APIRouter()
-llm_service = LLMService()
+
+# Post-query bookkeeping tasks, referenced until done so they aren't garbage collected
+_background_tasks: Set[asyncio.Task] = set()
+
+
+def run_in_background(coro: Coroutine):
+    """Run post-query work after the response, logging (not raising) failures."""
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_task_done)
+
+
+def _background_task_done(task: asyncio.Task):
+    _background_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.log_error("post_query_task_failed", str(task.exception()))
+
+
+async def record_query_usage(user_id: uuid.UUID):
+    """Count a completed query against the user's quota, in its own session."""
+    async with AsyncSessionLocal() as db:
+        await UserService.increment_query_count(db, user_id)
+
+
+# RAGService instances by LLM mode, built once per process
+_rag_services: Dict[str, "RAGService"] = {}
+
+
+def get_rag_service() -> "RAGService":
+    """
+    Get the shared RAGService for the configured LLM mode.
+    Imported here so loading the router doesn't pull in llama_index.
+    """
+    llm_mode = get_llm_service().settings.llm_mode
+    rag_service = _rag_services.get(llm_mode)
+    if rag_service is None:
+        from app.services.rag_service import RAGService
+        try:
+            rag_service = _rag_services.setdefault(llm_mode, RAGService(llm_mode=llm_mode))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+    return rag_service
 
 
 class RAGQueryRequest(BaseModel):
+    # FastAPI validates request bodies through its own adapter, so the model's
+    # validator is only built if the model is also used directly
+    model_config = ConfigDict(defer_build=True)
+    
     question: str
     zip_code: Optional[str] = None
     top_k: int = 5
 
 
 class DetectedLocation(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+    
     type: Optional[str] = None
     zip_code: Optional[str] = None
     city: Optional[str] = None
     state: Optional[str] = None
 
 
+class StoredSource(BaseModel):
+    """Trimmed source metadata persisted with a query in history."""
+    title: Optional[str] = None
+    score: Optional[float] = None
+
+
+# Metadata keys that name a source, in order of preference (varies by domain)
+SOURCE_TITLE_KEYS = ("title", "station_name", "utility_name", "name")
+
+
+def trim_sources(sources: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Reduce sources to {title, score} before saving them to history.
+    Source text and full metadata are only needed for the live response.
+    """
+    trimmed = []
+    for source in sources:
+        metadata = source.get("metadata") or {}
+        title = next((metadata[key] for key in SOURCE_TITLE_KEYS if metadata.get(key)), None)
+        trimmed.append(StoredSource(
+            title=title,
+            score=source.get("score")
+        ).model_dump())
+    return trimmed
+
+
 class IndexStationsRequest(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+    
     zip_code: str
     limit: int = 50
 
 
 class BulkIndexStateRequest(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+    
     state: str  # 2-letter state code (e.g., "OH")
     batch_size: int = 100
     limit: Optional[int] = None  # Optional limit for testing
+    concurrency: int = Field(default=8, ge=1, le=32)  # Batches embedded in parallel
 
 
 @router.post("/rag/index-stations")
-async def index_stations(request: IndexStationsRequest):
+async def index_stations(
+    request: IndexStationsRequest,
+    rag_service: "RAGService" = Depends(get_rag_service)
+):
     """
     Fetch stations from NREL API and index them into the vector database.
     This is useful for pre-populating the database or refreshing data.
     """
     try:
-        llm_mode = llm_service.settings.llm_mode
-        rag_service = RAGService(llm_mode=llm_mode)
-        
         result = await rag_service.fetch_and_index_stations(
             zip_code=request.zip_code,
             limit=request.limit
@@ -63,7 +145,10 @@ async def index_stations(request: IndexStationsRequest):
 
 
 @router.post("/rag/bulk-index-state")
-async def bulk_index_state(request: BulkIndexStateRequest):
+async def bulk_index_state(
+    request: BulkIndexStateRequest,
+    rag_service: "RAGService" = Depends(get_rag_service)
+):
     """
     Bulk index all EV charging stations for a state.
     
@@ -83,13 +168,11 @@ async def bulk_index_state(request: BulkIndexStateRequest):
                 detail="State code must be 2 letters (e.g., OH, CA, NY)"
             )
         
-        llm_mode = llm_service.settings.llm_mode
-        rag_service = RAGService(llm_mode=llm_mode)
-        
         result = await rag_service.bulk_index_state(
             state=request.state.upper(),
             batch_size=request.batch_size,
-            limit=request.limit
+            limit=request.limit,
+            concurrency=request.concurrency
         )
         
         return result
@@ -97,17 +180,35 @@ async def bulk_index_state(request: BulkIndexStateRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-def format_sse_event(event_type: str, data: Any) -> str:
-    """Format data as Server-Sent Event."""
-    json_data = json.dumps(data, ensure_ascii=False)
-    return f"event: {event_type}\ndata: {json_data}\n\n"
+# Seconds between keep-alive comments on idle streams (e.g. while the LLM is thinking)
+SSE_PING_INTERVAL = 15
+# The frontend splits events on "\n\n", so lines are separated with "\n" rather than "\r\n"
+# (format_sse_event frames events itself; this applies to keep-alive pings)
+SSE_SEPARATOR = "\n"
+
+
+def format_sse_event(event_type: str, data: Any) -> bytes:
+    """
+    Format data as Server-Sent Event.
+    Built as bytes so EventSourceResponse sends it without re-encoding; orjson
+    escapes newlines, so the payload always fits on one data line.
+    """
+    return (
+        b"event: " + event_type.encode() + b"\ndata: "
+        + orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS) + b"\n\n"
+    )
+
+
+# Events with fixed payloads, framed once at import
+SSE_STARTING = format_sse_event("status", {"stage": "analyzing", "message": "Starting query..."})
+SSE_NO_SUBSCRIPTION = format_sse_event("error", {"message": "Subscription not found"})
 
 
 @router.post("/rag/query-stream")
 async def rag_query_stream(
     request: RAGQueryRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    rag_service: "RAGService" = Depends(get_rag_service)
 ):
     """
     Perform a RAG query with Server-Sent Events (SSE) streaming.
@@ -122,31 +223,28 @@ async def rag_query_stream(
     - done: Final response with sources
     - error: Error messages
     """
-    async def generate_stream() -> AsyncGenerator[str, None]:
+    async def generate_stream() -> AsyncGenerator[bytes, None]:
         final_result = None
         try:
             # Yield immediately to start HTTP response stream BEFORE any heavy work
             # This ensures FastAPI sends response headers immediately
-            yield format_sse_event("status", {"stage": "analyzing", "message": "Starting query..."})
-            await asyncio.sleep(0.01)  # Yield control to allow headers to be sent
+            yield SSE_STARTING
             
-            # Check query limit
-            subscription = UserService.get_user_subscription(db, current_user.id)
+            # Check query limit. The session is closed before the (long) query stream so its
+            # connection goes back to the pool instead of idling in a transaction
+            async with AsyncSessionLocal() as db:
+                subscription = await UserService.get_user_subscription(db, current_user.id)
             if not subscription:
-                yield format_sse_event("error", {"message": "Subscription not found"})
+                yield SSE_NO_SUBSCRIPTION
                 return
             
-            if not subscription.can_make_query():
-                remaining = subscription.get_remaining_queries()
+            if not subscription.can_make_query:
+                remaining = subscription.remaining_queries
                 yield format_sse_event("error", {
                     "message": f"Query limit reached. You have {remaining} queries remaining. Please upgrade to continue."
                 })
                 return
             
-            # Process query with streaming (status updates come from rag_service)
-            llm_mode = llm_service.settings.llm_mode
-            rag_service = RAGService(llm_mode=llm_mode)
-            
             # Stream the query processing
             async for event_type, event_data in rag_service.query_stream(
                 question=request.question,
@@ -156,17 +254,15 @@ async def rag_query_stream(
                 # Capture final result for history saving
                 if event_type == "done":
                     final_result = event_data
-                # Format and yield SSE event immediately
-                sse_event = format_sse_event(event_type, event_data)
-                yield sse_event
-                # Yield control to event loop to ensure FastAPI flushes immediately
-                await asyncio.sleep(0.01)
+                # Format and yield SSE event immediately (each event is sent as its own chunk)
+                yield format_sse_event(event_type, event_data)
             
-            # Increment query count and save to history if we got a result
+            # Increment query count and save to history if we got a result.
+            # Both happen in the background so the stream closes right after "done".
             if final_result:
-                UserService.increment_query_count(db, current_user.id)
+                run_in_background(record_query_usage(current_user.id))
                 
-                # Save query to history
+                # Save query to history (written in the background, batched with other requests)
                 zipcode_for_history = request.zip_code
                 detected_location = final_result.get("detected_location")
                 if detected_location and isinstance(detected_location, dict):
@@ -174,25 +270,15 @@ async def rag_query_stream(
                     if detected_zip:
                         zipcode_for_history = detected_zip
                 
-                try:
-                    query_record = Query(
-                        id=uuid.uuid4(),
-                        user_id=current_user.id,
-                        question=request.question,
-                        answer=final_result.get("answer", ""),
-                        zip_code=zipcode_for_history,
-                        sources_count=final_result.get("num_sources", 0),
-                        sources_data=final_result.get("sources", [])
-                    )
-                    db.add(query_record)
-                    db.commit()
-                except Exception as db_error:
-                    error_msg = str(db_error)
-                    # Log but don't fail the stream if history save fails
-                    if "does not exist" in error_msg and "queries" in error_msg:
-                        yield format_sse_event("error", {
-                            "message": "Warning: Could not save query to history. Database table 'queries' does not exist."
-                        })
+                get_query_writer().enqueue(
+                    id=uuid.uuid4(),
+                    user_id=current_user.id,
+                    question=request.question,
+                    answer=final_result.get("answer", ""),
+                    zip_code=zipcode_for_history,
+                    sources_count=final_result.get("num_sources", 0),
+                    sources_data=trim_sources(final_result.get("sources", []))
+                )
             
         except HTTPException as e:
             yield format_sse_event("error", {"message": e.detail})
@@ -209,15 +295,17 @@ async def rag_query_stream(
     #   labels:
     #     - "traefik.http.services.backend.buffering.maxRequestBodyBytes=0"
     #     - "traefik.http.services.backend.buffering.maxResponseBodyBytes=0"
-    return StreamingResponse(
+    #
+    # EventSourceResponse already sends Connection: keep-alive and
+    # X-Accel-Buffering: no (nginx; Traefik ignores it).
+    return EventSourceResponse(
         generate_stream(),
-        media_type="text/event-stream",
+        ping=SSE_PING_INTERVAL,
+        sep=SSE_SEPARATOR,
         headers={
             "Cache-Control": "no-cache, no-store, must-revalidate",
             "Pragma": "no-cache",
             "Expires": "0",
-            "Connection": "keep-alive",
-            "X-Accel-Buffering": "no",  # Disable buffering in nginx (Traefik ignores this)
             "X-Content-Type-Options": "nosniff",
         }
     )
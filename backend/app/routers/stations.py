@@ -1,11 +1,13 @@
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from app.services.nrel_client import NRELClient
 
 router = APIRouter()
 
 
 class ZipCodeRequest(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+    
     zip_code: str
 
 
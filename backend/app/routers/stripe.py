@@ -1,14 +1,17 @@
 from fastapi import APIRouter, HTTPException, Depends, Request
-from sqlalchemy.orm import Session
-from sqlalchemy import select
-from pydantic import BaseModel
-from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, case, literal
+from sqlalchemy.dialects.postgresql import insert
+from pydantic import BaseModel, ConfigDict
+from typing import Any, Awaitable, Callable, Dict, Optional
+import asyncio
 import os
 import stripe
-from app.database import get_db
+from app.database import get_db, AsyncSessionLocal
 from app.middleware.auth import get_current_user
 from app.models.user import User
 from app.models.subscription import Subscription
+from app.models.stripe_event import ProcessedStripeEvent
 from app.services.stripe_service import StripeService
 from app.services.user_service import UserService
 from app.services.logger_service import get_logger
@@ -18,8 +21,9 @@ logger = get_logger("stripe_router")
 router = APIRouter()
 stripe_service = StripeService()
 
-
 class CreateCheckoutRequest(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+    
     success_url: str
     cancel_url: str
 
@@ -28,16 +32,17 @@ class CreateCheckoutRequest(BaseModel):
 async def create_checkout(
     request: CreateCheckoutRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Create Stripe checkout session for subscription."""
-    subscription = UserService.get_user_subscription(db, current_user.id)
+    subscription = await UserService.get_user_subscription(db, current_user.id)
     
     if not subscription:
         raise HTTPException(status_code=404, detail="Subscription not found")
     
     try:
-        result = stripe_service.create_checkout_session(
+        result = await asyncio.to_thread(
+            stripe_service.create_checkout_session,
             customer_id=subscription.stripe_customer_id,
             user_email=current_user.email,
             user_id=str(current_user.id),
@@ -53,17 +58,18 @@ async def create_checkout(
 @router.post("/stripe/create-portal")
 async def create_portal(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Create Stripe customer portal session."""
-    subscription = UserService.get_user_subscription(db, current_user.id)
+    subscription = await UserService.get_user_subscription(db, current_user.id)
     
     if not subscription or not subscription.stripe_customer_id:
         raise HTTPException(status_code=404, detail="No active subscription found")
     
     try:
         frontend_url = os.getenv('FRONTEND_URL', 'http://localhost:3000')
-        result = stripe_service.create_portal_session(
+        result = await asyncio.to_thread(
+            stripe_service.create_portal_session,
             customer_id=subscription.stripe_customer_id,
             return_url=f"{frontend_url}/subscription"
         )
@@ -76,10 +82,10 @@ async def create_portal(
 @router.post("/stripe/cancel-subscription")
 async def cancel_subscription(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Cancel subscription and downgrade to free tier."""
-    subscription = UserService.get_user_subscription(db, current_user.id)
+    subscription = await UserService.get_user_subscription(db, current_user.id)
     
     if not subscription:
         raise HTTPException(status_code=404, detail="Subscription not found")
@@ -91,13 +97,14 @@ async def cancel_subscription(
         # Cancel subscription in Stripe if it exists
         if subscription.stripe_subscription_id:
             # Cancel at end of billing period so user gets full value
-            stripe.Subscription.modify(
+            await asyncio.to_thread(
+                stripe.Subscription.modify,
                 subscription.stripe_subscription_id,
                 cancel_at_period_end=True
             )
             # Update status to indicate cancellation is scheduled
             subscription.status = "canceled"
-            db.commit()
+            await db.commit()
             
             logger.log_query(
                 question="subscription_cancel_scheduled",
@@ -112,7 +119,7 @@ async def cancel_subscription(
             }
         else:
             # No Stripe subscription, just downgrade in our system
-            UserService.downgrade_to_free(db=db, user_id=str(current_user.id))
+            await UserService.downgrade_to_free(db=db, user_id=str(current_user.id))
             return {"status": "success", "message": "Subscription canceled successfully"}
     except stripe.error.StripeError as e:
         logger.log_error("stripe_cancel_failed", str(e), context={"user_id": str(current_user.id)})
@@ -122,143 +129,196 @@ async def cancel_subscription(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _handle_checkout_completed(db: AsyncSession, event: Dict[str, Any]) -> Optional[Dict[str, str]]:
+    """Subscription created - upgrade user to premium."""
+    session = event["data"]["object"]
+    customer_id = session.get("customer")
+    subscription_id = session.get("subscription")
+    user_id = session.get("metadata", {}).get("user_id")
+    
+    if not user_id:
+        logger.log_error("webhook_missing_user_id", "checkout.session.completed missing user_id in metadata")
+        return {"status": "error", "message": "Missing user_id in metadata"}
+    
+    # Update user subscription to premium
+    await UserService.upgrade_to_premium(
+        db=db,
+        user_id=user_id,
+        stripe_customer_id=customer_id,
+        stripe_subscription_id=subscription_id
+    )
+    
+    logger.log_query(
+        question="subscription_upgraded",
+        user_id=user_id,
+        success=True,
+        zip_code=None
+    )
+
+
+async def _handle_subscription_updated(db: AsyncSession, event: Dict[str, Any]) -> Optional[Dict[str, str]]:
+    """Subscription updated (e.g., billing period renewed)."""
+    subscription_data = event["data"]["object"]
+    stripe_subscription_id = subscription_data.get("id")
+    subscription_status = subscription_data.get("status", "active")
+    
+    # Update by Stripe subscription ID in one statement. SET expressions see the
+    # row's previous values, and the self-join returns the previous status.
+    # Only reset queries if subscription was reactivated (status changed to active);
+    # the invoice.payment_succeeded event handles monthly renewals
+    previous = Subscription.__table__.alias("previous")
+    updated = (await db.execute(
+        update(Subscription)
+        .where(
+            Subscription.id == previous.c.id,
+            Subscription.stripe_subscription_id == stripe_subscription_id
+        )
+        .values(
+            status=subscription_status,
+            queries_used=case(
+                (
+                    (Subscription.plan == "premium")
+                    & literal(subscription_status == "active")
+                    & (Subscription.status != "active"),
+                    0
+                ),
+                else_=Subscription.queries_used
+            )
+        )
+        .returning(Subscription.user_id, Subscription.plan, previous.c.status.label("previous_status"))
+    )).first()
+    
+    if updated:
+        await db.commit()
+        user_id, plan, previous_status = updated
+    
+        if plan == "premium" and subscription_status == "active" and previous_status != "active":
+            # Queries were reset on reactivation (e.g., after payment issue resolved)
+            logger.log_query(
+                question="queries_reset_on_subscription_reactivation",
+                user_id=str(user_id),
+                success=True,
+                zip_code=None
+            )
+        
+        logger.log_query(
+            question="subscription_updated",
+            user_id=str(user_id),
+            success=True,
+            zip_code=None
+        )
+
+
+async def _handle_subscription_deleted(db: AsyncSession, event: Dict[str, Any]) -> Optional[Dict[str, str]]:
+    """Subscription canceled - downgrade to free."""
+    subscription_data = event["data"]["object"]
+    stripe_subscription_id = subscription_data.get("id")
+        
+    # Find the subscription's user by Stripe subscription ID
+    user_id = await db.scalar(
+        select(Subscription.user_id).where(Subscription.stripe_subscription_id == stripe_subscription_id)
+    )
+    
+    if user_id:
+        await UserService.downgrade_to_free(db=db, user_id=str(user_id))
+    
+        logger.log_query(
+            question="subscription_canceled",
+            user_id=str(user_id),
+            success=True,
+            zip_code=None
+        )
+
+
+async def _handle_payment_succeeded(db: AsyncSession, event: Dict[str, Any]) -> Optional[Dict[str, str]]:
+    """Payment succeeded - reset queries for premium users on new billing period."""
+    invoice = event["data"]["object"]
+    stripe_subscription_id = invoice.get("subscription")
+    billing_reason = invoice.get("billing_reason")
+        
+    # Reset query count for new billing period
+    # billing_reason values:
+    # - subscription_create: Initial subscription payment
+    # - subscription_cycle: Monthly renewal payment
+    # - subscription_update: Subscription plan change
+    # We reset on all of these to ensure queries reset monthly
+    if stripe_subscription_id and billing_reason in ["subscription_cycle", "subscription_create", "subscription_update"]:
+        user_id = await db.scalar(
+            update(Subscription)
+            .where(
+                Subscription.stripe_subscription_id == stripe_subscription_id,
+                Subscription.plan == "premium"
+            )
+            .values(queries_used=0)
+            .returning(Subscription.user_id)
+        )
+    
+        if user_id:
+            await db.commit()
+        
+            logger.log_query(
+                question="queries_reset_on_payment",
+                user_id=str(user_id),
+                success=True,
+                zip_code=None
+            )
+
+
+# Webhook event types that update subscriptions, and their handlers. A handler may
+# return a response to end processing without recording the event.
+WEBHOOK_HANDLERS: Dict[str, Callable[[AsyncSession, Dict[str, Any]], Awaitable[Optional[Dict[str, str]]]]] = {
+    "checkout.session.completed": _handle_checkout_completed,
+    "customer.subscription.updated": _handle_subscription_updated,
+    "customer.subscription.deleted": _handle_subscription_deleted,
+    "invoice.payment_succeeded": _handle_payment_succeeded,
+}
+
+
 @router.post("/stripe/webhook")
-async def stripe_webhook(
-    request: Request,
-    db: Session = Depends(get_db)
-):
+async def stripe_webhook(request: Request):
     """Handle Stripe webhook events."""
-    payload = await request.body()
     signature = request.headers.get("stripe-signature")
     
     if not signature:
         raise HTTPException(status_code=400, detail="Missing signature")
     
     try:
-        event = stripe_service.verify_webhook(payload, signature)
+        # Signature is checked as the body streams in
+        event = await stripe_service.verify_webhook(request.stream(), signature)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     
-    # Handle different event types
+    # Events we don't handle never open a database session
+    handler = WEBHOOK_HANDLERS.get(event["type"])
+    if handler is None:
+        return {"status": "success"}
+    
     try:
-        if event["type"] == "checkout.session.completed":
-            # Subscription created - upgrade user to premium
-            session = event["data"]["object"]
-            customer_id = session.get("customer")
-            subscription_id = session.get("subscription")
-            user_id = session.get("metadata", {}).get("user_id")
-            
-            if not user_id:
-                logger.log_error("webhook_missing_user_id", "checkout.session.completed missing user_id in metadata")
-                return {"status": "error", "message": "Missing user_id in metadata"}
-            
-            # Update user subscription to premium
-            UserService.upgrade_to_premium(
-                db=db,
-                user_id=user_id,
-                stripe_customer_id=customer_id,
-                stripe_subscription_id=subscription_id
-            )
-            
-            logger.log_query(
-                question="subscription_upgraded",
-                user_id=user_id,
-                success=True,
-                zip_code=None
-            )
-            
-        elif event["type"] == "customer.subscription.updated":
-            # Subscription updated (e.g., billing period renewed)
-            subscription_data = event["data"]["object"]
-            stripe_subscription_id = subscription_data.get("id")
-            customer_id = subscription_data.get("customer")
-            subscription_status = subscription_data.get("status", "active")
-            
-            # Find subscription by Stripe subscription ID
-            subscription = db.scalar(
-                select(Subscription).where(Subscription.stripe_subscription_id == stripe_subscription_id)
+        async with AsyncSessionLocal() as db:
+            # Claim the event; Stripe retries deliveries, and a claimed event has already been
+            # applied. The claim commits with the handler's commit (each handler commits once,
+            # after its changes) or the final one below. If the handler fails first, the claim
+            # is rolled back with its changes and the 500 below makes Stripe retry the event.
+            claimed = await db.scalar(
+                insert(ProcessedStripeEvent)
+                .values(event_id=event["id"])
+                .on_conflict_do_nothing()
+                .returning(ProcessedStripeEvent.event_id)
             )
+            if claimed is None:
+                return {"status": "success"}
             
-            if subscription:
-                previous_status = subscription.status
-                subscription.status = subscription_status
-                
-                # Only reset queries if subscription was reactivated (status changed to active)
-                # The invoice.payment_succeeded event handles monthly renewals
-                if (subscription.plan == "premium" 
-                    and subscription_status == "active" 
-                    and previous_status != "active"):
-                    # Reset queries on reactivation (e.g., after payment issue resolved)
-                    subscription.queries_used = 0
-                    logger.log_query(
-                        question="queries_reset_on_subscription_reactivation",
-                        user_id=str(subscription.user_id),
-                        success=True,
-                        zip_code=None
-                    )
-                
-                db.commit()
-                
-                logger.log_query(
-                    question="subscription_updated",
-                    user_id=str(subscription.user_id),
-                    success=True,
-                    zip_code=None
-                )
-        
-        elif event["type"] == "customer.subscription.deleted":
-            # Subscription canceled - downgrade to free
-            subscription_data = event["data"]["object"]
-            stripe_subscription_id = subscription_data.get("id")
+            response = await handler(db, event)
+            if response is not None:
+                return response
             
-            # Find subscription by Stripe subscription ID
-            subscription = db.scalar(
-                select(Subscription).where(Subscription.stripe_subscription_id == stripe_subscription_id)
-            )
+            # Record the event for handlers that made no changes of their own
+            await db.commit()
             
-            if subscription:
-                UserService.downgrade_to_free(db=db, user_id=str(subscription.user_id))
-                
-                logger.log_query(
-                    question="subscription_canceled",
-                    user_id=str(subscription.user_id),
-                    success=True,
-                    zip_code=None
-                )
-        
-        elif event["type"] == "invoice.payment_succeeded":
-            # Payment succeeded - reset queries for premium users on new billing period
-            invoice = event["data"]["object"]
-            stripe_subscription_id = invoice.get("subscription")
-            billing_reason = invoice.get("billing_reason")
-            
-            if stripe_subscription_id:
-                subscription = db.scalar(
-                    select(Subscription).where(Subscription.stripe_subscription_id == stripe_subscription_id)
-                )
-                
-                if subscription and subscription.plan == "premium":
-                    # Reset query count for new billing period
-                    # billing_reason values:
-                    # - subscription_create: Initial subscription payment
-                    # - subscription_cycle: Monthly renewal payment
-                    # - subscription_update: Subscription plan change
-                    # We reset on all of these to ensure queries reset monthly
-                    if billing_reason in ["subscription_cycle", "subscription_create", "subscription_update"]:
-                        subscription.queries_used = 0
-                        db.commit()
-                        
-                        logger.log_query(
-                            question="queries_reset_on_payment",
-                            user_id=str(subscription.user_id),
-                            success=True,
-                            zip_code=None
-                        )
-        
     except Exception as e:
+        # Closing the session rolled back anything uncommitted, including the claim
         logger.log_error("webhook_processing_error", str(e), context={"event_type": event.get("type")})
-        # Don't raise exception - return success to Stripe to prevent retries
-        # Log the error for manual investigation
+        raise HTTPException(status_code=500, detail="Webhook processing failed")
     
     return {"status": "success"}
 
@@ -1,20 +1,24 @@
-from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
-from pydantic import BaseModel
+from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, Request
+from fastapi.responses import Response
+from pydantic import BaseModel, ConfigDict
 from typing import Optional, List
+import re
 import uuid
-from app.services.urdb_service import URDBService
-from app.services.llm_service import LLMService
+from app.services.llm_service import get_llm_service
+from app.services.task_status import get_task_status, set_task_status
 from app.middleware.auth import get_current_user
 from app.models.user import User
 
 router = APIRouter()
-llm_service = LLMService()
 
 # Constants
 VALID_SECTORS = ["residential", "commercial", "industrial"]
+ZIP_CODE_RE = re.compile(r"\d{5}")
 
 
 class URDBFetchRequest(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+    
     zip_codes: List[str]  # List of zip codes to fetch
     sector: Optional[str] = "residential"  # residential, commercial, or industrial
     fetch_batch_size: Optional[int] = 10  # Batch size for fetching
@@ -23,6 +27,8 @@ class URDBFetchRequest(BaseModel):
 
 
 class URDBFetchByStateRequest(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+    
     state: str  # 2-letter state code
     sector: Optional[str] = "residential"
     fetch_batch_size: Optional[int] = 10
@@ -31,10 +37,6 @@ class URDBFetchByStateRequest(BaseModel):
     limit: Optional[int] = None  # Optional limit for testing
 
 
-# Store background task status
-background_task_status = {}
-
-
 async def fetch_and_index_urdb_background(
     task_id: str,
     zip_codes: List[str],
@@ -48,11 +50,14 @@ async def fetch_and_index_urdb_background(
     Background task to fetch and index URDB data.
     """
     try:
-        background_task_status[task_id] = {
+        set_task_status(task_id, {
             "status": "running",
             "progress": 0,
             "message": f"Starting URDB fetch for {len(zip_codes)} zip codes..."
-        }
+        })
+        
+        # Imported here so loading the router doesn't pull in the vector store stack
+        from app.services.urdb_service import URDBService
         
         urdb_service = URDBService(llm_mode=llm_mode)
         
@@ -64,19 +69,19 @@ async def fetch_and_index_urdb_background(
             delay_between_batches=delay_between_batches
         )
         
-        background_task_status[task_id] = {
+        set_task_status(task_id, {
             "status": "completed",
             "progress": 100,
             "message": "URDB indexing completed successfully",
             "result": result
-        }
+        })
     except Exception as e:
-        background_task_status[task_id] = {
+        set_task_status(task_id, {
             "status": "failed",
             "progress": 0,
             "message": f"URDB indexing failed: {str(e)}",
             "error": str(e)
-        }
+        })
 
 
 @router.post("/urdb/fetch")
@@ -97,8 +102,11 @@ async def fetch_urdb(
     
     Returns immediately with a task ID. Use /api/urdb/status/{task_id} to check progress.
     """
+    # Each zip code is fetched and indexed once, however often it was passed
+    zip_codes = sorted(set(request.zip_codes))
+    
     # Validate zip codes
-    invalid_zips = [z for z in request.zip_codes if not z.isdigit() or len(z) != 5]
+    invalid_zips = [z for z in zip_codes if not ZIP_CODE_RE.fullmatch(z)]
     if invalid_zips:
         raise HTTPException(
             status_code=400,
@@ -116,19 +124,19 @@ async def fetch_urdb(
     task_id = str(uuid.uuid4())
     
     # Initialize task status
-    background_task_status[task_id] = {
+    set_task_status(task_id, {
         "status": "queued",
         "progress": 0,
         "message": "Task queued, waiting to start...",
-        "zip_codes_count": len(request.zip_codes)
-    }
+        "zip_codes_count": len(zip_codes)
+    })
     
     # Start background task
-    llm_mode = llm_service.settings.llm_mode
+    llm_mode = get_llm_service().settings.llm_mode
     background_tasks.add_task(
         fetch_and_index_urdb_background,
         task_id=task_id,
-        zip_codes=request.zip_codes,
+        zip_codes=zip_codes,
         sector=request.sector or "residential",
         fetch_batch_size=request.fetch_batch_size or 10,
         index_batch_size=request.index_batch_size or 50,
@@ -139,7 +147,7 @@ async def fetch_urdb(
     return {
         "task_id": task_id,
         "status": "queued",
-        "message": f"URDB fetch task started for {len(request.zip_codes)} zip codes",
+        "message": f"URDB fetch task started for {len(zip_codes)} zip codes",
         "check_status_url": f"/api/urdb/status/{task_id}"
     }
 
@@ -184,16 +192,16 @@ async def fetch_urdb_by_state(
     task_id = str(uuid.uuid4())
     
     # Initialize task status
-    background_task_status[task_id] = {
+    set_task_status(task_id, {
         "status": "queued",
         "progress": 0,
         "message": f"Task queued for state {request.state}, {len(zip_codes)} zip codes",
         "state": request.state.upper(),
         "zip_codes_count": len(zip_codes)
-    }
+    })
     
     # Start background task
-    llm_mode = llm_service.settings.llm_mode
+    llm_mode = get_llm_service().settings.llm_mode
     background_tasks.add_task(
         fetch_and_index_urdb_background,
         task_id=task_id,
@@ -216,20 +224,52 @@ async def fetch_urdb_by_state(
 @router.get("/urdb/status/{task_id}")
 async def get_urdb_task_status(
     task_id: str,
+    request: Request,
     current_user: User = Depends(get_current_user)
 ):
     """
     Get the status of a URDB background task.
     
     Requires authentication.
+    
+    Responses carry an ETag, so polls made while the status hasn't changed
+    are answered with an empty 304.
     """
-    if task_id not in background_task_status:
+    task_status = get_task_status(task_id)
+    if task_status is None:
         raise HTTPException(
             status_code=404,
             detail=f"Task {task_id} not found"
         )
     
-    return background_task_status[task_id]
+    headers = {"ETag": task_status.etag, "Cache-Control": "private, no-cache"}
+    if request.headers.get("if-none-match") == task_status.etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=task_status.body, media_type="application/json", headers=headers)
+
+
+# Common zip code ranges by state (first 3 digits, end exclusive)
+STATE_ZIP_PREFIX_RANGES = {
+    "CA": range(900, 962),
+    "NY": range(100, 150),
+    "TX": range(750, 800),
+    "FL": range(320, 350),
+    "IL": range(600, 630),
+    "PA": range(150, 200),
+    "OH": range(430, 460),
+    "GA": range(300, 320),
+    "NC": range(270, 290),
+    "MI": range(480, 500),
+}
+
+# One sample zip code ("<prefix>00") per prefix, built once at import
+ZIPS_BY_STATE = {
+    state: tuple(f"{prefix:03d}00" for prefix in prefixes)
+    for state, prefixes in STATE_ZIP_PREFIX_RANGES.items()
+}
+
+# Fallback sample for states without known ranges
+FALLBACK_ZIPS = tuple(f"{prefix:03d}00" for prefix in range(100, 200))
 
 
 def _generate_zip_codes_for_state(state: str, limit: Optional[int] = None) -> List[str]:
@@ -241,33 +281,8 @@ def _generate_zip_codes_for_state(state: str, limit: Optional[int] = None) -> Li
     
     For now, we'll use common zip code ranges for major states.
     """
-    # Common zip code ranges by state (first 3 digits)
-    state_ranges = {
-        "CA": list(range(900, 962)) + list(range(940, 962)),
-        "NY": list(range(100, 150)) + list(range(120, 150)),
-        "TX": list(range(750, 800)) + list(range(770, 800)),
-        "FL": list(range(320, 350)) + list(range(330, 350)),
-        "IL": list(range(600, 630)) + list(range(606, 630)),
-        "PA": list(range(150, 200)) + list(range(190, 200)),
-        "OH": list(range(430, 460)) + list(range(440, 460)),
-        "GA": list(range(300, 320)) + list(range(303, 320)),
-        "NC": list(range(270, 290)) + list(range(275, 290)),
-        "MI": list(range(480, 500)) + list(range(481, 500)),
-    }
-    
-    # If state not in ranges, generate a sample
-    if state not in state_ranges:
-        # Use a generic approach: generate zip codes starting with state-specific prefix
-        # This is a fallback - in production use a proper zip code database
-        prefixes = [str(i).zfill(3) for i in range(100, 1000)]
-        zip_codes = [f"{prefix}00" for prefix in prefixes[:100]]  # Sample
-    else:
-        prefixes = [str(p).zfill(3) for p in state_ranges[state]]
-        zip_codes = [f"{prefix}00" for prefix in prefixes]
+    # If state not in ranges, use a sample - in production use a proper zip code database
+    zip_codes = ZIPS_BY_STATE.get(state, FALLBACK_ZIPS)
     
     # Apply limit if specified
-    if limit:
-        zip_codes = zip_codes[:limit]
-    
-    return zip_codes
-
+    return list(zip_codes[:limit] if limit else zip_codes)
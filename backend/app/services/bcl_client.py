@@ -11,7 +11,8 @@ Documentation:
 """
 
 import httpx
-from typing import Dict, List, Any, Optional
+import orjson
+from typing import Dict, List, Any, Optional, Sequence
 from datetime import timedelta
 from app.services.cache_service import get_cache_service
 from app.services.circuit_breaker import get_breaker_manager
@@ -26,6 +27,9 @@ class BCLClient:
     - Building components (construction assemblies, materials, etc.)
     
     The BCL API is public and does not require authentication.
+    
+    Responses are cached as their JSON bodies, which take far less memory than
+    the parsed dicts, and are parsed on every call so each caller gets its own copy.
     """
     
     BASE_URL = "https://bcl.nrel.gov/api"
@@ -33,6 +37,35 @@ class BCLClient:
     MEASURE_ENDPOINT = f"{BASE_URL}/measure"
     COMPONENT_ENDPOINT = f"{BASE_URL}/component"
     
+    # Measure tags related to building codes
+    BUILDING_CODE_TAGS = (
+        "ModelMeasure",  # General model measures
+        "Reporting.QAQC",  # QAQC measures often include code compliance
+    )
+    
+    # Shared HTTP client for all BCLClient instances (keeps connections alive)
+    _client: Optional[httpx.AsyncClient] = None
+    
+    @classmethod
+    def _get_client(cls) -> httpx.AsyncClient:
+        """Get the shared HTTP client, creating it on first use."""
+        if cls._client is None:
+            cls._client = httpx.AsyncClient(
+                http2=True,
+                follow_redirects=True,
+                limits=httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=60.0),
+                # A slow connect fails fast instead of using up the whole read budget
+                timeout=httpx.Timeout(30.0, connect=5.0, pool=5.0)
+            )
+        return cls._client
+    
+    @classmethod
+    async def aclose(cls):
+        """Close the shared HTTP client (called on application shutdown)."""
+        if cls._client is not None:
+            await cls._client.aclose()
+            cls._client = None
+    
     def __init__(self):
         # Initialize cache and circuit breakers
         self.cache = get_cache_service()
@@ -49,13 +82,14 @@ class BCLClient:
     async def _search_measures_internal(
         self,
         query: Optional[str] = None,
-        tags: Optional[List[str]] = None,
+        tags: Optional[Sequence[str]] = None,
         attributes: Optional[Dict[str, Any]] = None,
         limit: int = 20,
         offset: int = 0
-    ) -> Dict[str, Any]:
+    ) -> bytes:
         """
         Internal search implementation for OpenStudio measures.
+        Returns the raw JSON body.
         """
         params = {
             "limit": limit,
@@ -80,20 +114,18 @@ class BCLClient:
         # e.g., fq[]=value1&fq[]=value2
         params["fq[]"] = fq_filters
         
-        async with httpx.AsyncClient(follow_redirects=True) as client:
-            response = await client.get(
-                self.SEARCH_ENDPOINT,
-                params=params,
-                timeout=30.0
-            )
-            response.raise_for_status()
-            data = response.json()
-            return data
+        client = self._get_client()
+        response = await client.get(
+            self.SEARCH_ENDPOINT,
+            params=params
+        )
+        response.raise_for_status()
+        return response.content
     
     async def search_measures(
         self,
         query: Optional[str] = None,
-        tags: Optional[List[str]] = None,
+        tags: Optional[Sequence[str]] = None,
         attributes: Optional[Dict[str, Any]] = None,
         limit: int = 20,
         offset: int = 0
@@ -114,11 +146,12 @@ class BCLClient:
             https://bcl.nrel.gov/static/assets/json/measure_schema.json
         """
         # Create cache key
-        cache_key = self.cache._make_key(
+        # (tags and attributes as tuples, so the key can be memoized)
+        cache_key = self.cache.make_key(
             "bcl_measures_search",
             query=query,
-            tags=tags,
-            attributes=attributes,
+            tags=tuple(tags) if tags else None,
+            attributes=tuple(sorted(attributes.items())) if attributes else None,
             limit=limit,
             offset=offset
         )
@@ -137,18 +170,19 @@ class BCLClient:
                 offset
             )
         
-        return await self.cache.get_or_fetch(cache_key, _fetch, ttl)
+        return orjson.loads(await self.cache.get_or_fetch(cache_key, _fetch, ttl))
     
     async def _search_components_internal(
         self,
         query: Optional[str] = None,
-        tags: Optional[List[str]] = None,
+        tags: Optional[Sequence[str]] = None,
         attributes: Optional[Dict[str, Any]] = None,
         limit: int = 20,
         offset: int = 0
-    ) -> Dict[str, Any]:
+    ) -> bytes:
         """
         Internal search implementation for building components.
+        Returns the raw JSON body.
         """
         params = {
             "limit": limit,
@@ -173,20 +207,18 @@ class BCLClient:
         # e.g., fq[]=value1&fq[]=value2
         params["fq[]"] = fq_filters
         
-        async with httpx.AsyncClient(follow_redirects=True) as client:
-            response = await client.get(
-                self.SEARCH_ENDPOINT,
-                params=params,
-                timeout=30.0
-            )
-            response.raise_for_status()
-            data = response.json()
-            return data
+        client = self._get_client()
+        response = await client.get(
+            self.SEARCH_ENDPOINT,
+            params=params
+        )
+        response.raise_for_status()
+        return response.content
     
     async def search_components(
         self,
         query: Optional[str] = None,
-        tags: Optional[List[str]] = None,
+        tags: Optional[Sequence[str]] = None,
         attributes: Optional[Dict[str, Any]] = None,
         limit: int = 20,
         offset: int = 0
@@ -207,11 +239,12 @@ class BCLClient:
             https://bcl.nrel.gov/static/assets/json/component_schema.json
         """
         # Create cache key
-        cache_key = self.cache._make_key(
+        # (tags and attributes as tuples, so the key can be memoized)
+        cache_key = self.cache.make_key(
             "bcl_components_search",
             query=query,
-            tags=tags,
-            attributes=attributes,
+            tags=tuple(tags) if tags else None,
+            attributes=tuple(sorted(attributes.items())) if attributes else None,
             limit=limit,
             offset=offset
         )
@@ -230,20 +263,19 @@ class BCLClient:
                 offset
             )
         
-        return await self.cache.get_or_fetch(cache_key, _fetch, ttl)
+        return orjson.loads(await self.cache.get_or_fetch(cache_key, _fetch, ttl))
     
-    async def _get_measure_internal(self, uuid: str) -> Dict[str, Any]:
+    async def _get_measure_internal(self, uuid: str) -> bytes:
         """
         Internal implementation for getting a specific measure by UUID.
+        Returns the raw JSON body.
         """
-        async with httpx.AsyncClient(follow_redirects=True) as client:
-            response = await client.get(
-                f"{self.MEASURE_ENDPOINT}/{uuid}",
-                timeout=30.0
-            )
-            response.raise_for_status()
-            data = response.json()
-            return data
+        client = self._get_client()
+        response = await client.get(
+            f"{self.MEASURE_ENDPOINT}/{uuid}"
+        )
+        response.raise_for_status()
+        return response.content
     
     async def get_measure(self, uuid: str) -> Dict[str, Any]:
         """
@@ -258,7 +290,7 @@ class BCLClient:
             https://bcl.nrel.gov/static/assets/json/measure_schema.json
         """
         # Create cache key
-        cache_key = self.cache._make_key("bcl_measure", uuid=uuid)
+        cache_key = self.cache.make_key("bcl_measure", uuid=uuid)
         
         # Cache TTL: 24 hours (BCL data doesn't change frequently)
         ttl = timedelta(hours=24)
@@ -270,20 +302,19 @@ class BCLClient:
                 uuid
             )
         
-        return await self.cache.get_or_fetch(cache_key, _fetch, ttl)
+        return orjson.loads(await self.cache.get_or_fetch(cache_key, _fetch, ttl))
     
-    async def _get_component_internal(self, uuid: str) -> Dict[str, Any]:
+    async def _get_component_internal(self, uuid: str) -> bytes:
         """
         Internal implementation for getting a specific component by UUID.
+        Returns the raw JSON body.
         """
-        async with httpx.AsyncClient(follow_redirects=True) as client:
-            response = await client.get(
-                f"{self.COMPONENT_ENDPOINT}/{uuid}",
-                timeout=30.0
-            )
-            response.raise_for_status()
-            data = response.json()
-            return data
+        client = self._get_client()
+        response = await client.get(
+            f"{self.COMPONENT_ENDPOINT}/{uuid}"
+        )
+        response.raise_for_status()
+        return response.content
     
     async def get_component(self, uuid: str) -> Dict[str, Any]:
         """
@@ -298,7 +329,7 @@ class BCLClient:
             https://bcl.nrel.gov/static/assets/json/component_schema.json
         """
         # Create cache key
-        cache_key = self.cache._make_key("bcl_component", uuid=uuid)
+        cache_key = self.cache.make_key("bcl_component", uuid=uuid)
         
         # Cache TTL: 24 hours (BCL data doesn't change frequently)
         ttl = timedelta(hours=24)
@@ -310,7 +341,7 @@ class BCLClient:
                 uuid
             )
         
-        return await self.cache.get_or_fetch(cache_key, _fetch, ttl)
+        return orjson.loads(await self.cache.get_or_fetch(cache_key, _fetch, ttl))
     
     async def search_building_codes(
         self,
@@ -332,29 +363,21 @@ class BCLClient:
             List of measure dictionaries
         """
         # Search for measures with building code related tags
-        tags = [
-            "ModelMeasure",  # General model measures
-            "Reporting.QAQC",  # QAQC measures often include code compliance
-        ]
-        
         result = await self.search_measures(
             query=query,
-            tags=tags,
+            tags=self.BUILDING_CODE_TAGS,
             limit=limit
         )
         
         # Extract measures from result
         # API returns: {"result": [{"measure": {...}}, ...]}
         # We need to extract the "measure" key from each item
-        result_list = result.get("result", [])
-        measures = []
-        for item in result_list:
-            if isinstance(item, dict) and "measure" in item:
-                measures.append(item["measure"])
-            elif isinstance(item, dict):
-                # If it's already a measure dict, use it directly
-                measures.append(item)
-        return measures
+        # (an item that is already a measure dict is used directly)
+        return [
+            item.get("measure", item)
+            for item in result.get("result", ())
+            if isinstance(item, dict)
+        ]
     
     async def search_energy_efficiency_measures(
         self,
@@ -383,13 +406,10 @@ class BCLClient:
         # Extract measures from result
         # API returns: {"result": [{"measure": {...}}, ...]}
         # We need to extract the "measure" key from each item
-        result_list = result.get("result", [])
-        measures = []
-        for item in result_list:
-            if isinstance(item, dict) and "measure" in item:
-                measures.append(item["measure"])
-            elif isinstance(item, dict):
-                # If it's already a measure dict, use it directly
-                measures.append(item)
-        return measures
+        # (an item that is already a measure dict is used directly)
+        return [
+            item.get("measure", item)
+            for item in result.get("result", ())
+            if isinstance(item, dict)
+        ]
 
@@ -1,113 +1,157 @@
 """
 Cache service for API responses and query results.
 
-Provides in-memory caching with TTL (time-to-live) support.
+Provides in-memory caching with TTL (time-to-live) support. The cache is
+bounded: once full, the least recently used entries are evicted.
 """
 
 from typing import Dict, Any, Callable, Optional, TypeVar
-from datetime import datetime, timedelta
+from datetime import timedelta
+from functools import lru_cache
+from itertools import islice
 import hashlib
-import json
+import time
 import asyncio
+import logging
+import orjson
+from cachetools import LRUCache
 from app.services.logger_service import get_logger
 
 T = TypeVar('T')
 
 
+def _build_key(prefix: str, args: tuple, kwargs: Dict[str, Any]) -> str:
+    """Serialize and hash arguments into a cache key."""
+    key_data = orjson.dumps(
+        {"prefix": prefix, "args": args, "kwargs": kwargs},
+        option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+        default=str
+    )
+    key_hash = hashlib.blake2b(key_data, digest_size=16).hexdigest()
+    return f"{prefix}:{key_hash}"
+
+
+def _typed(value: Any) -> Any:
+    """
+    Pair a value (and the items of tuples and frozensets) with its type, so memo
+    entries for equal values of different types, like 1, True and 1.0, stay apart.
+    """
+    value_type = type(value)
+    if value_type is tuple or value_type is frozenset:
+        return value_type, value_type(_typed(item) for item in value)
+    return value_type, value
+
+
+@lru_cache(maxsize=4096)
+def _memoized_key(prefix: str, typed_args: tuple, args: tuple, kwargs_items: tuple) -> str:
+    """
+    Cache key for hashable arguments; repeated lookups skip serializing and hashing.
+    typed_args is only part of the memo key (see _typed).
+    """
+    return _build_key(prefix, args, dict(kwargs_items))
+
+
 class CacheEntry:
-    """Represents a cached entry with timestamp."""
+    """Represents a cached entry with its expiry deadline (time.monotonic())."""
+    __slots__ = ("data", "expires_at")
     
-    def __init__(self, data: Any, timestamp: datetime):
+    def __init__(self, data: Any, expires_at: float):
         self.data = data
-        self.timestamp = timestamp
-    
-    def is_expired(self, ttl: timedelta) -> bool:
-        """Check if entry is expired."""
-        age = datetime.now() - self.timestamp
-        return age > ttl
+        self.expires_at = expires_at
 
 
 class CacheService:
     """
     In-memory cache service with TTL support.
     
-    Thread-safe for async operations.
+    Safe for concurrent coroutines without a lock: it is only used from the
+    event loop, and no method awaits while reading or changing the cache.
     """
     
-    def __init__(self):
-        self._cache: Dict[str, CacheEntry] = {}
-        self._lock = asyncio.Lock()
-        self.logger = get_logger("cache_service", log_level="DEBUG")
+    def __init__(self, maxsize: int = 10_000):
+        # Entries expire by their own TTL; the LRU bound keeps the cache from growing
+        # without limit between cleanup_expired() calls
+        self._cache: LRUCache = LRUCache(maxsize=maxsize)
+        # Keys being fetched, so concurrent misses for the same key share one fetch
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self.logger = get_logger("cache_service")
+        # Counted instead of logged per lookup; see get_stats()
+        self.hits = 0
+        self.misses = 0
     
-    def _make_key(self, prefix: str, *args, **kwargs) -> str:
-        """Create cache key from prefix and arguments."""
-        key_data = json.dumps(
-            {"prefix": prefix, "args": args, "kwargs": kwargs},
-            sort_keys=True,
-            default=str
-        )
-        key_hash = hashlib.md5(key_data.encode()).hexdigest()
-        return f"{prefix}:{key_hash}"
+    def make_key(self, prefix: str, *args, **kwargs) -> str:
+        """
+        Create cache key from prefix and arguments.
+        Keys for hashable arguments are memoized; lists and dicts are keyed
+        without the memo.
+        """
+        try:
+            kwargs_items = tuple(sorted(kwargs.items()))
+            return _memoized_key(prefix, _typed((args, kwargs_items)), args, kwargs_items)
+        except TypeError:
+            return _build_key(prefix, args, kwargs)
     
-    async def get(self, key: str, ttl: timedelta) -> Optional[Any]:
+    async def get(self, key: str) -> Optional[Any]:
         """
-        Get cached value if not expired.
+        Get cached value if not expired (the TTL was fixed when it was set).
         
         Args:
             key: Cache key
-            ttl: Time-to-live for the cache entry
             
         Returns:
             Cached value or None if not found/expired
         """
-        async with self._lock:
-            if key in self._cache:
-                entry = self._cache[key]
-                if not entry.is_expired(ttl):
-                    self.logger.log_cache(
-                        operation="get",
-                        key=key,
-                        cache_hit=True,
-                        ttl_seconds=int(ttl.total_seconds())
-                    )
-                    return entry.data
-                else:
-                    # Remove expired entry
-                    age_seconds = int((datetime.now() - entry.timestamp).total_seconds())
-                    del self._cache[key]
+        entry = self._cache.get(key)
+        if entry is not None:
+            if entry.expires_at > time.monotonic():
+                self.hits += 1
+                if self.logger.logger.isEnabledFor(logging.DEBUG):
                     self.logger.log_cache(
                         operation="get",
                         key=key,
-                        cache_hit=False,
-                        ttl_seconds=int(ttl.total_seconds()),
-                        expired=True,
-                        age_seconds=age_seconds
+                        cache_hit=True
                     )
-                    return None
-            # Key not in cache
+                return entry.data
+            
+            # Remove expired entry
+            self._cache.pop(key, None)
+            self.misses += 1
+            if self.logger.logger.isEnabledFor(logging.DEBUG):
+                self.logger.log_cache(
+                    operation="get",
+                    key=key,
+                    cache_hit=False,
+                    expired=True
+                )
+            return None
+        
+        # Key not in cache
+        self.misses += 1
+        if self.logger.logger.isEnabledFor(logging.DEBUG):
             self.logger.log_cache(
                 operation="get",
                 key=key,
                 cache_hit=False,
-                ttl_seconds=int(ttl.total_seconds()),
                 expired=False
             )
-            return None
+        return None
     
-    async def set(self, key: str, value: Any) -> None:
+    async def set(self, key: str, value: Any, ttl: timedelta) -> None:
         """
         Set cached value.
         
         Args:
             key: Cache key
             value: Value to cache
+            ttl: Time-to-live for the cache entry
         """
-        async with self._lock:
-            self._cache[key] = CacheEntry(value, datetime.now())
+        self._cache[key] = CacheEntry(value, time.monotonic() + ttl.total_seconds())
+        if self.logger.logger.isEnabledFor(logging.DEBUG):
             self.logger.log_cache(
                 operation="set",
                 key=key,
-                cache_hit=False
+                cache_hit=False,
+                ttl_seconds=int(ttl.total_seconds())
             )
     
     async def get_or_fetch(
@@ -121,6 +165,9 @@ class CacheService:
         """
         Get from cache or fetch and cache.
         
+        Concurrent callers that miss on the same key wait for the first
+        caller's fetch instead of fetching it again.
+        
         Args:
             key: Cache key
             fetch_func: Async function to fetch data if not cached
@@ -131,13 +178,31 @@ class CacheService:
             Cached or freshly fetched data
         """
         # Try to get from cache
-        cached = await self.get(key, ttl)
+        cached = await self.get(key)
         if cached is not None:
             return cached
         
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            # Shielded, so a cancelled waiter doesn't cancel the shared fetch
+            return await asyncio.shield(in_flight)
+        
         # Fetch and cache
-        result = await fetch_func(*args, **kwargs)
-        await self.set(key, result)
+        in_flight = self._in_flight[key] = asyncio.get_running_loop().create_future()
+        try:
+            result = await fetch_func(*args, **kwargs)
+        except Exception as e:
+            in_flight.set_exception(e)
+            in_flight.exception()  # Retrieved here, so there are no warnings without waiters
+            raise
+        except BaseException:
+            in_flight.cancel()
+            raise
+        else:
+            await self.set(key, result, ttl)
+            in_flight.set_result(result)
+        finally:
+            self._in_flight.pop(key, None)
         return result
     
     async def clear(self, prefix: Optional[str] = None) -> int:
@@ -150,62 +215,48 @@ class CacheService:
         Returns:
             Number of entries cleared
         """
-        async with self._lock:
-            if prefix:
-                keys_to_remove = [
-                    key for key in self._cache.keys()
-                    if key.startswith(prefix)
-                ]
-                for key in keys_to_remove:
-                    del self._cache[key]
-                return len(keys_to_remove)
-            else:
-                count = len(self._cache)
-                self._cache.clear()
-                return count
+        if prefix:
+            keys_to_remove = [
+                key for key in self._cache.keys()
+                if key.startswith(prefix)
+            ]
+            for key in keys_to_remove:
+                del self._cache[key]
+            return len(keys_to_remove)
+        else:
+            count = len(self._cache)
+            self._cache.clear()
+            return count
     
-    async def cleanup_expired(self, ttl: timedelta) -> int:
+    async def cleanup_expired(self) -> int:
         """
         Remove expired entries from cache.
         
-        Args:
-            ttl: TTL to check against
-            
         Returns:
             Number of entries removed
         """
-        async with self._lock:
-            expired_keys = [
-                key for key, entry in self._cache.items()
-                if entry.is_expired(ttl)
-            ]
-            for key in expired_keys:
-                del self._cache[key]
-            return len(expired_keys)
+        now = time.monotonic()
+        expired_keys = [
+            key for key, entry in self._cache.items()
+            if entry.expires_at <= now
+        ]
+        for key in expired_keys:
+            del self._cache[key]
+        return len(expired_keys)
     
     def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
-        async def _get_stats():
-            async with self._lock:
-                return {
-                    "total_entries": len(self._cache),
-                    "keys": list(self._cache.keys())[:10]  # First 10 keys
-                }
-        # For sync access, we'll just return current state
+        lookups = self.hits + self.misses
         return {
             "total_entries": len(self._cache),
-            "keys": list(self._cache.keys())[:10]
+            "keys": list(islice(self._cache, 10)),  # First 10 keys
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0
         }
 
 
-# Global cache instance
-_cache_service: Optional[CacheService] = None
-
-
+@lru_cache(maxsize=1)
 def get_cache_service() -> CacheService:
     """Get global cache service instance."""
-    global _cache_service
-    if _cache_service is None:
-        _cache_service = CacheService()
-    return _cache_service
-
+    return CacheService()
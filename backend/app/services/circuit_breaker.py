@@ -5,14 +5,22 @@ Prevents cascading failures by stopping calls to failing services.
 """
 
 from enum import Enum
-from datetime import datetime, timedelta
+from datetime import datetime
+from functools import lru_cache
 from typing import Callable, TypeVar, Optional, Dict, Any
-import asyncio
+import time
 from app.services.logger_service import get_logger
 
 T = TypeVar('T')
 
 
+def _monotonic_isoformat(timestamp: Optional[float]) -> Optional[str]:
+    """Wall-clock ISO time for a time.monotonic() reading."""
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(time.time() - time.monotonic() + timestamp).isoformat()
+
+
 class CircuitState(Enum):
     """Circuit breaker states."""
     CLOSED = "closed"  # Normal operation - calls pass through
@@ -29,6 +37,9 @@ class CircuitBreaker:
     - OPEN -> HALF_OPEN: After timeout_seconds
     - HALF_OPEN -> CLOSED: After success_threshold successes
     - HALF_OPEN -> OPEN: After any failure
+    
+    Safe for concurrent coroutines without a lock: it is only used from the
+    event loop, and state is never read and updated across an await.
     """
     
     def __init__(
@@ -49,15 +60,15 @@ class CircuitBreaker:
         """
         self.name = name
         self.failure_threshold = failure_threshold
-        self.timeout = timedelta(seconds=timeout_seconds)
+        self.timeout_seconds = float(timeout_seconds)
         self.success_threshold = success_threshold
         
         self.state = CircuitState.CLOSED
         self.failure_count = 0
         self.success_count = 0
-        self.last_failure_time: Optional[datetime] = None
-        self.last_success_time: Optional[datetime] = None
-        self._lock = asyncio.Lock()
+        # time.monotonic() readings; get_state() reports them as wall-clock times
+        self.last_failure_time: Optional[float] = None
+        self.last_success_time: Optional[float] = None
         self.logger = get_logger("circuit_breaker")
     
     async def call(self, func: Callable[..., T], *args, **kwargs) -> T:
@@ -74,81 +85,74 @@ class CircuitBreaker:
         Raises:
             Exception: If circuit is open or function fails
         """
-        # Check circuit state (with lock)
-        async with self._lock:
-            # Check if circuit is open
-            if self.state == CircuitState.OPEN:
-                if self.last_failure_time:
-                    elapsed = datetime.now() - self.last_failure_time
-                    if elapsed > self.timeout:
-                        # Transition to half-open
-                        self.state = CircuitState.HALF_OPEN
-                        self.success_count = 0
-                        self.logger.log_circuit_breaker(
-                            breaker_name=self.name,
-                            state="half_open",
-                            failure_count=self.failure_count,
-                            action="transitioned_to_half_open"
-                        )
-                    else:
-                        raise Exception(
-                            f"Circuit breaker '{self.name}' is OPEN. "
-                            f"Last failure: {elapsed.total_seconds():.1f}s ago. "
-                            f"Retry after {self.timeout.total_seconds():.1f}s"
-                        )
-        
-        # Call function WITHOUT holding the lock (allows concurrent requests)
-        # This prevents blocking when multiple requests call the same circuit breaker
-        # The lock is only held for state checks/updates, not during function execution
-        try:
-            result = await func(*args, **kwargs)
-            
-            # Success - update state (with lock)
-            async with self._lock:
-                if self.state == CircuitState.HALF_OPEN:
-                    self.success_count += 1
-                    if self.success_count >= self.success_threshold:
-                        self.state = CircuitState.CLOSED
-                        self.failure_count = 0
-                        self.success_count = 0
-                        self.logger.log_circuit_breaker(
-                            breaker_name=self.name,
-                            state="closed",
-                            failure_count=0,
-                            action="recovered_to_closed"
-                        )
-                
-                self.last_success_time = datetime.now()
-            
-            return result
-                
-        except Exception as e:
-            # Failure - update state (with lock)
-            async with self._lock:
-                self.failure_count += 1
-                self.last_failure_time = datetime.now()
-                
-                if self.state == CircuitState.HALF_OPEN:
-                    # Any failure in half-open goes back to open
-                    self.state = CircuitState.OPEN
+        # Check if circuit is open (a healthy, closed circuit goes straight to the call)
+        if self.state == CircuitState.OPEN:
+            if self.last_failure_time is not None:
+                elapsed = time.monotonic() - self.last_failure_time
+                if elapsed > self.timeout_seconds:
+                    # Transition to half-open
+                    self.state = CircuitState.HALF_OPEN
                     self.success_count = 0
                     self.logger.log_circuit_breaker(
                         breaker_name=self.name,
-                        state="open",
+                        state="half_open",
                         failure_count=self.failure_count,
-                        action="failed_in_half_open"
+                        action="transitioned_to_half_open"
                     )
-                elif self.failure_count >= self.failure_threshold:
-                    # Too many failures - open circuit
-                    self.state = CircuitState.OPEN
-                    self.logger.log_circuit_breaker(
-                        breaker_name=self.name,
-                        state="open",
-                        failure_count=self.failure_count,
-                        action="opened_after_threshold"
+                else:
+                    raise Exception(
+                        f"Circuit breaker '{self.name}' is OPEN. "
+                        f"Last failure: {elapsed:.1f}s ago. "
+                        f"Retry after {self.timeout_seconds:.1f}s"
                     )
+        
+        # Concurrent requests through the same breaker run their calls side by side;
+        # state is only read and updated between awaits
+        try:
+            result = await func(*args, **kwargs)
+        except Exception as e:
+            # Failure - update state
+            self.failure_count += 1
+            self.last_failure_time = time.monotonic()
+            
+            if self.state == CircuitState.HALF_OPEN:
+                # Any failure in half-open goes back to open
+                self.state = CircuitState.OPEN
+                self.success_count = 0
+                self.logger.log_circuit_breaker(
+                    breaker_name=self.name,
+                    state="open",
+                    failure_count=self.failure_count,
+                    action="failed_in_half_open"
+                )
+            elif self.failure_count >= self.failure_threshold:
+                # Too many failures - open circuit
+                self.state = CircuitState.OPEN
+                self.logger.log_circuit_breaker(
+                    breaker_name=self.name,
+                    state="open",
+                    failure_count=self.failure_count,
+                    action="opened_after_threshold"
+                )
             
             raise
+        
+        # Success - update state
+        if self.state == CircuitState.HALF_OPEN:
+            self.success_count += 1
+            if self.success_count >= self.success_threshold:
+                self.state = CircuitState.CLOSED
+                self.failure_count = 0
+                self.success_count = 0
+                self.logger.log_circuit_breaker(
+                    breaker_name=self.name,
+                    state="closed",
+                    failure_count=0,
+                    action="recovered_to_closed"
+                )
+        
+        self.last_success_time = time.monotonic()
+        return result
     
     def get_state(self) -> Dict[str, Any]:
         """Get current circuit breaker state."""
@@ -157,14 +161,8 @@ class CircuitBreaker:
             "state": self.state.value,
             "failure_count": self.failure_count,
             "success_count": self.success_count,
-            "last_failure_time": (
-                self.last_failure_time.isoformat()
-                if self.last_failure_time else None
-            ),
-            "last_success_time": (
-                self.last_success_time.isoformat()
-                if self.last_success_time else None
-            )
+            "last_failure_time": _monotonic_isoformat(self.last_failure_time),
+            "last_success_time": _monotonic_isoformat(self.last_success_time)
         }
     
     def reset(self) -> None:
@@ -181,7 +179,6 @@ class CircuitBreakerManager:
     
     def __init__(self):
         self._breakers: Dict[str, CircuitBreaker] = {}
-        self._lock = asyncio.Lock()
     
     def get_breaker(
         self,
@@ -191,26 +188,15 @@ class CircuitBreakerManager:
         success_threshold: int = 2
     ) -> CircuitBreaker:
         """Get or create circuit breaker."""
-        async def _get():
-            async with self._lock:
-                if name not in self._breakers:
-                    self._breakers[name] = CircuitBreaker(
-                        name=name,
-                        failure_threshold=failure_threshold,
-                        timeout_seconds=timeout_seconds,
-                        success_threshold=success_threshold
-                    )
-                return self._breakers[name]
-        
-        # For sync access, create if not exists
-        if name not in self._breakers:
-            self._breakers[name] = CircuitBreaker(
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            breaker = self._breakers.setdefault(name, CircuitBreaker(
                 name=name,
                 failure_threshold=failure_threshold,
                 timeout_seconds=timeout_seconds,
                 success_threshold=success_threshold
-            )
-        return self._breakers[name]
+            ))
+        return breaker
     
     def get_all_states(self) -> Dict[str, Dict[str, Any]]:
         """Get states of all circuit breakers."""
@@ -220,14 +206,7 @@ class CircuitBreakerManager:
         }
 
 
-# Global circuit breaker manager
-_breaker_manager: Optional[CircuitBreakerManager] = None
-
-
+@lru_cache(maxsize=1)
 def get_breaker_manager() -> CircuitBreakerManager:
     """Get global circuit breaker manager."""
-    global _breaker_manager
-    if _breaker_manager is None:
-        _breaker_manager = CircuitBreakerManager()
-    return _breaker_manager
-
+    return CircuitBreakerManager()
@@ -1,9 +1,89 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from datetime import datetime
 from llama_index.core import Document
 from llama_index.core.schema import TextNode
 
 
+# NREL sends missing numbers as None or the string "None"; int() and float()
+# reject the string, so both end up as the default
+def _safe_int(value: Any, default: int = 0) -> int:
+    """Convert to int, or return default when missing or not a number."""
+    if type(value) is int:
+        return value
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return default
+
+
+def _safe_float(value: Any, default: Optional[float] = None) -> Optional[float]:
+    """Convert to float, or return default when missing or not a number."""
+    if type(value) is float:
+        return value
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return default
+
+
+# Station metadata copied straight from NREL fields: (metadata key, field, default if absent)
+_STATION_METADATA_FIELDS = (
+    ("station_id", "id", None),
+    ("station_name", "station_name", ""),
+    ("city", "city", ""),
+    ("state", "state", ""),
+    ("zip", "zip", ""),
+    ("network", "ev_network", ""),
+)
+
+# Station fields joined into its address, in order
+_ADDRESS_FIELDS = ("street_address", "city", "state", "zip")
+
+# Where each sector's rate may be found: direct fields on the utility, then
+# fields of a nested utility_rates[sector] dict
+_RATE_FIELDS = {
+    "residential": (("residential_rate", "res_rate", "avg_residential_rate"), ("rate", "residential_rate", "avg_rate")),
+    "commercial": (("commercial_rate", "com_rate", "avg_commercial_rate"), ("rate", "commercial_rate", "avg_rate")),
+    "industrial": (("industrial_rate", "ind_rate", "avg_industrial_rate"), ("rate", "industrial_rate", "avg_rate")),
+}
+
+
+def _first_present(data: Dict[str, Any], keys: Tuple[str, ...]) -> Any:
+    """The first truthy value among keys, like chaining data.get(key) with `or`."""
+    value = None
+    for key in keys:
+        value = data.get(key)
+        if value:
+            break
+    return value
+
+
+def _sector_rate(utility_rates: Dict[str, Any], sector: str) -> Any:
+    """Find a sector's rate in a utility rates dict, or a falsy value if it has none."""
+    direct_keys, nested_keys = _RATE_FIELDS[sector]
+    rate = _first_present(utility_rates, direct_keys)
+    
+    # Try nested structure: utility_rates[sector]["rate"]
+    if not rate:
+        nested = utility_rates.get(sector)
+        if isinstance(nested, dict):
+            rate = _first_present(nested, nested_keys)
+        elif isinstance(nested, (int, float)):
+            rate = nested
+    return rate
+
+
+# Strings that mean a rate is missing (compared lowercased)
+_NONE_STRS = frozenset({"none", ""})
+
+
+def _has_rate(rate: Any) -> bool:
+    """Whether a rate was found: numbers must be nonzero, strings not empty or "None"."""
+    if isinstance(rate, str):
+        return rate.lower() not in _NONE_STRS
+    return bool(rate)
+
+
 class DocumentService:
     """
     Service for converting NREL station data into LlamaIndex Document objects.
@@ -21,19 +101,21 @@ class DocumentService:
             List of LlamaIndex Document objects
         """
         documents = []
+        # One indexing timestamp for the whole batch
+        indexed_at = datetime.utcnow().isoformat() + "Z"
         
-        for station in stations:
+        for position, station in enumerate(stations):
             # Create a structured text representation of the station
             station_text = DocumentService._format_station_text(station)
             
             # Create metadata for the document
-            metadata = DocumentService._extract_metadata(station)
+            metadata = DocumentService._extract_metadata(station, indexed_at)
             
             # Create Document with text and metadata
             doc = Document(
                 text=station_text,
                 metadata=metadata,
-                id_=f"station_{station.get('id', len(documents))}"
+                id_=f"station_{station.get('id', position)}"
             )
             
             documents.append(doc)
@@ -45,92 +127,70 @@ class DocumentService:
         """
         Format station data into a natural language text representation.
         """
-        parts = []
-        
+        return ". ".join(DocumentService._iter_station_text_parts(station)) + "."
+    
+    @staticmethod
+    def _iter_station_text_parts(station: Dict[str, Any]) -> Iterator[str]:
+        """
+        Yield the sentences of a station's text representation.
+        """
         # Station name
-        if station.get("station_name"):
-            parts.append(f"Station Name: {station['station_name']}")
+        if name := station.get("station_name"):
+            yield f"Station Name: {name}"
         
         # Address
-        address_parts = []
-        if station.get("street_address"):
-            address_parts.append(station["street_address"])
-        if station.get("city"):
-            address_parts.append(station["city"])
-        if station.get("state"):
-            address_parts.append(station["state"])
-        if station.get("zip"):
-            address_parts.append(station["zip"])
-        
-        if address_parts:
-            parts.append(f"Address: {', '.join(address_parts)}")
+        if address := ", ".join(filter(None, (station.get(key) for key in _ADDRESS_FIELDS))):
+            yield f"Address: {address}"
         
         # Network
-        if station.get("ev_network"):
-            parts.append(f"Network: {station['ev_network']}")
+        if network := station.get("ev_network"):
+            yield f"Network: {network}"
         
         # Connector types
-        if station.get("ev_connector_types"):
-            connectors = ", ".join(station["ev_connector_types"])
-            parts.append(f"Connector Types: {connectors}")
+        if connector_types := station.get("ev_connector_types"):
+            yield f"Connector Types: {', '.join(connector_types)}"
         
         # Charging ports
         charging_info = []
-        if station.get("ev_dc_fast_num") and station["ev_dc_fast_num"] > 0:
-            charging_info.append(f"{station['ev_dc_fast_num']} DC Fast Charging port(s)")
-        if station.get("ev_level2_evse_num") and station["ev_level2_evse_num"] > 0:
-            charging_info.append(f"{station['ev_level2_evse_num']} Level 2 Charging port(s)")
+        if (dc_fast := station.get("ev_dc_fast_num")) and dc_fast > 0:
+            charging_info.append(f"{dc_fast} DC Fast Charging port(s)")
+        if (level2 := station.get("ev_level2_evse_num")) and level2 > 0:
+            charging_info.append(f"{level2} Level 2 Charging port(s)")
         
         if charging_info:
-            parts.append(f"Charging Ports: {'; '.join(charging_info)}")
+            yield f"Charging Ports: {'; '.join(charging_info)}"
         
         # Access information
-        if station.get("access_days_time"):
-            parts.append(f"Access Hours: {station['access_days_time']}")
+        if access := station.get("access_days_time"):
+            yield f"Access Hours: {access}"
         
         # Location coordinates
-        if station.get("latitude") and station.get("longitude"):
-            parts.append(f"Location: {station['latitude']}, {station['longitude']}")
-        
-        return ". ".join(parts) + "."
+        if (latitude := station.get("latitude")) and (longitude := station.get("longitude")):
+            yield f"Location: {latitude}, {longitude}"
     
     @staticmethod
-    def _extract_metadata(station: Dict[str, Any]) -> Dict[str, Any]:
+    def _extract_metadata(station: Dict[str, Any], indexed_at: Optional[str] = None) -> Dict[str, Any]:
         """
         Extract relevant metadata from station data.
+        Fields NREL sends as null are left out.
         """
-        # Helper function to safely convert to int, handling None and string 'None'
-        def safe_int(value, default=0):
-            if value is None or value == "None" or str(value).lower() == "none":
-                return default
-            try:
-                return int(value)
-            except (ValueError, TypeError):
-                return default
+        metadata = {"domain": "transportation"}  # Domain tag for routing
+        
+        for key, field, default in _STATION_METADATA_FIELDS:
+            value = station.get(field, default)
+            if value is not None:
+                metadata[key] = value
         
-        # Helper function to safely convert to float, handling None and string 'None'
-        def safe_float(value, default=None):
-            if value is None or value == "None" or str(value).lower() == "none":
-                return default
-            try:
-                return float(value)
-            except (ValueError, TypeError):
-                return default
+        metadata["connector_types"] = ",".join(station.get("ev_connector_types") or ())
+        metadata["dc_fast_count"] = _safe_int(station.get("ev_dc_fast_num"), 0)
+        metadata["level2_count"] = _safe_int(station.get("ev_level2_evse_num"), 0)
         
-        metadata = {
-            "domain": "transportation",  # Domain tag for routing
-            "station_id": station.get("id"),
-            "station_name": station.get("station_name", ""),
-            "city": station.get("city", ""),
-            "state": station.get("state", ""),
-            "zip": station.get("zip", ""),
-            "network": station.get("ev_network", ""),
-            "connector_types": ",".join(station.get("ev_connector_types", [])),
-            "dc_fast_count": safe_int(station.get("ev_dc_fast_num"), 0),
-            "level2_count": safe_int(station.get("ev_level2_evse_num"), 0),
-            "latitude": safe_float(station.get("latitude")),
-            "longitude": safe_float(station.get("longitude")),
-        }
+        latitude = _safe_float(station.get("latitude"))
+        if latitude is not None:
+            metadata["latitude"] = latitude
+        longitude = _safe_float(station.get("longitude"))
+        if longitude is not None:
+            metadata["longitude"] = longitude
         
         # Store queried_zip if provided (for stations fetched by zip code)
         # This allows retrieval by the zip code that was queried, even if station has different zip
@@ -139,11 +199,10 @@ class DocumentService:
             metadata["queried_zip"] = queried_zip
         
         # Add timestamp for freshness tracking
-        metadata["indexed_at"] = datetime.utcnow().isoformat() + "Z"
+        metadata["indexed_at"] = indexed_at or datetime.utcnow().isoformat() + "Z"
         metadata["source"] = "nrel_api"
         
-        # Remove None values
-        return {k: v for k, v in metadata.items() if v is not None}
+        return metadata
     
     @staticmethod
     def utility_rates_to_documents(utility_rates: Dict[str, Any], location: str = "") -> List[Document]:
@@ -183,89 +242,17 @@ class DocumentService:
         
         # Extract rates (try multiple possible field names and formats)
         # NREL API might return rates in different formats, including nested structures
-        residential_rate = None
-        commercial_rate = None
-        industrial_rate = None
-        
-        # Try direct field access first
-        residential_rate = (
-            utility_rates.get("residential_rate") or
-            utility_rates.get("res_rate") or
-            utility_rates.get("avg_residential_rate")
-        )
-        
-        # Try nested structure: utility_rates["residential"]["rate"]
-        if not residential_rate:
-            residential_obj = utility_rates.get("residential")
-            if isinstance(residential_obj, dict):
-                residential_rate = (
-                    residential_obj.get("rate") or
-                    residential_obj.get("residential_rate") or
-                    residential_obj.get("avg_rate")
-                )
-            elif isinstance(residential_obj, (int, float)):
-                residential_rate = residential_obj
-        
-        # Try direct field access for commercial
-        commercial_rate = (
-            utility_rates.get("commercial_rate") or
-            utility_rates.get("com_rate") or
-            utility_rates.get("avg_commercial_rate")
-        )
-        
-        # Try nested structure: utility_rates["commercial"]["rate"]
-        if not commercial_rate:
-            commercial_obj = utility_rates.get("commercial")
-            if isinstance(commercial_obj, dict):
-                commercial_rate = (
-                    commercial_obj.get("rate") or
-                    commercial_obj.get("commercial_rate") or
-                    commercial_obj.get("avg_rate")
-                )
-            elif isinstance(commercial_obj, (int, float)):
-                commercial_rate = commercial_obj
-        
-        # Try direct field access for industrial
-        industrial_rate = (
-            utility_rates.get("industrial_rate") or
-            utility_rates.get("ind_rate") or
-            utility_rates.get("avg_industrial_rate")
-        )
-        
-        # Try nested structure: utility_rates["industrial"]["rate"]
-        if not industrial_rate:
-            industrial_obj = utility_rates.get("industrial")
-            if isinstance(industrial_obj, dict):
-                industrial_rate = (
-                    industrial_obj.get("rate") or
-                    industrial_obj.get("industrial_rate") or
-                    industrial_obj.get("avg_rate")
-                )
-            elif isinstance(industrial_obj, (int, float)):
-                industrial_rate = industrial_obj
+        rates = {sector: _sector_rate(utility_rates, sector) for sector in _RATE_FIELDS}
         
         # Format rates for document text
-        if residential_rate and residential_rate != "None" and str(residential_rate).lower() != "none":
-            # Handle both numeric and string formats
-            try:
-                rate_val = float(residential_rate)
-                parts.append(f"Residential Rate: ${rate_val:.4f}/kWh")
-            except (ValueError, TypeError):
-                parts.append(f"Residential Rate: {residential_rate}/kWh")
-        
-        if commercial_rate and commercial_rate != "None" and str(commercial_rate).lower() != "none":
-            try:
-                rate_val = float(commercial_rate)
-                parts.append(f"Commercial Rate: ${rate_val:.4f}/kWh")
-            except (ValueError, TypeError):
-                parts.append(f"Commercial Rate: {commercial_rate}/kWh")
-        
-        if industrial_rate and industrial_rate != "None" and str(industrial_rate).lower() != "none":
-            try:
-                rate_val = float(industrial_rate)
-                parts.append(f"Industrial Rate: ${rate_val:.4f}/kWh")
-            except (ValueError, TypeError):
-                parts.append(f"Industrial Rate: {industrial_rate}/kWh")
+        for sector, rate in rates.items():
+            if _has_rate(rate):
+                # Handle both numeric and string formats
+                try:
+                    rate_val = float(rate)
+                    parts.append(f"{sector.title()} Rate: ${rate_val:.4f}/kWh")
+                except (ValueError, TypeError):
+                    parts.append(f"{sector.title()} Rate: {rate}/kWh")
         
         # Extract EIA ID
         eiaid = (
@@ -284,9 +271,9 @@ class DocumentService:
                 "domain": "utility",  # Domain tag for routing
                 "utility_name": utility_name,
                 "location": location,
-                "residential_rate": residential_rate,
-                "commercial_rate": commercial_rate,
-                "industrial_rate": industrial_rate,
+                "residential_rate": rates["residential"],
+                "commercial_rate": rates["commercial"],
+                "industrial_rate": rates["industrial"],
                 "eiaid": str(eiaid) if eiaid else None,
             }
             
@@ -5,13 +5,29 @@ Consolidates duplicate freshness checking logic across different data types.
 """
 
 from typing import Tuple, Optional, Dict, Any
-from datetime import datetime, timedelta
-from llama_index.core.retrievers import VectorIndexRetriever
-from llama_index.core.vector_stores import MetadataFilter, MetadataFilters, FilterOperator
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+import asyncio
+import time
 from app.services.rag_settings import RAGSettings
 from app.services.logger_service import get_logger
 
 
+@lru_cache(maxsize=4096)
+def _parse_indexed_at(indexed_at_str: str) -> Tuple[datetime, float]:
+    """
+    Parse an indexed_at timestamp into a naive UTC datetime and POSIX seconds.
+    The same timestamps come back on every check of a zip code or state, so
+    parses are memoized.
+    """
+    # Parse ISO 8601 timestamp (handle both with and without Z)
+    indexed_at = datetime.fromisoformat(indexed_at_str.replace('Z', '+00:00'))
+    # Timestamps without an offset were written in UTC
+    if indexed_at.tzinfo is None:
+        indexed_at = indexed_at.replace(tzinfo=timezone.utc)
+    return indexed_at.astimezone(timezone.utc).replace(tzinfo=None), indexed_at.timestamp()
+
+
 class FreshnessChecker:
     """
     Unified freshness checker for different data types in vector store.
@@ -36,18 +52,17 @@ class FreshnessChecker:
         domain: str,
         filter_key: str,
         filter_value: str,
-        query_text: str,
         ttl: timedelta,
         log_prefix: str = ""
     ) -> Tuple[bool, Optional[datetime]]:
         """
-        Check if data exists and is fresh in vector store.
+        Check if data exists and is fresh in vector store, using the newest
+        indexed_at among matching documents.
         
         Args:
             domain: Domain filter value (e.g., "transportation", "utility", "buildings")
             filter_key: Metadata key to filter by (e.g., "zip", "queried_zip", "state")
             filter_value: Value to filter by
-            query_text: Query text for retrieval test
             ttl: Time-to-live for freshness check
             log_prefix: Prefix for log messages
             
@@ -55,18 +70,15 @@ class FreshnessChecker:
             Tuple of (is_fresh, indexed_at_datetime)
         """
         try:
-            index = self.vector_store_service.get_index()
-            test_retriever = VectorIndexRetriever(
-                index=index,
-                similarity_top_k=1,
-                filters=MetadataFilters(filters=[
-                    MetadataFilter(key="domain", value=domain, operator=FilterOperator.EQ),
-                    MetadataFilter(key=filter_key, value=filter_value, operator=FilterOperator.EQ)
-                ])
+            # Metadata-only lookup, run in a worker thread since the query blocks
+            found, indexed_at_str = await asyncio.to_thread(
+                self.vector_store_service.get_latest_indexed_at,
+                domain,
+                filter_key,
+                filter_value
             )
-            test_nodes = test_retriever.retrieve(query_text)
             
-            if not test_nodes or len(test_nodes) == 0:
+            if not found:
                 self.logger.log_cache(
                     operation="freshness_check",
                     key=f"{domain}:{filter_key}:{filter_value}",
@@ -75,11 +87,6 @@ class FreshnessChecker:
                 )
                 return False, None
             
-            # Check freshness from metadata
-            node = test_nodes[0]
-            metadata = node.metadata if hasattr(node, 'metadata') else {}
-            indexed_at_str = metadata.get("indexed_at")
-            
             if not indexed_at_str:
                 # No timestamp - assume stale (old data without timestamp)
                 self.logger.log_cache(
@@ -92,26 +99,16 @@ class FreshnessChecker:
                 return False, None
             
             try:
-                # Parse ISO 8601 timestamp (handle both with and without Z)
-                indexed_at_str = indexed_at_str.replace('Z', '+00:00')
-                indexed_at = datetime.fromisoformat(indexed_at_str)
-                # Convert to UTC naive datetime for comparison
-                if indexed_at.tzinfo:
-                    indexed_at = indexed_at.astimezone().replace(tzinfo=None)
-                
-                now = datetime.utcnow()
-                age = now - indexed_at
-                is_fresh = age < ttl
-                
-                age_hours = age.total_seconds() / 3600
-                ttl_hours = ttl.total_seconds() / 3600
+                indexed_at, indexed_at_ts = _parse_indexed_at(indexed_at_str)
+                age_seconds = time.time() - indexed_at_ts
+                is_fresh = age_seconds < ttl.total_seconds()
                 
                 self.logger.log_cache(
                     operation="freshness_check",
                     key=f"{domain}:{filter_key}:{filter_value}",
                     cache_hit=True,
                     expired=not is_fresh,
-                    age_seconds=int(age.total_seconds())
+                    age_seconds=int(age_seconds)
                 )
                 
                 return is_fresh, indexed_at
@@ -150,7 +147,6 @@ class FreshnessChecker:
             domain="utility",
             filter_key="zip",
             filter_value=zip_code,
-            query_text="utility rate",
             ttl=self.settings.get_utility_ttl(),
             log_prefix="utility_rates"
         )
@@ -164,7 +160,6 @@ class FreshnessChecker:
             domain="transportation",
             filter_key="queried_zip",
             filter_value=zip_code,
-            query_text="charging station",
             ttl=self.settings.get_station_ttl(),
             log_prefix="stations"
         )
@@ -178,7 +173,6 @@ class FreshnessChecker:
             domain="transportation",
             filter_key="state",
             filter_value=state,
-            query_text="charging station",
             ttl=self.settings.get_station_ttl(),
             log_prefix="stations_state"
         )
@@ -192,7 +186,6 @@ class FreshnessChecker:
             domain="buildings",
             filter_key="state",
             filter_value=state,
-            query_text="building efficiency",
             ttl=self.settings.get_bcl_ttl(),
             log_prefix="bcl_measures"
         )
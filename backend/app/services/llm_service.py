@@ -1,9 +1,13 @@
-from typing import Optional, Union
-from llama_index.core.llms import LLM
-from llama_index.llms.ollama import Ollama
-from llama_index.llms.gemini import Gemini
-from llama_index.llms.openai import OpenAI
+from typing import Optional, Union, TYPE_CHECKING
 from pydantic_settings import BaseSettings
+import threading
+
+if TYPE_CHECKING:
+    # LLM integrations are imported when an LLM is created, not when this module loads
+    from llama_index.core.llms import LLM
+    from llama_index.llms.ollama import Ollama
+    from llama_index.llms.gemini import Gemini
+    from llama_index.llms.openai import OpenAI
 
 
 class LLMSettings(BaseSettings):
@@ -28,18 +32,23 @@ class LLMService:
     
     def __init__(self):
         self.settings = LLMSettings()
-        self._llm: Optional[LLM] = None
+        self._llm: Optional["LLM"] = None
+        # Startup warm-up threads and requests can ask for the LLM at the same time
+        self._lock = threading.Lock()
     
-    def get_llm(self) -> LLM:
+    def get_llm(self) -> "LLM":
         """
         Get the appropriate LLM instance based on LLM_MODE.
-        Returns a singleton instance (creates if doesn't exist).
+        Returns a singleton instance (creates if doesn't exist); the app
+        creates it at startup so the first request doesn't pay for client setup.
         """
         if self._llm is None:
-            self._llm = self._create_llm()
+            with self._lock:
+                if self._llm is None:
+                    self._llm = self._create_llm()
         return self._llm
     
-    def _create_llm(self) -> LLM:
+    def _create_llm(self) -> "LLM":
         """
         Create LLM instance based on LLM_MODE setting.
         """
@@ -55,10 +64,12 @@ class LLMService:
                 "Must be 'local', 'cloud', or 'openai'"
             )
     
-    def _create_ollama_llm(self) -> Ollama:
+    def _create_ollama_llm(self) -> "Ollama":
         """
         Create Ollama LLM instance for local development.
         """
+        from llama_index.llms.ollama import Ollama
+        
         return Ollama(
             model=self.settings.ollama_model,
             base_url=self.settings.ollama_base_url,
@@ -73,10 +84,12 @@ class LLMService:
             context_window=3900,  # Model reports 3900, not 4096
         )
     
-    def _create_gemini_llm(self) -> Gemini:
+    def _create_gemini_llm(self) -> "Gemini":
         """
         Create Gemini LLM instance for cloud deployment.
         """
+        from llama_index.llms.gemini import Gemini
+        
         if not self.settings.gemini_api_key:
             raise ValueError(
                 "GEMINI_API_KEY must be set when LLM_MODE=cloud"
@@ -87,10 +100,12 @@ class LLMService:
             model_name="models/gemini-1.5-pro",
         )
     
-    def _create_openai_llm(self) -> OpenAI:
+    def _create_openai_llm(self) -> "OpenAI":
         """
         Create OpenAI LLM instance for cloud deployment.
         """
+        from llama_index.llms.openai import OpenAI
+        
         if not self.settings.openai_api_key:
             raise ValueError(
                 "OPENAI_API_KEY must be set when LLM_MODE=openai"
@@ -107,3 +122,17 @@ class LLMService:
         """
         self._llm = None
 
+
+# Global LLM service instance
+_llm_service: Optional[LLMService] = None
+_llm_service_lock = threading.Lock()
+
+
+def get_llm_service() -> LLMService:
+    """Get global LLM service instance."""
+    global _llm_service
+    if _llm_service is None:
+        with _llm_service_lock:
+            if _llm_service is None:
+                _llm_service = LLMService()
+    return _llm_service
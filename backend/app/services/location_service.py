@@ -1,5 +1,5 @@
 from typing import Optional, Dict, Any
-from app.services.llm_service import LLMService
+from app.services.llm_service import get_llm_service
 import json
 import re
 import httpx
@@ -29,7 +29,7 @@ class LocationService:
     """
     
     def __init__(self):
-        self.llm_service = LLMService()
+        self.llm_service = get_llm_service()
     
     def _normalize_state(self, state: Optional[str]) -> Optional[str]:
         """
@@ -35,6 +35,25 @@ class NRELClient:
     BASE_URL_PVWATTS = "https://developer.nrel.gov/api/pvwatts/v8.json"
     GEOCODING_URL = "https://nominatim.openstreetmap.org/search"  # Free geocoding service
     
+    # Shared HTTP client for all NRELClient instances (keeps connections alive)
+    _client: Optional[httpx.AsyncClient] = None
+    
+    @classmethod
+    def _get_client(cls) -> httpx.AsyncClient:
+        """Get the shared HTTP client, creating it on first use."""
+        if cls._client is None:
+            cls._client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+            )
+        return cls._client
+    
+    @classmethod
+    async def aclose(cls):
+        """Close the shared HTTP client (called on application shutdown)."""
+        if cls._client is not None:
+            await cls._client.aclose()
+            cls._client = None
+    
     def _handle_rate_limit_error(self, response, api_name: str, context: str = ""):
         """
         Handle 429 rate limit errors from NREL APIs.
@@ -116,47 +135,47 @@ class NRELClient:
         start_time = time.time()
         
         try:
-            async with httpx.AsyncClient() as client:
-                # Use Nominatim to geocode zip code
-                params = {
-                    "postalcode": zip_code,
-                    "country": "US",
-                    "format": "json",
-                    "limit": 1
-                }
-                
-                headers = {
-                    "User-Agent": "VoltQuery.ai/1.0"  # Required by Nominatim
-                }
-                
-                response = await client.get(
-                    self.GEOCODING_URL,
-                    params=params,
-                    headers=headers,
-                    timeout=10.0
-                )
-                
-                response.raise_for_status()
-                data = response.json()
-                
-                if not data or len(data) == 0:
-                    raise ValueError(f"Could not geocode zip code {zip_code}")
-                
-                # Ensure data is a list and has at least one element
-                if not isinstance(data, list) or len(data) == 0:
-                    raise ValueError(f"Invalid geocoding response for zip code {zip_code}")
-                
-                # Ensure first element is a dict with lat/lon keys
-                first_result = data[0]
-                if not isinstance(first_result, dict) or "lat" not in first_result or "lon" not in first_result:
-                    raise ValueError(f"Invalid geocoding response format for zip code {zip_code}")
-                
-                lat = float(first_result["lat"])
-                lon = float(first_result["lon"])
-                
-                elapsed = time.time() - start_time
-                self.logger.logger.debug(f"Geocoded zip {zip_code} in {elapsed:.2f}s -> ({lat}, {lon})")
-                return (lat, lon)
+            client = self._get_client()
+            # Use Nominatim to geocode zip code
+            params = {
+                "postalcode": zip_code,
+                "country": "US",
+                "format": "json",
+                "limit": 1
+            }
+            
+            headers = {
+                "User-Agent": "VoltQuery.ai/1.0"  # Required by Nominatim
+            }
+            
+            response = await client.get(
+                self.GEOCODING_URL,
+                params=params,
+                headers=headers,
+                timeout=10.0
+            )
+            
+            response.raise_for_status()
+            data = response.json()
+            
+            if not data or len(data) == 0:
+                raise ValueError(f"Could not geocode zip code {zip_code}")
+            
+            # Ensure data is a list and has at least one element
+            if not isinstance(data, list) or len(data) == 0:
+                raise ValueError(f"Invalid geocoding response for zip code {zip_code}")
+            
+            # Ensure first element is a dict with lat/lon keys
+            first_result = data[0]
+            if not isinstance(first_result, dict) or "lat" not in first_result or "lon" not in first_result:
+                raise ValueError(f"Invalid geocoding response format for zip code {zip_code}")
+            
+            lat = float(first_result["lat"])
+            lon = float(first_result["lon"])
+            
+            elapsed = time.time() - start_time
+            self.logger.logger.debug(f"Geocoded zip {zip_code} in {elapsed:.2f}s -> ({lat}, {lon})")
+            return (lat, lon)
         except Exception as e:
             elapsed = time.time() - start_time
             self.logger.logger.warning(f"Failed to geocode zip {zip_code} after {elapsed:.2f}s: {str(e)}")
@@ -179,7 +198,7 @@ class NRELClient:
             ValueError: If geocoding fails or zip code is invalid
         """
         # Create cache key
-        cache_key = self.cache._make_key("geocode_zip", zip_code)
+        cache_key = self.cache.make_key("geocode_zip", zip_code)
         
         # Cache TTL: 30 days (locations don't change)
         ttl = timedelta(days=30)
@@ -207,23 +226,23 @@ class NRELClient:
         """
         try:
             # Use Zippopotam.us API (free, no API key required)
-            async with httpx.AsyncClient() as client:
-                # Try state abbreviation first
-                state_upper = state.upper()
-                city_clean = city.replace(" ", "%20")  # URL encode spaces
-                
-                url = f"https://api.zippopotam.us/us/{state_upper}/{city_clean}"
-                response = await client.get(url, timeout=10.0)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    places = data.get("places", [])
-                    # Ensure places is a list and has at least one element
-                    if isinstance(places, list) and len(places) > 0:
-                        # Return the first zip code found
-                        zip_code = places[0].get("post code")
-                        if zip_code:
-                            return zip_code
+            client = self._get_client()
+            # Try state abbreviation first
+            state_upper = state.upper()
+            city_clean = city.replace(" ", "%20")  # URL encode spaces
+            
+            url = f"https://api.zippopotam.us/us/{state_upper}/{city_clean}"
+            response = await client.get(url, timeout=10.0)
+            
+            if response.status_code == 200:
+                data = response.json()
+                places = data.get("places", [])
+                # Ensure places is a list and has at least one element
+                if isinstance(places, list) and len(places) > 0:
+                    # Return the first zip code found
+                    zip_code = places[0].get("post code")
+                    if zip_code:
+                        return zip_code
         except Exception:
             pass
         
@@ -253,82 +272,48 @@ class NRELClient:
             return await self._geocode_zip_code(location)
         
         # Geocode as address/city
-        async with httpx.AsyncClient() as client:
-            # Clean up location string for better geocoding
-            # Remove extra spaces and normalize
-            location_clean = " ".join(location.split())
-            
-            headers = {
-                "User-Agent": "VoltQuery.ai/1.0"
-            }
-            
-            # Try structured parameters first (city, state) - more reliable
-            # Parse "City, State" format
-            if "," in location_clean:
-                parts = [p.strip() for p in location_clean.split(",")]
-                if len(parts) == 2:
-                    city = parts[0]
-                    state = parts[1]
-                    
-                    # Map state abbreviations to full names if needed
-                    state_abbrev_map = {
-                        "AL": "Alabama", "AK": "Alaska", "AZ": "Arizona", "AR": "Arkansas",
-                        "CA": "California", "CO": "Colorado", "CT": "Connecticut", "DE": "Delaware",
-                        "FL": "Florida", "GA": "Georgia", "HI": "Hawaii", "ID": "Idaho",
-                        "IL": "Illinois", "IN": "Indiana", "IA": "Iowa", "KS": "Kansas",
-                        "KY": "Kentucky", "LA": "Louisiana", "ME": "Maine", "MD": "Maryland",
-                        "MA": "Massachusetts", "MI": "Michigan", "MN": "Minnesota", "MS": "Mississippi",
-                        "MO": "Missouri", "MT": "Montana", "NE": "Nebraska", "NV": "Nevada",
-                        "NH": "New Hampshire", "NJ": "New Jersey", "NM": "New Mexico", "NY": "New York",
-                        "NC": "North Carolina", "ND": "North Dakota", "OH": "Ohio", "OK": "Oklahoma",
-                        "OR": "Oregon", "PA": "Pennsylvania", "RI": "Rhode Island", "SC": "South Carolina",
-                        "SD": "South Dakota", "TN": "Tennessee", "TX": "Texas", "UT": "Utah",
-                        "VT": "Vermont", "VA": "Virginia", "WA": "Washington", "WV": "West Virginia",
-                        "WI": "Wisconsin", "WY": "Wyoming", "DC": "District of Columbia"
-                    }
-                    
-                    # Use full state name if it's an abbreviation
-                    if len(state) == 2 and state.upper() in state_abbrev_map:
-                        state = state_abbrev_map[state.upper()]
-                    
-                    try:
-                        params = {
-                            "city": city,
-                            "state": state,
-                            "country": "US",
-                            "format": "json",
-                            "limit": 1
-                        }
-                        
-                        response = await client.get(
-                            self.GEOCODING_URL,
-                            params=params,
-                            headers=headers,
-                            timeout=10.0
-                        )
-                        
-                        if response.status_code == 200:
-                            data = response.json()
-                            if data and isinstance(data, list) and len(data) > 0:
-                                first_result = data[0]
-                                if isinstance(first_result, dict) and "lat" in first_result and "lon" in first_result:
-                                    lat = float(first_result["lat"])
-                                    lon = float(first_result["lon"])
-                                    return (lat, lon)
-                    except Exception:
-                        pass  # Fall through to q parameter method
-            
-            # Fallback: Try different query formats with 'q' parameter
-            query_formats = [
-                location_clean,  # Original format
-                f"{location_clean}, USA",  # Add USA suffix
-            ]
-            
-            last_error = None
-            for query_format in query_formats:
+        client = self._get_client()
+        # Clean up location string for better geocoding
+        # Remove extra spaces and normalize
+        location_clean = " ".join(location.split())
+        
+        headers = {
+            "User-Agent": "VoltQuery.ai/1.0"
+        }
+        
+        # Try structured parameters first (city, state) - more reliable
+        # Parse "City, State" format
+        if "," in location_clean:
+            parts = [p.strip() for p in location_clean.split(",")]
+            if len(parts) == 2:
+                city = parts[0]
+                state = parts[1]
+                
+                # Map state abbreviations to full names if needed
+                state_abbrev_map = {
+                    "AL": "Alabama", "AK": "Alaska", "AZ": "Arizona", "AR": "Arkansas",
+                    "CA": "California", "CO": "Colorado", "CT": "Connecticut", "DE": "Delaware",
+                    "FL": "Florida", "GA": "Georgia", "HI": "Hawaii", "ID": "Idaho",
+                    "IL": "Illinois", "IN": "Indiana", "IA": "Iowa", "KS": "Kansas",
+                    "KY": "Kentucky", "LA": "Louisiana", "ME": "Maine", "MD": "Maryland",
+                    "MA": "Massachusetts", "MI": "Michigan", "MN": "Minnesota", "MS": "Mississippi",
+                    "MO": "Missouri", "MT": "Montana", "NE": "Nebraska", "NV": "Nevada",
+                    "NH": "New Hampshire", "NJ": "New Jersey", "NM": "New Mexico", "NY": "New York",
+                    "NC": "North Carolina", "ND": "North Dakota", "OH": "Ohio", "OK": "Oklahoma",
+                    "OR": "Oregon", "PA": "Pennsylvania", "RI": "Rhode Island", "SC": "South Carolina",
+                    "SD": "South Dakota", "TN": "Tennessee", "TX": "Texas", "UT": "Utah",
+                    "VT": "Vermont", "VA": "Virginia", "WA": "Washington", "WV": "West Virginia",
+                    "WI": "Wisconsin", "WY": "Wyoming", "DC": "District of Columbia"
+                }
+                
+                # Use full state name if it's an abbreviation
+                if len(state) == 2 and state.upper() in state_abbrev_map:
+                    state = state_abbrev_map[state.upper()]
+                
                 try:
                     params = {
-                        "q": query_format,
+                        "city": city,
+                        "state": state,
                         "country": "US",
                         "format": "json",
                         "limit": 1
@@ -341,41 +326,75 @@ class NRELClient:
                         timeout=10.0
                     )
                     
-                    # If we get a 400 error, try the next format
-                    if response.status_code == 400:
-                        last_error = f"400 Bad Request for query: {query_format}"
-                        continue
-                    
-                    response.raise_for_status()
-                    data = response.json()
-                    
-                    if not data or not isinstance(data, list) or len(data) == 0:
-                        last_error = f"No results for query: {query_format}"
-                        continue
-                    
-                    # Ensure first element is a dict with lat/lon keys
-                    first_result = data[0]
-                    if not isinstance(first_result, dict) or "lat" not in first_result or "lon" not in first_result:
-                        last_error = f"Invalid response format for query: {query_format}"
-                        continue
-                    
-                    lat = float(first_result["lat"])
-                    lon = float(first_result["lon"])
-                    
-                    elapsed = time.time() - start_time
-                    self.logger.logger.debug(f"Geocoded location '{location}' in {elapsed:.2f}s -> ({lat}, {lon})")
-                    return (lat, lon)
-                except Exception as e:
-                    last_error = str(e)
-                    self.logger.logger.debug(f"Geocoding format failed for '{query_format}': {str(e)}")
+                    if response.status_code == 200:
+                        data = response.json()
+                        if data and isinstance(data, list) and len(data) > 0:
+                            first_result = data[0]
+                            if isinstance(first_result, dict) and "lat" in first_result and "lon" in first_result:
+                                lat = float(first_result["lat"])
+                                lon = float(first_result["lon"])
+                                return (lat, lon)
+                except Exception:
+                    pass  # Fall through to q parameter method
+        
+        # Fallback: Try different query formats with 'q' parameter
+        query_formats = [
+            location_clean,  # Original format
+            f"{location_clean}, USA",  # Add USA suffix
+        ]
+        
+        last_error = None
+        for query_format in query_formats:
+            try:
+                params = {
+                    "q": query_format,
+                    "country": "US",
+                    "format": "json",
+                    "limit": 1
+                }
+                
+                response = await client.get(
+                    self.GEOCODING_URL,
+                    params=params,
+                    headers=headers,
+                    timeout=10.0
+                )
+                
+                # If we get a 400 error, try the next format
+                if response.status_code == 400:
+                    last_error = f"400 Bad Request for query: {query_format}"
                     continue
-            
-            # If all formats failed, raise the last error
-            elapsed = time.time() - start_time
-            self.logger.logger.warning(f"Failed to geocode location '{location}' after {elapsed:.2f}s: {last_error}")
-            raise ValueError(
-                f"Failed to geocode location '{location}' after trying multiple formats. Last error: {last_error}"
-            )
+                
+                response.raise_for_status()
+                data = response.json()
+                
+                if not data or not isinstance(data, list) or len(data) == 0:
+                    last_error = f"No results for query: {query_format}"
+                    continue
+                
+                # Ensure first element is a dict with lat/lon keys
+                first_result = data[0]
+                if not isinstance(first_result, dict) or "lat" not in first_result or "lon" not in first_result:
+                    last_error = f"Invalid response format for query: {query_format}"
+                    continue
+                
+                lat = float(first_result["lat"])
+                lon = float(first_result["lon"])
+                
+                elapsed = time.time() - start_time
+                self.logger.logger.debug(f"Geocoded location '{location}' in {elapsed:.2f}s -> ({lat}, {lon})")
+                return (lat, lon)
+            except Exception as e:
+                last_error = str(e)
+                self.logger.logger.debug(f"Geocoding format failed for '{query_format}': {str(e)}")
+                continue
+        
+        # If all formats failed, raise the last error
+        elapsed = time.time() - start_time
+        self.logger.logger.warning(f"Failed to geocode location '{location}' after {elapsed:.2f}s: {last_error}")
+        raise ValueError(
+            f"Failed to geocode location '{location}' after trying multiple formats. Last error: {last_error}"
+        )
     
     async def _geocode_location(self, location: str) -> Tuple[float, float]:
         """
@@ -389,7 +408,7 @@ class NRELClient:
             Tuple of (latitude, longitude)
         """
         # Create cache key
-        cache_key = self.cache._make_key("geocode_location", location)
+        cache_key = self.cache.make_key("geocode_location", location)
         
         # Cache TTL: 30 days (locations don't change)
         ttl = timedelta(days=30)
@@ -449,53 +468,53 @@ class NRELClient:
         Returns:
             List of station dictionaries
         """
-        async with httpx.AsyncClient() as client:
-            params = {
-                "api_key": self.api_key,
-                "latitude": latitude,
-                "longitude": longitude,
-                "fuel_type": fuel_type,
-                "limit": limit,
-                "format": "json"
-            }
-            
-            response = await client.get(
-                f"{self.BASE_URL_STATIONS}/nearest.json",
-                params=params,
-                timeout=30.0
-            )
-            
-            # Handle rate limit errors (429)
-            self._handle_rate_limit_error(
-                response,
-                "NREL Stations API",
-                f"Request params: latitude={latitude}, longitude={longitude}, limit={limit}"
-            )
-            
-            # Better error handling for 422 errors
-            if response.status_code == 422:
-                try:
-                    error_data = response.json()
-                    errors = error_data.get("errors", [])
-                    error_msg = errors[0] if errors else error_data.get("error", {}).get("message", "Unknown error")
-                    raise ValueError(
-                        f"NREL API returned 422 Unprocessable Entity: {error_msg}. "
-                        f"Request params: latitude={latitude}, longitude={longitude}, limit={limit}"
-                    )
-                except Exception:
-                    raise ValueError(
-                        f"NREL API returned 422 Unprocessable Entity. "
-                        f"Response: {response.text[:500]}. "
-                        f"Request params: latitude={latitude}, longitude={longitude}, limit={limit}"
-                    )
-            
-            response.raise_for_status()
-            data = response.json()
-            
-            # Extract station data from NREL API response
-            if "fuel_stations" in data:
-                return data["fuel_stations"]
-            return []
+        client = self._get_client()
+        params = {
+            "api_key": self.api_key,
+            "latitude": latitude,
+            "longitude": longitude,
+            "fuel_type": fuel_type,
+            "limit": limit,
+            "format": "json"
+        }
+        
+        response = await client.get(
+            f"{self.BASE_URL_STATIONS}/nearest.json",
+            params=params,
+            timeout=30.0
+        )
+        
+        # Handle rate limit errors (429)
+        self._handle_rate_limit_error(
+            response,
+            "NREL Stations API",
+            f"Request params: latitude={latitude}, longitude={longitude}, limit={limit}"
+        )
+        
+        # Better error handling for 422 errors
+        if response.status_code == 422:
+            try:
+                error_data = response.json()
+                errors = error_data.get("errors", [])
+                error_msg = errors[0] if errors else error_data.get("error", {}).get("message", "Unknown error")
+                raise ValueError(
+                    f"NREL API returned 422 Unprocessable Entity: {error_msg}. "
+                    f"Request params: latitude={latitude}, longitude={longitude}, limit={limit}"
+                )
+            except Exception:
+                raise ValueError(
+                    f"NREL API returned 422 Unprocessable Entity. "
+                    f"Response: {response.text[:500]}. "
+                    f"Request params: latitude={latitude}, longitude={longitude}, limit={limit}"
+                )
+        
+        response.raise_for_status()
+        data = response.json()
+        
+        # Extract station data from NREL API response
+        if "fuel_stations" in data:
+            return data["fuel_stations"]
+        return []
     
     async def get_stations_by_state(
         self,
@@ -516,52 +535,52 @@ class NRELClient:
         Returns:
             List of station dictionaries
         """
-        async with httpx.AsyncClient() as client:
-            params = {
-                "api_key": self.api_key,
-                "state": state.upper(),
-                "fuel_type": fuel_type,
-                "limit": min(limit, 200),  # API max appears to be 200, not 10000
-                "offset": offset,
-                "format": "json"
-            }
-            
-            response = await client.get(
-                f"{self.BASE_URL_STATIONS}.json",
-                params=params,
-                timeout=60.0  # Longer timeout for large requests
-            )
-            
-            # Handle rate limit errors (429)
-            self._handle_rate_limit_error(
-                response,
-                "NREL Stations API",
-                f"Request params: state={state}, limit={limit}, offset={offset}"
-            )
-            
-            # Better error handling for 422 errors
-            if response.status_code == 422:
-                try:
-                    error_data = response.json()
-                    error_msg = error_data.get("error", {}).get("message", "Unknown error")
-                    raise ValueError(
-                        f"NREL API returned 422 Unprocessable Entity: {error_msg}. "
-                        f"Request params: state={state}, limit={limit}, offset={offset}"
-                    )
-                except Exception:
-                    raise ValueError(
-                        f"NREL API returned 422 Unprocessable Entity. "
-                        f"Response: {response.text[:500]}. "
-                        f"Request params: state={state}, limit={limit}, offset={offset}"
-                    )
-            
-            response.raise_for_status()
-            data = response.json()
-            
-            # Extract station data from NREL API response
-            if "fuel_stations" in data:
-                return data["fuel_stations"]
-            return []
+        client = self._get_client()
+        params = {
+            "api_key": self.api_key,
+            "state": state.upper(),
+            "fuel_type": fuel_type,
+            "limit": min(limit, 200),  # API max appears to be 200, not 10000
+            "offset": offset,
+            "format": "json"
+        }
+        
+        response = await client.get(
+            f"{self.BASE_URL_STATIONS}.json",
+            params=params,
+            timeout=60.0  # Longer timeout for large requests
+        )
+        
+        # Handle rate limit errors (429)
+        self._handle_rate_limit_error(
+            response,
+            "NREL Stations API",
+            f"Request params: state={state}, limit={limit}, offset={offset}"
+        )
+        
+        # Better error handling for 422 errors
+        if response.status_code == 422:
+            try:
+                error_data = response.json()
+                error_msg = error_data.get("error", {}).get("message", "Unknown error")
+                raise ValueError(
+                    f"NREL API returned 422 Unprocessable Entity: {error_msg}. "
+                    f"Request params: state={state}, limit={limit}, offset={offset}"
+                )
+            except Exception:
+                raise ValueError(
+                    f"NREL API returned 422 Unprocessable Entity. "
+                    f"Response: {response.text[:500]}. "
+                    f"Request params: state={state}, limit={limit}, offset={offset}"
+                )
+        
+        response.raise_for_status()
+        data = response.json()
+        
+        # Extract station data from NREL API response
+        if "fuel_stations" in data:
+            return data["fuel_stations"]
+        return []
     
     async def get_all_stations_by_state(
         self,
@@ -705,7 +724,7 @@ class NRELClient:
             Dictionary containing utility rate information
         """
         # Create cache key
-        cache_key = self.cache._make_key(
+        cache_key = self.cache.make_key(
             "utility_rates",
             latitude=latitude,
             longitude=longitude,
@@ -744,21 +763,112 @@ class NRELClient:
         Returns:
             Dictionary containing utility rate information
         """
-        async with httpx.AsyncClient() as client:
-            # NREL API v3 requires "lat" and "lon" parameters (address parameter deprecated 2025-02-25)
-            # Use lat/lon directly - this is the only supported format
-            params = {
-                "api_key": self.api_key,
-                "lat": str(latitude),
-                "lon": str(longitude),
-                "format": "json"
-            }
-            
-            if sector:
-                params["sector"] = sector.lower()
-            
+        client = self._get_client()
+        # NREL API v3 requires "lat" and "lon" parameters (address parameter deprecated 2025-02-25)
+        # Use lat/lon directly - this is the only supported format
+        params = {
+            "api_key": self.api_key,
+            "lat": str(latitude),
+            "lon": str(longitude),
+            "format": "json"
+        }
+        
+        if sector:
+            params["sector"] = sector.lower()
+        
+        response = await client.get(
+            self.BASE_URL_ELECTRICITY,
+            params=params,
+            timeout=30.0
+        )
+        
+        # Handle rate limit errors (429)
+        self._handle_rate_limit_error(
+            response,
+            "NREL Utility Rates API",
+            f"Request params: lat={latitude}, lon={longitude}, sector={sector}"
+        )
+        
+        # Better error handling for 422 errors
+        if response.status_code == 422:
+            try:
+                error_data = response.json()
+                errors = error_data.get("errors", [])
+                error_msg = errors[0] if errors else error_data.get("error", {}).get("message", "Unknown error")
+                raise ValueError(
+                    f"NREL API returned 422 Unprocessable Entity: {error_msg}. "
+                    f"Request params: lat={latitude}, lon={longitude}, sector={sector}"
+                )
+            except Exception:
+                raise ValueError(
+                    f"NREL API returned 422 Unprocessable Entity. "
+                    f"Response: {response.text[:500]}. "
+                    f"Request params: lat={latitude}, lon={longitude}, sector={sector}"
+                )
+        
+        response.raise_for_status()
+        data = response.json()
+        
+        # Extract utility rate data from NREL API response
+        # The API response structure may vary, so we'll return the full response
+        # but extract common fields
+        if "outputs" in data:
+            outputs = data["outputs"]
+            if isinstance(outputs, list) and len(outputs) > 0:
+                return outputs[0]
+            return outputs
+        
+        # If no "outputs" key, return the full response
+        return data
+    
+    async def get_utility_rates_by_zip(
+        self,
+        zip_code: str,
+        sector: str = "residential"
+    ) -> Dict[str, Any]:
+        """
+        Convenience method to get utility rates by zip code.
+        
+        Args:
+            zip_code: 5-digit US zip code
+            sector: Sector type - "residential", "commercial", or "industrial"
+        
+        Returns:
+            Dictionary containing utility rate information
+        """
+        return await self.get_utility_rates(location=zip_code, sector=sector)
+    
+    async def _get_solar_estimate_internal(
+        self,
+        lat: float,
+        lon: float,
+        system_capacity: float = 5.0,
+        azimuth: float = 180.0,
+        tilt: float = 20.0,
+        array_type: int = 1,
+        module_type: int = 0,
+        losses: float = 14.0
+    ) -> Dict[str, Any]:
+        """
+        Internal solar estimate implementation.
+        """
+        client = self._get_client()
+        params = {
+            "api_key": self.api_key,
+            "lat": lat,
+            "lon": lon,
+            "system_capacity": system_capacity,
+            "azimuth": azimuth,
+            "tilt": tilt,
+            "array_type": array_type,
+            "module_type": module_type,
+            "losses": losses,
+            "format": "json"
+        }
+        
+        try:
             response = await client.get(
-                self.BASE_URL_ELECTRICITY,
+                self.BASE_URL_PVWATTS,
                 params=params,
                 timeout=30.0
             )
@@ -766,33 +876,31 @@ class NRELClient:
             # Handle rate limit errors (429)
             self._handle_rate_limit_error(
                 response,
-                "NREL Utility Rates API",
-                f"Request params: lat={latitude}, lon={longitude}, sector={sector}"
+                "NREL PVWatts API",
+                f"Request params: lat={lat}, lon={lon}, system_capacity={system_capacity}"
             )
             
-            # Better error handling for 422 errors
+            # Handle 422 errors (validation errors)
             if response.status_code == 422:
                 try:
                     error_data = response.json()
                     errors = error_data.get("errors", [])
                     error_msg = errors[0] if errors else error_data.get("error", {}).get("message", "Unknown error")
                     raise ValueError(
-                        f"NREL API returned 422 Unprocessable Entity: {error_msg}. "
-                        f"Request params: lat={latitude}, lon={longitude}, sector={sector}"
+                        f"NREL PVWatts API returned 422 Unprocessable Entity: {error_msg}. "
+                        f"Request params: lat={lat}, lon={lon}, system_capacity={system_capacity}"
                     )
                 except Exception:
                     raise ValueError(
-                        f"NREL API returned 422 Unprocessable Entity. "
+                        f"NREL PVWatts API returned 422 Unprocessable Entity. "
                         f"Response: {response.text[:500]}. "
-                        f"Request params: lat={latitude}, lon={longitude}, sector={sector}"
+                        f"Request params: lat={lat}, lon={lon}, system_capacity={system_capacity}"
                     )
             
             response.raise_for_status()
             data = response.json()
             
-            # Extract utility rate data from NREL API response
-            # The API response structure may vary, so we'll return the full response
-            # but extract common fields
+            # Extract outputs from NREL API response
             if "outputs" in data:
                 outputs = data["outputs"]
                 if isinstance(outputs, list) and len(outputs) > 0:
@@ -801,109 +909,20 @@ class NRELClient:
             
             # If no "outputs" key, return the full response
             return data
-    
-    async def get_utility_rates_by_zip(
-        self,
-        zip_code: str,
-        sector: str = "residential"
-    ) -> Dict[str, Any]:
-        """
-        Convenience method to get utility rates by zip code.
-        
-        Args:
-            zip_code: 5-digit US zip code
-            sector: Sector type - "residential", "commercial", or "industrial"
-        
-        Returns:
-            Dictionary containing utility rate information
-        """
-        return await self.get_utility_rates(location=zip_code, sector=sector)
-    
-    async def _get_solar_estimate_internal(
-        self,
-        lat: float,
-        lon: float,
-        system_capacity: float = 5.0,
-        azimuth: float = 180.0,
-        tilt: float = 20.0,
-        array_type: int = 1,
-        module_type: int = 0,
-        losses: float = 14.0
-    ) -> Dict[str, Any]:
-        """
-        Internal solar estimate implementation.
-        """
-        async with httpx.AsyncClient() as client:
-            params = {
-                "api_key": self.api_key,
-                "lat": lat,
-                "lon": lon,
-                "system_capacity": system_capacity,
-                "azimuth": azimuth,
-                "tilt": tilt,
-                "array_type": array_type,
-                "module_type": module_type,
-                "losses": losses,
-                "format": "json"
-            }
             
-            try:
-                response = await client.get(
-                    self.BASE_URL_PVWATTS,
-                    params=params,
-                    timeout=30.0
-                )
-                
-                # Handle rate limit errors (429)
-                self._handle_rate_limit_error(
-                    response,
-                    "NREL PVWatts API",
-                    f"Request params: lat={lat}, lon={lon}, system_capacity={system_capacity}"
-                )
-                
-                # Handle 422 errors (validation errors)
-                if response.status_code == 422:
-                    try:
-                        error_data = response.json()
-                        errors = error_data.get("errors", [])
-                        error_msg = errors[0] if errors else error_data.get("error", {}).get("message", "Unknown error")
-                        raise ValueError(
-                            f"NREL PVWatts API returned 422 Unprocessable Entity: {error_msg}. "
-                            f"Request params: lat={lat}, lon={lon}, system_capacity={system_capacity}"
-                        )
-                    except Exception:
-                        raise ValueError(
-                            f"NREL PVWatts API returned 422 Unprocessable Entity. "
-                            f"Response: {response.text[:500]}. "
-                            f"Request params: lat={lat}, lon={lon}, system_capacity={system_capacity}"
-                        )
-                
-                response.raise_for_status()
-                data = response.json()
-                
-                # Extract outputs from NREL API response
-                if "outputs" in data:
-                    outputs = data["outputs"]
-                    if isinstance(outputs, list) and len(outputs) > 0:
-                        return outputs[0]
-                    return outputs
-                
-                # If no "outputs" key, return the full response
-                return data
-                
-            except httpx.TimeoutException as e:
-                raise ValueError(
-                    f"NREL PVWatts API request timed out for coordinates lat={lat}, lon={lon}. "
-                    f"Please try again later."
-                ) from e
-            except httpx.HTTPStatusError as e:
-                raise ValueError(
-                    f"NREL PVWatts API returned error {e.response.status_code}: {e.response.text[:500]}"
-                ) from e
-            except Exception as e:
-                raise ValueError(
-                    f"Failed to get solar estimate: {str(e)}"
-                ) from e
+        except httpx.TimeoutException as e:
+            raise ValueError(
+                f"NREL PVWatts API request timed out for coordinates lat={lat}, lon={lon}. "
+                f"Please try again later."
+            ) from e
+        except httpx.HTTPStatusError as e:
+            raise ValueError(
+                f"NREL PVWatts API returned error {e.response.status_code}: {e.response.text[:500]}"
+            ) from e
+        except Exception as e:
+            raise ValueError(
+                f"Failed to get solar estimate: {str(e)}"
+            ) from e
     
     async def get_solar_estimate(
         self,
@@ -951,7 +970,7 @@ class NRELClient:
             httpx.TimeoutException: If API request times out
         """
         # Create cache key
-        cache_key = self.cache._make_key(
+        cache_key = self.cache.make_key(
             "solar_estimate",
             lat=lat,
             lon=lon,
@@ -0,0 +1,98 @@
+"""
+Batched writer for query history.
+
+History rows are not needed by the request that produces them, so they are
+queued and written in batches (one INSERT and one commit per batch) by a
+background task instead of a commit per query.
+"""
+
+from typing import Any, Dict, List, Optional
+from sqlalchemy import insert
+from app.database import AsyncSessionLocal
+from app.models.query import Query
+from app.services.logger_service import get_logger
+import asyncio
+
+
+logger = get_logger("query_writer")
+
+# Queued in place of a row to tell the writer to flush and exit
+_STOP = object()
+
+
+class QueryWriter:
+    """Collects Query rows and writes them every flush_interval seconds or batch_size rows."""
+    
+    def __init__(self, batch_size: int = 32, flush_interval: float = 0.05):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+    
+    def enqueue(self, **values: Any):
+        """Queue a Query row (column values as keyword arguments) for writing."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        self._queue.put_nowait(values)
+    
+    async def stop(self):
+        """Write any queued rows and stop the background task (called on shutdown)."""
+        if self._task is None or self._task.done():
+            return
+        self._queue.put_nowait(_STOP)
+        await self._task
+        self._task = None
+    
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await self._queue.get()
+            if item is _STOP:
+                return
+            batch = [item]
+            stopping = False
+            
+            # Collect more rows until the batch is full or the flush interval has passed
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            
+            await self._write(batch)
+            if stopping:
+                return
+    
+    async def _write(self, batch: List[Dict[str, Any]]):
+        """Insert a batch of rows in a single transaction."""
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(insert(Query), batch)
+                await db.commit()
+        except Exception as e:
+            # History is best-effort; a failed batch must not stop the writer
+            logger.log_error(
+                "query_history_write_failed",
+                str(e),
+                context={"rows": len(batch)}
+            )
+
+
+# Global query writer instance
+_query_writer: Optional[QueryWriter] = None
+
+
+def get_query_writer() -> QueryWriter:
+    """Get global query writer instance."""
+    global _query_writer
+    if _query_writer is None:
+        _query_writer = QueryWriter()
+    return _query_writer
@@ -13,7 +13,7 @@ from app.services.nrel_client import NRELClient
 from app.services.bcl_client import BCLClient
 from app.services.document_service import DocumentService
 from app.services.vector_store_service import VectorStoreService
-from app.services.llm_service import LLMService
+from app.services.llm_service import get_llm_service
 from app.services.location_service import LocationService
 from app.services.validators import validate_query_inputs
 from app.services.logger_service import get_logger
@@ -47,7 +47,7 @@ class RAGService:
         self.bcl_client = BCLClient()
         self.document_service = DocumentService()
         self.vector_store_service = VectorStoreService(llm_mode=llm_mode)
-        self.llm_service = LLMService()
+        self.llm_service = get_llm_service()
         self.location_service = LocationService()
         self.reopt_service = REoptService()
         self.logger = get_logger("rag_service")
@@ -424,18 +424,19 @@ class RAGService:
                 # Use first keyword or original query
                 search_query = keywords[0] if keywords else query[:50]  # Limit query length
             
-            # Search for building code measures
+            # Search for building code and energy efficiency measures concurrently
+            # (independent BCL searches, so one round trip of latency instead of two)
             print(f"[RAGService] bcl_api_call | type=building_codes | query='{search_query[:50] if search_query else 'N/A'}' | state={state}")
-            building_codes = await self.bcl_client.search_building_codes(
-                query=search_query,
-                limit=limit
-            )
-            
-            # Search for energy efficiency measures
             print(f"[RAGService] bcl_api_call | type=efficiency_measures | query='{search_query[:50] if search_query else 'N/A'}' | state={state}")
-            efficiency_measures = await self.bcl_client.search_energy_efficiency_measures(
-                query=search_query,
-                limit=limit
+            building_codes, efficiency_measures = await asyncio.gather(
+                self.bcl_client.search_building_codes(
+                    query=search_query,
+                    limit=limit
+                ),
+                self.bcl_client.search_energy_efficiency_measures(
+                    query=search_query,
+                    limit=limit
+                )
             )
             
             # Combine results
@@ -808,7 +809,8 @@ class RAGService:
         self,
         state: str,
         batch_size: int = 100,
-        limit: Optional[int] = None
+        limit: Optional[int] = None,
+        concurrency: int = 8
     ) -> Dict[str, Any]:
         """
         Bulk index all stations for a state.
@@ -817,6 +819,7 @@ class RAGService:
             state: 2-letter US state code (e.g., "OH")
             batch_size: Number of stations to process per batch
             limit: Optional limit on total stations to index (for testing)
+            concurrency: Maximum number of batches embedded and inserted at once
             
         Returns:
             Dictionary with indexing results
@@ -845,35 +848,42 @@ class RAGService:
             }
         
         total_stations = len(stations)
-        indexed_count = 0
-        skipped_count = 0
         
         # Get vector store index
         index = self.vector_store_service.get_index()
         
-        # Process in batches
-        for i in range(0, total_stations, batch_size):
-            batch = stations[i:i + batch_size]
-            
+        # Embedding and upserting are blocking I/O, so batches run in worker
+        # threads, at most `concurrency` at a time
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        
+        async def index_batch(batch_number: int, batch: List[Dict[str, Any]]) -> Tuple[int, int]:
             # Convert to Documents
             documents = self.document_service.stations_to_documents(batch)
             
             # Validate documents structure
             if not documents or not isinstance(documents, list):
-                print(f"[RAGService] ERROR bulk_index_state | invalid_documents | batch={i//batch_size + 1} | type={type(documents)}")
-                continue
+                print(f"[RAGService] ERROR bulk_index_state | invalid_documents | batch={batch_number} | type={type(documents)}")
+                return 0, 0
             
             # Check if documents is nested (list of lists)
             if documents and isinstance(documents[0], list):
-                print(f"[RAGService] ERROR bulk_index_state | nested_list_detected | batch={i//batch_size + 1} | flattening")
+                print(f"[RAGService] ERROR bulk_index_state | nested_list_detected | batch={batch_number} | flattening")
                 documents = [doc for sublist in documents for doc in sublist]
             
             # Use helper method for bulk insert
-            batch_indexed, batch_failed = self._bulk_insert_documents(index, documents)
-            indexed_count += batch_indexed
-            skipped_count += batch_failed
+            async with semaphore:
+                batch_indexed, batch_failed = await asyncio.to_thread(self._bulk_insert_documents, index, documents)
             if batch_failed > 0:
-                print(f"[RAGService] bulk_index_state | state={state} | batch={i//batch_size + 1} | indexed={batch_indexed} | failed={batch_failed}")
+                print(f"[RAGService] bulk_index_state | state={state} | batch={batch_number} | indexed={batch_indexed} | failed={batch_failed}")
+            return batch_indexed, batch_failed
+        
+        # Process in batches
+        results = await asyncio.gather(*(
+            index_batch(i // batch_size + 1, stations[i:i + batch_size])
+            for i in range(0, total_stations, batch_size)
+        ))
+        indexed_count = sum(batch_indexed for batch_indexed, _ in results)
+        skipped_count = sum(batch_failed for _, batch_failed in results)
         
         return {
             "state": state,
@@ -1067,10 +1077,7 @@ class RAGService:
             
             # Check query result cache (cache for 1 hour) - after location detection
             cache_key = self._make_query_cache_key(question, zip_code, top_k, detected_location_info)
-            cached_result = await self.cache_service.get(
-                cache_key,
-                timedelta(hours=1)
-            )
+            cached_result = await self.cache_service.get(cache_key)
             if cached_result:
                 self.logger.log_cache(
                     operation="query_cache_hit",
@@ -1613,7 +1620,8 @@ class RAGService:
                             if hasattr(node, "text") and node.text
                             else str(node)[:200] + "..." if len(str(node)) > 200 else str(node)
                         ),
-                        "metadata": node.metadata if hasattr(node, "metadata") else {}
+                        "metadata": node.metadata if hasattr(node, "metadata") else {},
+                        "score": getattr(node, "score", None)
                     }
                     for node in final_nodes
                 ],
@@ -1645,7 +1653,7 @@ class RAGService:
             
             # Cache query result
             try:
-                await self.cache_service.set(cache_key, response_data)
+                await self.cache_service.set(cache_key, response_data, timedelta(hours=1))
             except Exception as cache_error:
                 # Don't fail if caching fails
                 self.logger.log_error(
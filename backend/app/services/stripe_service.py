@@ -1,6 +1,15 @@
 import stripe
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, AsyncIterator, List, Tuple
 from pydantic_settings import BaseSettings
+import hashlib
+import hmac
+import json
+import time
+
+
+# Same defaults as stripe.Webhook: v1 signatures, 5 minute replay window
+WEBHOOK_SIGNATURE_SCHEME = "v1"
+WEBHOOK_TOLERANCE = 300
 
 
 class StripeSettings(BaseSettings):
@@ -14,11 +23,16 @@ class StripeSettings(BaseSettings):
 
 
 class StripeService:
-    """Service for handling Stripe operations."""
+    """
+    Service for handling Stripe operations.
+    The Stripe SDK calls are blocking; async callers run them with asyncio.to_thread.
+    """
     
     def __init__(self):
         self.settings = StripeSettings()
         stripe.api_key = self.settings.stripe_secret_key
+        # Keyed once; each webhook copies it instead of re-deriving the HMAC key pads
+        self._webhook_mac = hmac.new(self.settings.stripe_webhook_secret.encode("utf-8"), digestmod=hashlib.sha256)
     
     def create_checkout_session(
         self,
@@ -85,15 +99,44 @@ class StripeService:
             # Customer might already be deleted or not found
             return False
     
-    def verify_webhook(self, payload: bytes, signature: str) -> Dict[str, Any]:
-        """Verify Stripe webhook signature."""
+    async def verify_webhook(self, body: AsyncIterator[bytes], signature: str) -> Dict[str, Any]:
+        """
+        Verify Stripe webhook signature while the body is being received.
+        
+        The HMAC is fed chunk by chunk as the request streams in (Stripe signs
+        "<timestamp>.<body>"), matching stripe.Webhook.construct_event.
+        The event is returned as plain parsed JSON: the webhook only reads it
+        as a dict, so it isn't converted into nested stripe.StripeObjects.
+        """
         try:
-            event = stripe.Webhook.construct_event(
-                payload, signature, self.settings.stripe_webhook_secret
-            )
-            return event
+            timestamp, signatures = _parse_signature_header(signature)
         except ValueError:
-            raise ValueError("Invalid payload")
-        except stripe.error.SignatureVerificationError:
             raise ValueError("Invalid signature")
+        
+        mac = self._webhook_mac.copy()
+        mac.update(b"%d." % timestamp)
+        payload = bytearray()
+        async for chunk in body:
+            mac.update(chunk)
+            payload += chunk
+        
+        expected_signature = mac.hexdigest()
+        if not any(hmac.compare_digest(expected_signature, sig) for sig in signatures):
+            raise ValueError("Invalid signature")
+        if timestamp < time.time() - WEBHOOK_TOLERANCE:
+            raise ValueError("Invalid signature")
+        
+        try:
+            return json.loads(payload)
+        except ValueError:
+            raise ValueError("Invalid payload")
+
 
+def _parse_signature_header(header: str) -> Tuple[int, List[str]]:
+    """Split a Stripe-Signature header into its timestamp and v1 signatures."""
+    items = [item.split("=", 1) for item in header.split(",")]
+    timestamps = [item[1] for item in items if len(item) == 2 and item[0] == "t"]
+    signatures = [item[1] for item in items if len(item) == 2 and item[0] == WEBHOOK_SIGNATURE_SCHEME]
+    if not timestamps or not signatures:
+        raise ValueError("Malformed Stripe-Signature header")
+    return int(timestamps[0]), signatures
@@ -0,0 +1,47 @@
+"""
+Status of long-running background tasks (URDB fetches), polled by clients.
+
+The API runs as a single uvicorn process, which is also where the tasks run,
+so status is kept in process. Entries expire a day after their last update,
+or an hour after a task completes or fails, so finished tasks don't accumulate.
+"""
+
+from typing import Any, Dict, NamedTuple, Optional
+from cachetools import TLRUCache
+import hashlib
+import orjson
+
+# Seconds a task's status is kept after its last update
+TASK_STATUS_TTL = 86400
+# Seconds a finished task's status is kept; clients stop polling once they see it
+FINISHED_TASK_STATUS_TTL = 3600
+FINISHED_STATES = frozenset({"completed", "failed"})
+
+
+class TaskStatus(NamedTuple):
+    """A task's status, serialized once per update rather than once per poll."""
+    status: Dict[str, Any]
+    body: bytes
+    etag: str
+
+
+def _expires_at(task_id: str, entry: TaskStatus, now: float) -> float:
+    """Expiry time for a status update; finished tasks are dropped sooner."""
+    if entry.status.get("status") in FINISHED_STATES:
+        return now + FINISHED_TASK_STATUS_TTL
+    return now + TASK_STATUS_TTL
+
+
+_task_status: TLRUCache = TLRUCache(maxsize=10_000, ttu=_expires_at)
+
+
+def set_task_status(task_id: str, status: Dict[str, Any]) -> None:
+    """Record the current status of a task (restarting its expiry)."""
+    body = orjson.dumps(status)
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    _task_status[task_id] = TaskStatus(status, body, etag)
+
+
+def get_task_status(task_id: str) -> Optional[TaskStatus]:
+    """Get the last recorded status of a task, or None if unknown or expired."""
+    return _task_status.get(task_id)
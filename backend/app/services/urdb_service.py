@@ -1,4 +1,4 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import httpx
 import asyncio
 from pydantic_settings import BaseSettings
@@ -165,10 +165,6 @@ class URDBService:
         Returns:
             Dictionary with indexing statistics
         """
-        index = self.vector_store_service.get_index()
-        indexed_count = 0
-        skipped_count = 0
-        
         all_documents = []
         
         # Convert URDB data to documents
@@ -184,12 +180,38 @@ class URDBService:
                 )
                 all_documents.extend(documents)
         
-        # Index documents in batches
+        # Index documents in batches. Inserts embed and write synchronously, so they run
+        # in a worker thread to keep the event loop serving requests during long fetches
         total_docs = len(all_documents)
         print(f"Indexing {total_docs} URDB documents...")
+        indexed_count, skipped_count = await asyncio.to_thread(
+            self._insert_batches, all_documents, batch_size
+        )
+        
+        return {
+            "total_zip_codes": len(urdb_data),
+            "total_documents": total_docs,
+            "indexed": indexed_count,
+            "skipped": skipped_count,
+            "message": f"Successfully indexed {indexed_count} URDB documents"
+        }
+    
+    def _insert_batches(self, documents: List[Any], batch_size: int) -> Tuple[int, int]:
+        """
+        Insert documents into the vector index in batches (blocking).
+        
+        Returns:
+            Tuple of (indexed_count, skipped_count)
+        """
+        from llama_index.core.node_parser import SimpleNodeParser
+        node_parser = SimpleNodeParser.from_defaults()
+        index = self.vector_store_service.get_index()
+        indexed_count = 0
+        skipped_count = 0
+        total_docs = len(documents)
         
         for i in range(0, total_docs, batch_size):
-            batch = all_documents[i:i + batch_size]
+            batch = documents[i:i + batch_size]
             batch_num = (i // batch_size) + 1
             total_batches = (total_docs + batch_size - 1) // batch_size
             
@@ -197,8 +219,9 @@ class URDBService:
             
             # Bulk insert documents for better performance
             try:
-                # Bulk insert entire batch at once
-                index.insert(batch)
+                # Bulk insert entire batch at once; insert_nodes() embeds the batch's
+                # nodes in batched embedding calls (insert() only takes one document)
+                index.insert_nodes(node_parser.get_nodes_from_documents(batch))
                 indexed_count += len(batch)
             except Exception as e:
                 # If bulk insert fails, fall back to individual inserts for error handling
@@ -212,13 +235,7 @@ class URDBService:
                         if skipped_count <= 5:  # Only print first few errors
                             print(f"  Skipped document: {str(doc_error)[:100]}")
         
-        return {
-            "total_zip_codes": len(urdb_data),
-            "total_documents": total_docs,
-            "indexed": indexed_count,
-            "skipped": skipped_count,
-            "message": f"Successfully indexed {indexed_count} URDB documents"
-        }
+        return indexed_count, skipped_count
     
     async def fetch_and_index_urdb_by_zip_codes(
         self,
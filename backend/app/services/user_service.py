@@ -1,37 +1,59 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import select, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, delete, literal_column
+from sqlalchemy.dialects.postgresql import insert
+from cachetools import TTLCache
+from dataclasses import dataclass
 from app.models.user import User
 from app.models.subscription import Subscription
 from app.models.query import Query
 from app.services.logger_service import get_logger
 from app.services.stripe_service import StripeService
 from typing import Optional
+import asyncio
 import uuid
 
 
 logger = get_logger("user_service")
 
 
+@dataclass(frozen=True)
+class AuthenticatedUser:
+    """Detached snapshot of a user, safe to cache across requests."""
+    id: uuid.UUID
+    clerk_id: str
+    email: str
+
+
+# Known users keyed by clerk_id. The TTL bounds how long another worker's
+# deletion can go unnoticed, since invalidation only reaches this process.
+_user_cache: TTLCache = TTLCache(maxsize=50_000, ttl=600)
+
+
 class UserService:
     """Service for managing users and their subscriptions."""
     
     @staticmethod
-    def get_or_create_user(db: Session, clerk_id: str, email: str) -> User:
+    async def get_or_create_user(db: AsyncSession, clerk_id: str, email: str) -> AuthenticatedUser:
         """
         Get existing user or create a new one.
         
         First checks by clerk_id, then by email to prevent duplicate accounts
         when Clerk generates different IDs for the same email address.
+        Known users are served from an in-process cache without a query.
         """
+        cached = _user_cache.get(clerk_id)
+        if cached is not None:
+            return cached
+        
         # First, try to find user by clerk_id (primary lookup)
-        user = db.scalar(select(User).where(User.clerk_id == clerk_id))
+        user = await db.scalar(select(User).where(User.clerk_id == clerk_id))
         
         if user:
-            return user
+            return UserService._cache_user(user.id, user.clerk_id, user.email)
         
         # If not found by clerk_id, check by email to prevent duplicates
         # This handles cases where Clerk generates different IDs for the same email
-        existing_user = db.scalar(select(User).where(User.email == email))
+        existing_user = await db.scalar(select(User).where(User.email == email))
         
         if existing_user:
             # Found user with same email but different clerk_id
@@ -50,91 +72,113 @@ class UserService:
             
             # Update the clerk_id to the current one (Clerk is the source of truth)
             # This ensures future lookups by clerk_id will find this user
+            _user_cache.pop(existing_user.clerk_id, None)
             existing_user.clerk_id = clerk_id
-            db.commit()
-            db.refresh(existing_user)
+            await db.commit()
             
-            return existing_user
+            return UserService._cache_user(existing_user.id, clerk_id, existing_user.email)
         
-        # No user found with either clerk_id or email, create new user
-        user = User(
-            id=uuid.uuid4(),
-            clerk_id=clerk_id,
-            email=email
-        )
-        db.add(user)
-        db.commit()
-        db.refresh(user)
+        # No user found with either clerk_id or email, create new user.
+        # ON CONFLICT covers a concurrent request creating the same user first;
+        # xmax = 0 only for a freshly inserted row.
+        row = (await db.execute(
+            insert(User)
+            .values(id=uuid.uuid4(), clerk_id=clerk_id, email=email)
+            .on_conflict_do_update(index_elements=[User.clerk_id], set_={"clerk_id": clerk_id})
+            .returning(User.id, User.email, literal_column("xmax = 0").label("inserted"))
+        )).one()
         
-        # Create free tier subscription
-        subscription = Subscription(
-            id=uuid.uuid4(),
-            user_id=user.id,
-            plan="free",
-            query_limit=3,
-            queries_used=0,
-            status="active"
-        )
-        db.add(subscription)
-        db.commit()
+        if row.inserted:
+            # Create free tier subscription in the same transaction
+            await db.execute(
+                insert(Subscription)
+                .values(
+                    id=uuid.uuid4(),
+                    user_id=row.id,
+                    plan="free",
+                    query_limit=3,
+                    queries_used=0,
+                    status="active"
+                )
+                .on_conflict_do_nothing(index_elements=[Subscription.user_id])
+            )
+        await db.commit()
         
-        logger.log_query(
-            question="user_created",
-            user_id=str(user.id),
-            success=True,
-            zip_code=None
-        )
+        if row.inserted:
+            logger.log_query(
+                question="user_created",
+                user_id=str(row.id),
+                success=True,
+                zip_code=None
+            )
         
+        return UserService._cache_user(row.id, clerk_id, row.email)
+    
+    @staticmethod
+    def _cache_user(user_id: uuid.UUID, clerk_id: str, email: str) -> AuthenticatedUser:
+        """Store a detached snapshot of a user in the clerk_id cache."""
+        user = AuthenticatedUser(id=user_id, clerk_id=clerk_id, email=email)
+        _user_cache[clerk_id] = user
         return user
     
     @staticmethod
-    def get_user_by_clerk_id(db: Session, clerk_id: str) -> Optional[User]:
+    def invalidate_cached_user(clerk_id: str):
+        """Drop a user from the clerk_id cache (e.g. after deletion)."""
+        _user_cache.pop(clerk_id, None)
+    
+    @staticmethod
+    async def get_user_by_clerk_id(db: AsyncSession, clerk_id: str) -> Optional[User]:
         """Get user by Clerk ID."""
-        return db.scalar(select(User).where(User.clerk_id == clerk_id))
+        return await db.scalar(select(User).where(User.clerk_id == clerk_id))
     
     @staticmethod
-    def get_user_by_email(db: Session, email: str) -> Optional[User]:
+    async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
         """Get user by email address."""
-        return db.scalar(select(User).where(User.email == email))
+        return await db.scalar(select(User).where(User.email == email))
     
     @staticmethod
-    def get_user_subscription(db: Session, user_id: uuid.UUID) -> Optional[Subscription]:
+    async def get_user_subscription(db: AsyncSession, user_id: uuid.UUID) -> Optional[Subscription]:
         """Get user's subscription."""
-        return db.scalar(select(Subscription).where(Subscription.user_id == user_id))
+        return await db.scalar(select(Subscription).where(Subscription.user_id == user_id))
     
     @staticmethod
-    def increment_query_count(db: Session, user_id: uuid.UUID) -> bool:
-        """Increment query count for user. Returns True if successful, False if limit reached."""
-        subscription = db.scalar(select(Subscription).where(Subscription.user_id == user_id))
-        
-        if not subscription:
-            return False
-        
-        if not subscription.can_make_query():
-            return False
+    async def increment_query_count(db: AsyncSession, user_id: uuid.UUID) -> bool:
+        """
+        Increment query count for user. Returns True if successful, False if limit reached.
         
-        subscription.queries_used += 1
-        db.commit()
-        return True
+        The limit check and the increment are a single UPDATE, so concurrent
+        queries can't both pass the check and overrun the limit.
+        """
+        incremented = await db.scalar(
+            update(Subscription)
+            .where(Subscription.user_id == user_id, Subscription.can_make_query)
+            .values(
+                queries_used=Subscription.queries_used + 1,
+                lifetime_queries=Subscription.lifetime_queries + 1
+            )
+            .returning(Subscription.id)
+        )
+        await db.commit()
+        return incremented is not None
     
     @staticmethod
-    def reset_query_count(db: Session, user_id: uuid.UUID):
+    async def reset_query_count(db: AsyncSession, user_id: uuid.UUID):
         """Reset query count (e.g., for new billing period)."""
-        subscription = db.scalar(select(Subscription).where(Subscription.user_id == user_id))
+        subscription = await db.scalar(select(Subscription).where(Subscription.user_id == user_id))
         
         if subscription:
             subscription.queries_used = 0
-            db.commit()
+            await db.commit()
     
     @staticmethod
-    def upgrade_to_premium(
-        db: Session,
+    async def upgrade_to_premium(
+        db: AsyncSession,
         user_id: str,
         stripe_customer_id: str,
         stripe_subscription_id: str
     ):
         """Upgrade user subscription to premium."""
-        subscription = db.scalar(select(Subscription).where(Subscription.user_id == uuid.UUID(user_id)))
+        subscription = await db.scalar(select(Subscription).where(Subscription.user_id == uuid.UUID(user_id)))
         
         if not subscription:
             logger.log_error("upgrade_subscription_not_found", f"Subscription not found for user {user_id}")
@@ -147,7 +191,7 @@ class UserService:
         subscription.stripe_customer_id = stripe_customer_id
         subscription.stripe_subscription_id = stripe_subscription_id
         
-        db.commit()
+        await db.commit()
         logger.log_query(
             question="user_upgraded_to_premium",
             user_id=user_id,
@@ -156,9 +200,9 @@ class UserService:
         )
     
     @staticmethod
-    def downgrade_to_free(db: Session, user_id: str):
+    async def downgrade_to_free(db: AsyncSession, user_id: str):
         """Downgrade user subscription to free tier."""
-        subscription = db.scalar(select(Subscription).where(Subscription.user_id == uuid.UUID(user_id)))
+        subscription = await db.scalar(select(Subscription).where(Subscription.user_id == uuid.UUID(user_id)))
         
         if not subscription:
             logger.log_error("downgrade_subscription_not_found", f"Subscription not found for user {user_id}")
@@ -170,7 +214,7 @@ class UserService:
         subscription.status = "canceled"
         subscription.stripe_subscription_id = None  # Keep customer_id for potential re-subscription
         
-        db.commit()
+        await db.commit()
         logger.log_query(
             question="user_downgraded_to_free",
             user_id=user_id,
@@ -179,7 +223,7 @@ class UserService:
         )
     
     @staticmethod
-    def delete_user_by_clerk_id(db: Session, clerk_id: str) -> bool:
+    async def delete_user_by_clerk_id(db: AsyncSession, clerk_id: str) -> bool:
         """
         Delete user and all associated data by Clerk ID.
         
@@ -193,7 +237,7 @@ class UserService:
         
         Returns True if user was found and deleted, False otherwise.
         """
-        user = db.scalar(select(User).where(User.clerk_id == clerk_id))
+        user = await db.scalar(select(User).where(User.clerk_id == clerk_id))
         
         if not user:
             logger.log_error(
@@ -207,7 +251,7 @@ class UserService:
         
         try:
             # Get subscription before deletion to check for Stripe subscription
-            subscription = db.scalar(select(Subscription).where(Subscription.user_id == user_id))
+            subscription = await db.scalar(select(Subscription).where(Subscription.user_id == user_id))
             
             # Cancel Stripe subscription and delete customer if they exist
             if subscription:
@@ -216,7 +260,7 @@ class UserService:
                 # Cancel subscription in Stripe if it exists
                 if subscription.stripe_subscription_id:
                     try:
-                        stripe_service.cancel_subscription(subscription.stripe_subscription_id)
+                        await asyncio.to_thread(stripe_service.cancel_subscription, subscription.stripe_subscription_id)
                         logger.log_query(
                             question="stripe_subscription_canceled_on_user_deletion",
                             user_id=str(user_id),
@@ -233,7 +277,7 @@ class UserService:
                 # Delete Stripe customer if it exists
                 if subscription.stripe_customer_id:
                     try:
-                        stripe_service.delete_customer(subscription.stripe_customer_id)
+                        await asyncio.to_thread(stripe_service.delete_customer, subscription.stripe_customer_id)
                         logger.log_query(
                             question="stripe_customer_deleted_on_user_deletion",
                             user_id=str(user_id),
@@ -248,15 +292,16 @@ class UserService:
                         )
             
             # Delete all queries associated with the user
-            db.execute(delete(Query).where(Query.user_id == user_id))
+            await db.execute(delete(Query).where(Query.user_id == user_id))
             
             # Delete subscription associated with the user
-            db.execute(delete(Subscription).where(Subscription.user_id == user_id))
+            await db.execute(delete(Subscription).where(Subscription.user_id == user_id))
             
             # Delete the user
-            db.execute(delete(User).where(User.id == user_id))
+            await db.execute(delete(User).where(User.id == user_id))
             
-            db.commit()
+            await db.commit()
+            UserService.invalidate_cached_user(clerk_id)
             
             logger.log_query(
                 question="user_deleted",
@@ -268,7 +313,7 @@ class UserService:
             return True
             
         except Exception as e:
-            db.rollback()
+            await db.rollback()
             logger.log_error(
                 "user_deletion_failed",
                 f"Failed to delete user with clerk_id {clerk_id}: {str(e)}",
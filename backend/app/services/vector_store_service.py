@@ -1,4 +1,5 @@
-from typing import Optional
+from typing import Optional, Tuple
+from sqlalchemy import select
 from llama_index.core import VectorStoreIndex, StorageContext
 from llama_index.vector_stores.supabase import SupabaseVectorStore
 from llama_index.core.embeddings import BaseEmbedding
@@ -86,10 +87,13 @@ class VectorStoreService:
                     raise ValueError(
                         "OPENAI_API_KEY must be set when LLM_MODE=cloud or LLM_MODE=openai"
                     )
+                # Embed up to 100 texts per request (the default is 10); station and
+                # rate documents are short, well under the per-request token limit
                 self._embed_model = OpenAIEmbedding(
                     api_key=self.settings.openai_api_key,
                     model="text-embedding-3-small",
-                    dimension=1536
+                    dimension=1536,
+                    embed_batch_size=100
                 )
         return self._embed_model
     
@@ -126,6 +130,37 @@ class VectorStoreService:
             )
         return self._index
     
+    def get_latest_indexed_at(self, domain: str, filter_key: str, filter_value: str) -> Tuple[bool, Optional[str]]:
+        """
+        Look up when matching documents were last indexed, from metadata only
+        (no query embedding or similarity search).
+        
+        Args:
+            domain: Domain metadata value (e.g., "transportation", "utility")
+            filter_key: Metadata key to match (e.g., "zip", "queried_zip", "state")
+            filter_value: Value the key must have
+            
+        Returns:
+            Tuple of (any_documents_found, latest_indexed_at_string)
+        """
+        collection = self.get_vector_store()._collection
+        metadata = collection.table.c.metadata
+        indexed_at = metadata["indexed_at"].astext
+        
+        # ISO 8601 timestamps sort as text; documents without one sort last
+        stmt = (
+            select(indexed_at)
+            .where(metadata.contains({"domain": domain, filter_key: filter_value}))
+            .order_by(indexed_at.desc().nulls_last())
+            .limit(1)
+        )
+        with collection.client.Session() as session:
+            row = session.execute(stmt).first()
+        
+        if row is None:
+            return False, None
+        return True, row[0]
+    
     def ensure_index_exists(self):
         """
         Ensure the vecs collection has a cosine distance index.
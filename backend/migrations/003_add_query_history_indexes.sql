@@ -0,0 +1,13 @@
+-- Migration script for indexing the hot query paths
+-- Run this in your Supabase SQL Editor after 002_create_saas_tables.sql
+
+-- History listing ("latest queries for user X") can use an index range scan instead of scan-then-sort
+CREATE INDEX IF NOT EXISTS ix_queries_user_created ON queries(user_id, created_at DESC);
+
+-- user_id is the leading column of ix_queries_user_created, so the single-column index is redundant
+DROP INDEX IF EXISTS idx_queries_user_id;
+
+-- Store sources metadata as JSONB (binary, indexable); sources are a list, so default to an empty array
+ALTER TABLE queries
+    ALTER COLUMN sources_data TYPE JSONB USING sources_data::jsonb,
+    ALTER COLUMN sources_data SET DEFAULT '[]'::jsonb;
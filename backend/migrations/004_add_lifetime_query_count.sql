@@ -0,0 +1,12 @@
+-- Migration script for keeping a lifetime query count on subscriptions
+-- Run this in your Supabase SQL Editor after 003_add_query_history_indexes.sql
+
+-- queries_used resets every billing period; lifetime_queries never resets and
+-- replaces COUNT(*) over queries for the history stats endpoint
+ALTER TABLE subscriptions ADD COLUMN IF NOT EXISTS lifetime_queries INTEGER NOT NULL DEFAULT 0;
+
+-- Backfill from existing query history
+UPDATE subscriptions s
+SET lifetime_queries = q.total
+FROM (SELECT user_id, COUNT(*) AS total FROM queries GROUP BY user_id) q
+WHERE q.user_id = s.user_id;
@@ -0,0 +1,9 @@
+-- Migration script for stable history pagination
+-- Run this in your Supabase SQL Editor after 004_add_lifetime_query_count.sql
+
+-- History pages are ordered by (created_at DESC, id DESC); with id in the index the
+-- ordering and the LIMIT are served by an index range read, without a sort
+CREATE INDEX IF NOT EXISTS ix_queries_user_created_id ON queries(user_id, created_at DESC, id DESC);
+
+-- Superseded by ix_queries_user_created_id (same leading columns)
+DROP INDEX IF EXISTS ix_queries_user_created;
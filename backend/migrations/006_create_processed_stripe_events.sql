@@ -0,0 +1,8 @@
+-- Migration script for Stripe webhook idempotency
+-- Run this in your Supabase SQL Editor after 005_add_query_history_page_index.sql
+
+-- Stripe retries webhook deliveries; each applied event id is recorded so a retry is skipped
+CREATE TABLE IF NOT EXISTS processed_stripe_events (
+    event_id TEXT PRIMARY KEY,
+    processed_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
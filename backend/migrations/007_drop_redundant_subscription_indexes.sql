@@ -0,0 +1,11 @@
+-- Migration script for removing duplicate subscription indexes
+-- Run this in your Supabase SQL Editor after 006_create_processed_stripe_events.sql
+
+-- user_id, stripe_customer_id and stripe_subscription_id are declared UNIQUE, and each
+-- UNIQUE constraint is already backed by a unique B-tree index. Webhook lookups by
+-- stripe_subscription_id use that index; these plain copies only add write cost.
+DROP INDEX IF EXISTS idx_subscriptions_user_id;
+DROP INDEX IF EXISTS idx_subscriptions_stripe_customer_id;
+DROP INDEX IF EXISTS idx_subscriptions_stripe_subscription_id;
+-- An earlier version of 003 created this; user_id is UNIQUE, so it never narrowed a lookup
+DROP INDEX IF EXISTS ix_subs_user_status;
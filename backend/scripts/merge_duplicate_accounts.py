@@ -14,6 +14,7 @@ Usage:
 
 import sys
 import os
+import asyncio
 from pathlib import Path
 
 # Add parent directory to path to import app modules
@@ -21,7 +22,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from sqlalchemy import create_engine, select, func
 from sqlalchemy.orm import Session
-from app.database import SessionLocal
+from app.database import AsyncSessionLocal
 from app.models.user import User
 from app.models.query import Query
 from app.models.subscription import Subscription
@@ -93,6 +94,7 @@ def merge_accounts(db: Session, primary: User, duplicate: User):
     Merge a duplicate account into the primary account.
     
     - Migrates all queries from duplicate to primary
+    - Adds the duplicate's lifetime query count to the primary subscription
     - Deletes duplicate account (cascades to subscription)
     """
     print(f"  Merging account {duplicate.id} (clerk_id: {duplicate.clerk_id}) into {primary.id} (clerk_id: {primary.clerk_id})")
@@ -109,6 +111,12 @@ def merge_accounts(db: Session, primary: User, duplicate: User):
     
     print(f"    Migrated {migrated_count} queries")
     
+    # Carry the duplicate's lifetime query count over to the primary subscription
+    primary_subscription = db.scalar(select(Subscription).where(Subscription.user_id == primary.id))
+    duplicate_subscription = db.scalar(select(Subscription).where(Subscription.user_id == duplicate.id))
+    if primary_subscription and duplicate_subscription:
+        primary_subscription.lifetime_queries += duplicate_subscription.lifetime_queries
+    
     # Delete duplicate account (subscription will be cascade deleted)
     db.delete(duplicate)
     db.commit()
@@ -116,10 +124,8 @@ def merge_accounts(db: Session, primary: User, duplicate: User):
     print(f"    Deleted duplicate account")
 
 
-def main():
-    """Main function to merge duplicate accounts."""
-    db = SessionLocal()
-    
+def merge_duplicates(db: Session):
+    """Find and merge duplicate accounts (runs inside AsyncSession.run_sync)."""
     try:
         print("Finding duplicate user accounts...")
         duplicates = find_duplicate_users(db)
@@ -159,14 +165,18 @@ def main():
         print(f"\n❌ Error: {e}")
         db.rollback()
         raise
-    finally:
-        db.close()
 
 
-if __name__ == "__main__":
-    main()
-
+async def run():
+    """Open an async session and run the merge with its synchronous view."""
+    async with AsyncSessionLocal() as db:
+        await db.run_sync(merge_duplicates)
 
 
+def main():
+    """Main function to merge duplicate accounts."""
+    asyncio.run(run())
 
 
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Tests for concurrent batch indexing in RAGService.bulk_index_state.
+
+The NREL client, document conversion and vector index are mocked.
+"""
+
+import pytest
+import threading
+import time
+from unittest.mock import AsyncMock, Mock
+
+from app.services.rag_service import RAGService
+
+
+def make_service(stations, insert):
+    """Create a RAGService with only the collaborators bulk_index_state uses."""
+    service = RAGService.__new__(RAGService)
+    service.nrel_client = Mock(get_all_stations_by_state=AsyncMock(return_value=stations))
+    service.document_service = Mock(stations_to_documents=lambda batch: list(batch))
+    service.vector_store_service = Mock(get_index=Mock(return_value=object()))
+    service._bulk_insert_documents = insert
+    return service
+
+
+class TestBulkIndexConcurrency:
+    """Test that batches are indexed in parallel up to the concurrency limit."""
+    
+    @pytest.mark.asyncio
+    async def test_batches_respect_concurrency_limit(self):
+        """Test that no more than `concurrency` batches are inserted at once and totals add up."""
+        lock = threading.Lock()
+        running = 0
+        peak = 0
+        
+        def insert(index, documents):
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.02)
+            with lock:
+                running -= 1
+            return len(documents) - 1, 1
+        
+        service = make_service(list(range(100)), insert)
+        result = await service.bulk_index_state("OH", batch_size=10, concurrency=3)
+        
+        assert peak == 3
+        assert result["stations_fetched"] == 100
+        assert result["stations_indexed"] == 90
+        assert result["skipped"] == 10
@@ -0,0 +1,156 @@
+"""
+Tests for the in-memory CacheService used for external API responses.
+"""
+
+import pytest
+import asyncio
+from datetime import timedelta
+from unittest.mock import patch
+from app.services import cache_service
+from app.services.cache_service import CacheService
+
+
+class TestCacheKeys:
+    """Test cache key generation."""
+    
+    def test_key_ignores_kwarg_order(self):
+        """Test that the same arguments in a different order give the same key."""
+        cache = CacheService()
+        
+        first = cache.make_key("bcl_measures_search", query="lighting", limit=20, tags=["HVAC"])
+        second = cache.make_key("bcl_measures_search", tags=["HVAC"], limit=20, query="lighting")
+        
+        assert first == second
+        assert first.startswith("bcl_measures_search:")
+    
+    def test_key_depends_on_arguments(self):
+        """Test that different arguments give different keys."""
+        cache = CacheService()
+        
+        assert cache.make_key("bcl_measure", uuid="a") != cache.make_key("bcl_measure", uuid="b")
+        assert cache.make_key("geocode_zip", "43215") != cache.make_key("geocode_location", "43215")
+    
+    def test_unhashable_arguments_match_memoized_keys(self):
+        """Test that list arguments (not memoized) give the same key as the equivalent tuples."""
+        cache = CacheService()
+        
+        assert cache.make_key("bcl_measures_search", tags=["HVAC", "Lighting"]) == \
+            cache.make_key("bcl_measures_search", tags=("HVAC", "Lighting"))
+    
+    def test_equal_values_of_different_types_get_distinct_keys(self):
+        """Test that 1, True and 1.0 (equal when memoized) give different keys, as they did unmemoized."""
+        cache = CacheService()
+        cache_service._memoized_key.cache_clear()
+        
+        keys = {cache.make_key("p", x=value) for value in (1, True, 1.0)}
+        nested = {cache.make_key("p", tags=(value,)) for value in (1, True, 1.0)}
+        
+        assert len(keys) == 3
+        assert len(nested) == 3
+        assert cache.make_key("p", x=True) == cache_service._build_key("p", (), {"x": True})
+
+
+class TestGetOrFetch:
+    """Test fetching through the cache."""
+    
+    @pytest.mark.asyncio
+    async def test_second_call_is_served_from_cache(self):
+        """Test that a cached value is returned without fetching again."""
+        cache = CacheService()
+        calls = 0
+        
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            return {"value": calls}
+        
+        first = await cache.get_or_fetch("key", fetch, timedelta(minutes=5))
+        second = await cache.get_or_fetch("key", fetch, timedelta(minutes=5))
+        
+        assert first == second == {"value": 1}
+        assert calls == 1
+    
+    @pytest.mark.asyncio
+    async def test_entry_expires_at_its_own_ttl(self):
+        """Test that each entry expires at the deadline set when it was stored."""
+        cache = CacheService()
+        
+        with patch.object(cache_service.time, "monotonic", return_value=1000.0):
+            await cache.set("short", "a", timedelta(seconds=10))
+            await cache.set("long", "b", timedelta(hours=1))
+        
+        with patch.object(cache_service.time, "monotonic", return_value=1011.0):
+            assert await cache.get("short") is None
+            assert await cache.get("long") == "b"
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_fetch(self):
+        """Test that callers missing on the same key while it is being fetched wait for that fetch."""
+        cache = CacheService()
+        calls = 0
+        
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "value"
+        
+        results = await asyncio.gather(*(cache.get_or_fetch("key", fetch, timedelta(minutes=5)) for _ in range(5)))
+        
+        assert results == ["value"] * 5
+        assert calls == 1
+    
+    @pytest.mark.asyncio
+    async def test_fetch_error_reaches_waiters_and_is_not_cached(self):
+        """Test that a failed fetch raises for every waiting caller and the next call fetches again."""
+        cache = CacheService()
+        
+        async def failing_fetch():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("BCL unavailable")
+        
+        async def fetch():
+            return "value"
+        
+        results = await asyncio.gather(
+            cache.get_or_fetch("key", failing_fetch, timedelta(minutes=5)),
+            cache.get_or_fetch("key", failing_fetch, timedelta(minutes=5)),
+            return_exceptions=True
+        )
+        
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert await cache.get_or_fetch("key", fetch, timedelta(minutes=5)) == "value"
+    
+    @pytest.mark.asyncio
+    async def test_hits_and_misses_are_counted(self):
+        """Test that lookups are counted in the stats without per-lookup logging."""
+        cache = CacheService()
+        
+        async def fetch():
+            return "value"
+        
+        with patch.object(cache.logger, "log_cache") as log_cache:
+            await cache.get_or_fetch("key", fetch, timedelta(minutes=5))
+            await cache.get_or_fetch("key", fetch, timedelta(minutes=5))
+        
+        stats = cache.get_stats()
+        assert (stats["hits"], stats["misses"]) == (1, 1)
+        log_cache.assert_not_called()
+
+
+class TestEviction:
+    """Test the cache's size bound."""
+    
+    @pytest.mark.asyncio
+    async def test_least_recently_used_entry_is_evicted(self):
+        """Test that a full cache evicts the entry that was used longest ago."""
+        cache = CacheService(maxsize=2)
+        
+        await cache.set("a", 1, timedelta(minutes=5))
+        await cache.set("b", 2, timedelta(minutes=5))
+        await cache.get("a")
+        await cache.set("c", 3, timedelta(minutes=5))
+        
+        assert await cache.get("a") == 1
+        assert await cache.get("b") is None
+        assert await cache.get("c") == 3
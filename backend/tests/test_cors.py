@@ -0,0 +1,74 @@
+"""
+Tests for the precomputed CORS middleware.
+
+Responses must match Starlette's CORSMiddleware for the same configuration.
+"""
+
+import pytest
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+from app.middleware.cors import PrecomputedCORSMiddleware
+
+
+CORS_OPTIONS = dict(
+    allow_origins=["http://localhost:3000", "https://voltquery.ai"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+
+async def endpoint(request):
+    return JSONResponse({"ok": True})
+
+
+async def endpoint_with_vary(request):
+    return JSONResponse({"ok": True}, headers={"Vary": "Accept-Encoding"})
+
+
+def make_client(middleware_class) -> TestClient:
+    app = Starlette(
+        routes=[Route("/data", endpoint), Route("/vary", endpoint_with_vary)],
+        middleware=[Middleware(middleware_class, **CORS_OPTIONS)]
+    )
+    return TestClient(app)
+
+
+def cors_headers(response) -> dict:
+    return {
+        name: value for name, value in response.headers.items()
+        if name.startswith("access-control-") or name == "vary"
+    }
+
+
+REQUESTS = [
+    ("GET", "/data", {"Origin": "https://voltquery.ai"}),
+    ("GET", "/data", {"Origin": "https://evil.example"}),
+    ("GET", "/vary", {"Origin": "http://localhost:3000"}),
+    ("OPTIONS", "/data", {
+        "Origin": "https://voltquery.ai",
+        "Access-Control-Request-Method": "POST",
+        "Access-Control-Request-Headers": "authorization, x-clerk-user-id",
+    }),
+    ("OPTIONS", "/data", {"Origin": "http://localhost:3000", "Access-Control-Request-Method": "GET"}),
+    ("OPTIONS", "/data", {"Origin": "https://evil.example", "Access-Control-Request-Method": "GET"}),
+    ("OPTIONS", "/data", {"Origin": "https://voltquery.ai", "Access-Control-Request-Method": "TRACE"}),
+]
+
+
+class TestPrecomputedCORSMiddleware:
+    """Test that precomputed CORS responses match Starlette's."""
+    
+    @pytest.mark.parametrize("method,path,headers", REQUESTS)
+    def test_matches_starlette(self, method, path, headers):
+        """Test status, body and CORS headers against the stock middleware."""
+        expected = make_client(CORSMiddleware).request(method, path, headers=headers)
+        actual = make_client(PrecomputedCORSMiddleware).request(method, path, headers=headers)
+        
+        assert actual.status_code == expected.status_code
+        assert actual.content == expected.content
+        assert cors_headers(actual) == cors_headers(expected)
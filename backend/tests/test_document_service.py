@@ -0,0 +1,73 @@
+"""
+Tests for converting NREL data into LlamaIndex documents.
+"""
+
+import pytest
+from app.services.document_service import DocumentService
+
+
+STATION = {
+    "id": 1234,
+    "station_name": "Main St Garage",
+    "street_address": "100 Main St",
+    "city": "Columbus",
+    "state": "OH",
+    "zip": "43215",
+    "ev_network": "ChargePoint Network",
+    "ev_connector_types": ["J1772", "CHADEMO"],
+    "ev_dc_fast_num": 2,
+    "ev_level2_evse_num": 4,
+    "access_days_time": "24 hours daily",
+    "latitude": 39.96,
+    "longitude": -82.99,
+}
+
+
+class TestStationMetadata:
+    """Test metadata extracted from NREL stations."""
+    
+    def test_numbers_are_kept(self):
+        """Test that numeric port counts and coordinates pass through."""
+        metadata = DocumentService._extract_metadata(STATION)
+        
+        assert metadata["dc_fast_count"] == 2
+        assert metadata["level2_count"] == 4
+        assert (metadata["latitude"], metadata["longitude"]) == (39.96, -82.99)
+    
+    def test_missing_numbers_use_defaults(self):
+        """Test that None, the string 'None' and numeric strings are handled like NREL sends them."""
+        station = {
+            **STATION,
+            "ev_dc_fast_num": None,
+            "ev_level2_evse_num": "None",
+            "latitude": "39.5",
+            "longitude": "none",
+        }
+        
+        metadata = DocumentService._extract_metadata(station)
+        
+        assert metadata["dc_fast_count"] == 0
+        assert metadata["level2_count"] == 0
+        assert metadata["latitude"] == 39.5
+        assert "longitude" not in metadata
+
+
+class TestUtilityRateDocuments:
+    """Test documents built from utility rate data."""
+    
+    def test_rates_from_direct_and_nested_fields(self):
+        """Test that each sector's rate is found whether it is a direct field, a nested dict or a bare number."""
+        rates = {
+            "utility_name": "AEP Ohio",
+            "res_rate": 0.1234,
+            "commercial": {"avg_rate": "0.1"},
+            "industrial": 0.08,
+        }
+        
+        [doc] = DocumentService.utility_rates_to_documents(rates, location="43215")
+        
+        assert "Residential Rate: $0.1234/kWh" in doc.text
+        assert "Commercial Rate: $0.1000/kWh" in doc.text
+        assert "Industrial Rate: $0.0800/kWh" in doc.text
+        assert doc.metadata["commercial_rate"] == "0.1"
+        assert doc.metadata["zip"] == "43215"
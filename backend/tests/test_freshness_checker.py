@@ -0,0 +1,62 @@
+"""
+Tests for vector store freshness checks.
+
+The vector store lookup is mocked; only the freshness decision is tested.
+"""
+
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import Mock
+
+from app.services.freshness_checker import FreshnessChecker
+
+
+def make_checker(found, indexed_at):
+    """Create a FreshnessChecker whose metadata lookup returns the given result."""
+    vector_store_service = Mock(get_latest_indexed_at=Mock(return_value=(found, indexed_at)))
+    return FreshnessChecker(vector_store_service), vector_store_service
+
+
+class TestCheckFreshness:
+    """Test freshness decisions from the newest indexed_at."""
+    
+    @pytest.mark.asyncio
+    async def test_recent_data_is_fresh(self):
+        """Test that data indexed within the TTL is fresh, using a metadata lookup."""
+        indexed_at = datetime.utcnow() - timedelta(hours=1)
+        checker, vector_store_service = make_checker(True, indexed_at.isoformat() + "Z")
+        
+        is_fresh, _ = await checker.check_freshness("utility", "zip", "43215", ttl=timedelta(days=1))
+        
+        assert is_fresh
+        vector_store_service.get_latest_indexed_at.assert_called_once_with("utility", "zip", "43215")
+        vector_store_service.get_index.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_old_data_is_stale(self):
+        """Test that data indexed before the TTL is stale."""
+        indexed_at = datetime.utcnow() - timedelta(days=2)
+        checker, _ = make_checker(True, indexed_at.isoformat() + "Z")
+        
+        is_fresh, _ = await checker.check_freshness("utility", "zip", "43215", ttl=timedelta(days=1))
+        
+        assert not is_fresh
+    
+    @pytest.mark.asyncio
+    async def test_missing_data_or_timestamp_is_stale(self):
+        """Test that no matching documents, or documents without a timestamp, count as stale."""
+        for found, indexed_at in ((False, None), (True, None)):
+            checker, _ = make_checker(found, indexed_at)
+            
+            assert await checker.check_freshness("utility", "zip", "43215", ttl=timedelta(days=1)) == (False, None)
+    
+    def test_offset_timestamp_is_compared_in_utc(self):
+        """Test that a timestamp with a UTC offset is converted to UTC, not local time."""
+        from app.services.freshness_checker import _parse_indexed_at
+        
+        expected = datetime(2024, 6, 1, 16, 0)
+        expected_ts = expected.replace(tzinfo=timezone.utc).timestamp()
+        
+        assert _parse_indexed_at("2024-06-01T12:00:00-04:00") == (expected, expected_ts)
+        assert _parse_indexed_at("2024-06-01T16:00:00Z") == (expected, expected_ts)
+        assert _parse_indexed_at("2024-06-01T16:00:00") == (expected, expected_ts)
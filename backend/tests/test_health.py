@@ -0,0 +1,44 @@
+"""
+Tests for the health check fast path.
+"""
+
+import pytest
+from unittest.mock import AsyncMock
+from app.middleware.health import HealthCheckMiddleware
+
+
+async def call(middleware, method: str, path: str):
+    """Send a request through the middleware and collect the sent messages."""
+    sent = []
+    
+    async def send(message):
+        sent.append(message)
+    
+    scope = {"type": "http", "method": method, "path": path}
+    await middleware(scope, AsyncMock(), send)
+    return sent
+
+
+class TestHealthCheckMiddleware:
+    """Test that probe endpoints are answered without entering the app."""
+    
+    @pytest.mark.asyncio
+    async def test_health_is_answered_directly(self):
+        """Test that GET /health returns the preserialized body without calling the app."""
+        app = AsyncMock()
+        sent = await call(HealthCheckMiddleware(app), "GET", "/health")
+        
+        app.assert_not_awaited()
+        assert sent[0]["status"] == 200
+        assert sent[1]["body"] == b'{"status":"healthy"}'
+    
+    @pytest.mark.asyncio
+    async def test_other_requests_pass_through(self):
+        """Test that other paths and methods reach the wrapped app."""
+        app = AsyncMock()
+        middleware = HealthCheckMiddleware(app)
+        
+        await call(middleware, "GET", "/api/history/stats")
+        await call(middleware, "POST", "/health")
+        
+        assert app.await_count == 2
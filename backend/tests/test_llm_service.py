@@ -0,0 +1,32 @@
+"""
+Tests for shared LLM creation.
+"""
+
+import pytest
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from app.services.llm_service import LLMService
+
+
+class TestGetLLM:
+    """Test that the LLM client is created once."""
+    
+    def test_concurrent_first_calls_create_one_llm(self):
+        """Test that threads asking for the LLM at startup share a single instance."""
+        service = LLMService()
+        calls = []
+        
+        def create_llm():
+            calls.append(threading.get_ident())
+            time.sleep(0.05)
+            return object()
+        
+        with patch.object(service, "_create_llm", side_effect=create_llm):
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                llms = list(pool.map(lambda _: service.get_llm(), range(4)))
+        
+        assert len(calls) == 1
+        assert all(llm is llms[0] for llm in llms)
@@ -0,0 +1,52 @@
+"""
+Tests for batched query history writes.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, patch
+import asyncio
+from app.services.query_writer import QueryWriter
+
+
+class TestQueryWriter:
+    """Test that queued history rows are written in batches."""
+    
+    @pytest.mark.asyncio
+    async def test_rows_are_batched(self):
+        """Test that rows queued together are written in one batch."""
+        writer = QueryWriter(batch_size=32, flush_interval=0.05)
+        write = AsyncMock()
+        
+        with patch.object(writer, "_write", write):
+            for i in range(3):
+                writer.enqueue(question=f"q{i}")
+            await asyncio.sleep(0.1)
+            await writer.stop()
+        
+        write.assert_awaited_once()
+        assert [row["question"] for row in write.await_args.args[0]] == ["q0", "q1", "q2"]
+    
+    @pytest.mark.asyncio
+    async def test_batch_size_limits_each_write(self):
+        """Test that a full batch is written without waiting for the interval."""
+        writer = QueryWriter(batch_size=2, flush_interval=10)
+        write = AsyncMock()
+        
+        with patch.object(writer, "_write", write):
+            for i in range(5):
+                writer.enqueue(question=f"q{i}")
+            await writer.stop()
+        
+        assert [len(call.args[0]) for call in write.await_args_list] == [2, 2, 1]
+    
+    @pytest.mark.asyncio
+    async def test_stop_flushes_queued_rows(self):
+        """Test that stopping the writer writes rows still waiting for the interval."""
+        writer = QueryWriter(batch_size=32, flush_interval=10)
+        write = AsyncMock()
+        
+        with patch.object(writer, "_write", write):
+            writer.enqueue(question="q0")
+            await writer.stop()
+        
+        write.assert_awaited_once()
@@ -217,6 +217,25 @@ class TestCircuitBreaker:
         
         assert success_count >= success_threshold
         # Circuit should close after threshold successes
+    
+    @pytest.mark.asyncio
+    async def test_breaker_opens_and_rejects_calls(self):
+        """Test that a breaker opens after its failure threshold and then rejects calls without running them."""
+        from app.services.circuit_breaker import CircuitBreaker, CircuitState
+        
+        breaker = CircuitBreaker("test", failure_threshold=2, timeout_seconds=60)
+        failing = AsyncMock(side_effect=RuntimeError("down"))
+        healthy = AsyncMock(return_value="ok")
+        
+        assert await breaker.call(healthy) == "ok"
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                await breaker.call(failing)
+        
+        assert breaker.state == CircuitState.OPEN
+        with pytest.raises(Exception, match="is OPEN"):
+            await breaker.call(healthy)
+        assert healthy.await_count == 1
 
 
 class TestCaching:
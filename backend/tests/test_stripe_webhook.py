@@ -0,0 +1,208 @@
+"""
+Tests for streaming Stripe webhook signature verification and event routing.
+
+Signatures are generated the way Stripe signs webhooks; results are checked
+against stripe.Webhook.construct_event.
+"""
+
+import pytest
+import hashlib
+import hmac
+import json
+import os
+import time
+import stripe
+
+os.environ.setdefault("STRIPE_SECRET_KEY", "sk_test")
+os.environ.setdefault("STRIPE_WEBHOOK_SECRET", "whsec_test")
+os.environ.setdefault("STRIPE_PRICE_ID", "price_test")
+
+from app.services.stripe_service import StripeService
+
+
+PAYLOAD = json.dumps({
+    "id": "evt_1",
+    "object": "event",
+    "type": "invoice.payment_succeeded",
+    "data": {"object": {"subscription": "sub_1", "billing_reason": "subscription_cycle"}}
+}).encode()
+
+
+def sign(payload: bytes, secret: str, timestamp: int) -> str:
+    """Build a Stripe-Signature header for the payload."""
+    signature = hmac.new(secret.encode(), f"{timestamp}.".encode() + payload, hashlib.sha256).hexdigest()
+    return f"t={timestamp},v1={signature}"
+
+
+async def stream(payload: bytes, chunk_size: int = 16):
+    """Yield the payload in chunks, like Request.stream()."""
+    for i in range(0, len(payload), chunk_size):
+        yield payload[i:i + chunk_size]
+
+
+class TestVerifyWebhook:
+    """Test chunked webhook signature verification."""
+    
+    @pytest.fixture
+    def service(self):
+        return StripeService()
+    
+    @pytest.mark.asyncio
+    async def test_valid_signature_matches_stripe(self, service):
+        """Test that a correctly signed body gives the same event data as the Stripe SDK."""
+        secret = service.settings.stripe_webhook_secret
+        header = sign(PAYLOAD, secret, int(time.time()))
+        
+        event = await service.verify_webhook(stream(PAYLOAD), header)
+        
+        assert event == stripe.Webhook.construct_event(PAYLOAD, header, secret)
+        assert event["type"] == "invoice.payment_succeeded"
+    
+    @pytest.mark.asyncio
+    async def test_repeated_verification_is_independent(self, service):
+        """Test that one webhook's body doesn't leak into the next one's signature check."""
+        header = sign(PAYLOAD, service.settings.stripe_webhook_secret, int(time.time()))
+        
+        first = await service.verify_webhook(stream(PAYLOAD), header)
+        second = await service.verify_webhook(stream(PAYLOAD), header)
+        
+        assert first == second
+    
+    @pytest.mark.asyncio
+    async def test_tampered_body_is_rejected(self, service):
+        """Test that a body that doesn't match its signature is rejected."""
+        header = sign(PAYLOAD, service.settings.stripe_webhook_secret, int(time.time()))
+        
+        with pytest.raises(ValueError, match="Invalid signature"):
+            await service.verify_webhook(stream(PAYLOAD.replace(b"sub_1", b"sub_2")), header)
+    
+    @pytest.mark.asyncio
+    async def test_old_timestamp_is_rejected(self, service):
+        """Test that a replayed webhook outside the tolerance window is rejected."""
+        header = sign(PAYLOAD, service.settings.stripe_webhook_secret, int(time.time()) - 600)
+        
+        with pytest.raises(ValueError, match="Invalid signature"):
+            await service.verify_webhook(stream(PAYLOAD), header)
+    
+    @pytest.mark.asyncio
+    async def test_malformed_header_is_rejected(self, service):
+        """Test that a header without a timestamp or v1 signature is rejected."""
+        with pytest.raises(ValueError, match="Invalid signature"):
+            await service.verify_webhook(stream(PAYLOAD), "v0=abc")
+
+
+class TestWebhookRouting:
+    """Test which webhook events reach the database."""
+    
+    @pytest.mark.asyncio
+    async def test_unhandled_event_skips_database(self):
+        """Test that an event type we don't handle returns without opening a session."""
+        from unittest.mock import AsyncMock, Mock, patch
+        from app.routers import stripe as stripe_router
+        
+        request = Mock(headers={"stripe-signature": "t=1,v1=abc"}, stream=Mock())
+        verify = AsyncMock(return_value={"type": "customer.created", "data": {"object": {}}})
+        session_factory = Mock()
+        
+        with patch.object(stripe_router.stripe_service, "verify_webhook", verify), \
+                patch.object(stripe_router, "AsyncSessionLocal", session_factory):
+            result = await stripe_router.stripe_webhook(request)
+        
+        assert result == {"status": "success"}
+        session_factory.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_duplicate_event_is_skipped(self):
+        """Test that an event already claimed by an earlier delivery is not applied again."""
+        from unittest.mock import AsyncMock, MagicMock, Mock, patch
+        from app.routers import stripe as stripe_router
+        
+        request = Mock(headers={"stripe-signature": "t=1,v1=abc"}, stream=Mock())
+        verify = AsyncMock(return_value=json.loads(PAYLOAD))
+        db = AsyncMock()
+        db.scalar = AsyncMock(return_value=None)
+        session_factory = MagicMock()
+        session_factory.return_value.__aenter__.return_value = db
+        
+        with patch.object(stripe_router.stripe_service, "verify_webhook", verify), \
+                patch.object(stripe_router, "AsyncSessionLocal", session_factory):
+            result = await stripe_router.stripe_webhook(request)
+        
+        assert result == {"status": "success"}
+        assert db.scalar.await_count == 1
+        db.commit.assert_not_awaited()
+    
+    @pytest.mark.asyncio
+    async def test_new_event_is_recorded(self):
+        """Test that a first delivery is committed even when it changes no subscription."""
+        from unittest.mock import AsyncMock, MagicMock, Mock, patch
+        from app.routers import stripe as stripe_router
+        
+        request = Mock(headers={"stripe-signature": "t=1,v1=abc"}, stream=Mock())
+        verify = AsyncMock(return_value=json.loads(PAYLOAD))
+        db = AsyncMock()
+        db.scalar = AsyncMock(side_effect=["evt_1", None])
+        session_factory = MagicMock()
+        session_factory.return_value.__aenter__.return_value = db
+        
+        with patch.object(stripe_router.stripe_service, "verify_webhook", verify), \
+                patch.object(stripe_router, "AsyncSessionLocal", session_factory):
+            result = await stripe_router.stripe_webhook(request)
+        
+        assert result == {"status": "success"}
+        db.commit.assert_awaited_once()
+    
+    @pytest.mark.asyncio
+    async def test_reactivation_is_one_update(self):
+        """Test that a reactivated premium subscription is updated and reset without a SELECT."""
+        import uuid
+        from unittest.mock import AsyncMock, MagicMock, Mock, patch
+        from app.routers import stripe as stripe_router
+        
+        user_id = uuid.uuid4()
+        request = Mock(headers={"stripe-signature": "t=1,v1=abc"}, stream=Mock())
+        verify = AsyncMock(return_value={
+            "id": "evt_2",
+            "type": "customer.subscription.updated",
+            "data": {"object": {"id": "sub_1", "status": "active"}}
+        })
+        db = AsyncMock()
+        db.scalar = AsyncMock(return_value="evt_2")
+        db.execute = AsyncMock(return_value=Mock(first=Mock(return_value=(user_id, "premium", "past_due"))))
+        session_factory = MagicMock()
+        session_factory.return_value.__aenter__.return_value = db
+        
+        with patch.object(stripe_router.stripe_service, "verify_webhook", verify), \
+                patch.object(stripe_router, "AsyncSessionLocal", session_factory), \
+                patch.object(stripe_router.logger, "log_query") as log_query:
+            await stripe_router.stripe_webhook(request)
+        
+        db.execute.assert_awaited_once()
+        assert [call.kwargs["question"] for call in log_query.call_args_list] == [
+            "queries_reset_on_subscription_reactivation",
+            "subscription_updated",
+        ]
+    
+    @pytest.mark.asyncio
+    async def test_failed_handler_is_retried(self):
+        """Test that a handler error returns a 5xx without committing the claim, so Stripe retries."""
+        from unittest.mock import AsyncMock, MagicMock, Mock, patch
+        from fastapi import HTTPException
+        from app.routers import stripe as stripe_router
+        
+        request = Mock(headers={"stripe-signature": "t=1,v1=abc"}, stream=Mock())
+        verify = AsyncMock(return_value=json.loads(PAYLOAD))
+        db = AsyncMock()
+        db.scalar = AsyncMock(return_value="evt_1")
+        session_factory = MagicMock()
+        session_factory.return_value.__aenter__.return_value = db
+        handler = AsyncMock(side_effect=RuntimeError("database unavailable"))
+        
+        with patch.object(stripe_router.stripe_service, "verify_webhook", verify), \
+                patch.object(stripe_router, "AsyncSessionLocal", session_factory), \
+                patch.dict(stripe_router.WEBHOOK_HANDLERS, {"invoice.payment_succeeded": handler}):
+            with pytest.raises(HTTPException) as error:
+                await stripe_router.stripe_webhook(request)
+        
+        assert error.value.status_code == 500
+        db.commit.assert_not_awaited()
@@ -0,0 +1,58 @@
+"""
+Tests for the background task status store.
+"""
+
+import pytest
+from app.services import task_status
+from app.services.task_status import get_task_status, set_task_status
+
+
+@pytest.fixture(autouse=True)
+def clear_task_status():
+    """Start every test with no recorded tasks."""
+    task_status._task_status.clear()
+    yield
+    task_status._task_status.clear()
+
+
+class TestTaskStatus:
+    """Test recording and expiry of task status."""
+    
+    def test_latest_status_is_returned(self):
+        """Test that each update replaces the previous status."""
+        set_task_status("task_1", {"status": "queued"})
+        set_task_status("task_1", {"status": "running"})
+        
+        assert get_task_status("task_1").status == {"status": "running"}
+        assert get_task_status("task_2") is None
+    
+    def test_etag_follows_content(self):
+        """Test that the ETag changes with the status and not with a repeated update."""
+        set_task_status("task_1", {"status": "running", "progress": 0})
+        first = get_task_status("task_1").etag
+        set_task_status("task_1", {"status": "running", "progress": 0})
+        repeated = get_task_status("task_1").etag
+        set_task_status("task_1", {"status": "completed", "progress": 100})
+        
+        assert repeated == first
+        assert get_task_status("task_1").etag != first
+    
+    def test_status_expires(self):
+        """Test that a task's status is dropped once its TTL has passed."""
+        set_task_status("task_1", {"status": "running"})
+        
+        task_status._task_status.expire(task_status._task_status.timer() + task_status.TASK_STATUS_TTL + 1)
+        
+        assert get_task_status("task_1") is None
+    
+    def test_finished_status_expires_sooner(self):
+        """Test that completed and failed tasks are dropped before running ones."""
+        set_task_status("task_1", {"status": "running"})
+        set_task_status("task_2", {"status": "completed"})
+        set_task_status("task_3", {"status": "failed"})
+        
+        task_status._task_status.expire(task_status._task_status.timer() + task_status.FINISHED_TASK_STATUS_TTL + 1)
+        
+        assert get_task_status("task_1") is not None
+        assert get_task_status("task_2") is None
+        assert get_task_status("task_3") is None
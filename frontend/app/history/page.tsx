@@ -33,7 +33,7 @@ export default function HistoryPage() {
       })
       if (response.ok) {
         const data = await response.json()
-        setQueries(data)
+        setQueries(data.items)
       }
     } catch (error) {
       console.error("Failed to fetch history:", error)
@@ -165,6 +165,9 @@ export function RAGQueryForm({ onQueryComplete }: RAGQueryFormProps) {
         for (const line of lines) {
           if (line.trim() === "") continue
 
+          // Skip keep-alive pings (comment-only events)
+          if (line.split("\n").every((part) => part.startsWith(":"))) continue
+
           eventCount++
 
           // Handle multi-line SSE format